@@ -0,0 +1,76 @@
+"""Chart payload benchmark: full-resolution vs downsampled portfolio chart.
+
+Builds the same Candlestick + MA traces the portfolio chart uses for
+synthetic multi-year daily data and reports the Plotly JSON payload size and
+the server-side figure build + serialization time. Runs fully offline.
+
+    python benchmarks/bench_chart_payload.py --tickers 20 --years 10
+"""
+import os
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from config import MA_WINDOWS, CHART_LINE_POINT_BUDGET, CHART_CANDLE_BUDGET
+from modules.indicators import rolling_means
+from modules.downsample import aggregate_ohlc, downsample_line
+
+
+def make_bars(n_tickers, n_days, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2000-01-03", periods=n_days)
+    bars = {}
+    for i in range(n_tickers):
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n_days)))
+        open_ = close * (1 + rng.normal(0, 0.005, n_days))
+        bars[f"T{i}"] = pd.DataFrame({
+            'Open': open_,
+            'High': np.maximum(open_, close) * 1.01,
+            'Low': np.minimum(open_, close) * 0.99,
+            'Close': close,
+            'Volume': rng.integers(1e5, 1e7, n_days).astype(float),
+        }, index=dates)
+    return bars
+
+
+def build_figure(bars, downsample):
+    fig = go.Figure()
+    for ticker, data in bars.items():
+        candles = aggregate_ohlc(data, CHART_CANDLE_BUDGET) if downsample else data
+        fig.add_trace(go.Candlestick(
+            x=candles.index, open=candles['Open'], high=candles['High'],
+            low=candles['Low'], close=candles['Close'], name=f"{ticker} 캔들"
+        ))
+        means = rolling_means(data[['Close']].to_numpy(), MA_WINDOWS)
+        for window, values in means.items():
+            ma = pd.Series(values[:, 0], index=data.index)
+            if downsample:
+                ma = downsample_line(ma, CHART_LINE_POINT_BUDGET)
+            fig.add_trace(go.Scatter(x=ma.index, y=ma, mode='lines', name=f"{ticker} MA{window}"))
+    return fig
+
+
+def run(n_tickers, years, repeat):
+    bars = make_bars(n_tickers, years * 252)
+    print(f"{n_tickers} tickers x {years * 252} daily bars, MA windows {MA_WINDOWS}")
+    for label, downsample in (("full", False), ("downsampled", True)):
+        timings, payload = [], 0
+        for _ in range(repeat):
+            started = time.perf_counter()
+            payload = len(build_figure(bars, downsample).to_json())
+            timings.append(time.perf_counter() - started)
+        print(f"{label:>12}: payload {payload / 1e6:8.2f} MB, build+serialize {min(timings) * 1000:8.1f} ms (best of {repeat})")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tickers", type=int, default=20)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.tickers, args.years, args.repeat)
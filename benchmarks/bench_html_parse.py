@@ -0,0 +1,116 @@
+"""HTML parse benchmark: html.parser vs lxml vs strained lxml vs selectolax.
+
+Times the crawler headline parsing (Google / MarketWatch / DuckDuckGo) and the
+main-text extraction used for link content, and checks that every backend
+returns the same headlines/text as the original html.parser path. Uses
+synthetic pages by default; pass a directory of recorded pages named
+<source>_*.html (source: google, marketwatch, alternative, article) to time
+real markup instead.
+
+    python benchmarks/bench_html_parse.py --repeat 20
+    python benchmarks/bench_html_parse.py --pages recorded_pages/
+"""
+import os
+import sys
+import glob
+import time
+import argparse
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from modules.html_parse import make_soup, extract_main_text, HAS_SELECTOLAX
+
+# 크롤러에서 실제로 읽는 노드 (crawler.py와 동일한 find_all)
+HEADLINES = {
+    'google': lambda soup: [r.get_text() for r in soup.find_all('div', class_='SoaBEf') or soup.find_all('div', class_='xrnccd')],
+    'marketwatch': lambda soup: [h.get_text() for h in soup.find_all('a', class_='link') or soup.find_all('h3', class_='article__headline')],
+    'alternative': lambda soup: [a.get_text() for a in soup.find_all('a', class_='result__a')],
+}
+
+
+def _noise(n):
+    """Scripts, styles and nested layout markup that real pages carry around the results."""
+    block = (
+        "<script>var x = {a: 1, b: [1, 2, 3]}; function f() { return x; }</script>"
+        "<style>.c { color: red; } .d { margin: 0 }</style>"
+        "<div class='wrap'><div class='row'><span class='ic'></span><a href='/nav'>Menu item</a>"
+        "<ul><li><a href='/a'>Link A</a></li><li><a href='/b'>Link B</a></li></ul></div></div>"
+    )
+    return block * n
+
+
+def synthetic_pages():
+    google = "".join(
+        f"<div class='SoaBEf'><a href='https://news.example.com/{i}'><div class='MBeuO'>Headline {i} about AAPL stock</div>"
+        f"<div class='GI74Re'>Snippet {i} with details.</div></a></div>{_noise(20)}"
+        for i in range(10)
+    )
+    marketwatch = "".join(
+        f"<a class='link' href='/story/{i}'>AAPL stock moves on news {i}</a>{_noise(30)}" for i in range(40)
+    )
+    ddg = "".join(
+        f"<div class='result'><a class='result__a' href='https://r.example.com/{i}'>Result {i} AAPL analysis</a>"
+        f"<a class='result__snippet'>snippet</a></div>{_noise(10)}" for i in range(30)
+    )
+    article = (
+        f"<header>Site header</header><nav>{_noise(50)}</nav>"
+        f"<article>{''.join(f'<p>Paragraph {i} of the story about earnings and revenue.</p>' for i in range(400))}</article>"
+        f"<footer>{_noise(200)}</footer>"
+    )
+    wrap = "<html><head><title>t</title></head><body>{}</body></html>"
+    return {
+        'google': [wrap.format(google)],
+        'marketwatch': [wrap.format(marketwatch)],
+        'alternative': [wrap.format(ddg)],
+        'article': [wrap.format(article)],
+    }
+
+
+def recorded_pages(directory):
+    pages = {}
+    for path in sorted(glob.glob(os.path.join(directory, "*.html"))):
+        source = os.path.basename(path).split('_', 1)[0]
+        with open(path, encoding='utf-8', errors='replace') as f:
+            pages.setdefault(source, []).append(f.read())
+    return pages
+
+
+def timed(func, repeat):
+    func()  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", help="directory of recorded <source>_*.html pages")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    pages = recorded_pages(args.pages) if args.pages else synthetic_pages()
+    print(f"{'page':<14}{'KB':>8}  {'variant':<22}{'ms':>9}{'speedup':>9}  same")
+    for source, documents in pages.items():
+        for markup in documents:
+            if source == 'article':
+                variants = [('html.parser', lambda: extract_main_text(markup, backend='html.parser')),
+                            ('lxml', lambda: extract_main_text(markup, backend='lxml'))]
+                if HAS_SELECTOLAX:
+                    variants.append(('selectolax', lambda: extract_main_text(markup, backend='selectolax')))
+            elif source in HEADLINES:
+                extract = HEADLINES[source]
+                variants = [('html.parser', lambda: extract(BeautifulSoup(markup, 'html.parser'))),
+                            ('lxml', lambda: extract(make_soup(markup, parser='lxml'))),
+                            ('lxml + strainer', lambda: extract(make_soup(markup, source, parser='lxml')))]
+            else:
+                continue
+            baseline_ms, baseline = timed(variants[0][1], args.repeat)
+            for name, func in variants:
+                ms, result = timed(func, args.repeat)
+                print(f"{source:<14}{len(markup) / 1024:>8.0f}  {name:<22}{ms:>9.2f}{baseline_ms / ms:>8.1f}x  {result == baseline}")
+
+
+if __name__ == "__main__":
+    main()
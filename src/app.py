@@ -2,7 +2,7 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime
 
-from modules.data_handler import get_stock_data
+from modules.data_handler import stream_stock_data, screen_universe
 from modules.ui_components import (
     header_ui, sidebar_ui, display_metrics,
     display_table_and_chart, display_risk_info, display_ai_analysis,
@@ -25,8 +25,8 @@ def build_app():
     )
 
     header_ui()
-    # Sidebar returns start_date, end_date, target_return, top_n, language
-    start_date, end_date, target_return, top_n, language = sidebar_ui(default_start, default_end)
+    # Sidebar returns start_date, end_date, target_return, top_n, language, sectors, universe, risk_filters
+    start_date, end_date, target_return, top_n, language, sectors, universe, risk_filters = sidebar_ui(default_start, default_end)
 
     # 탭 생성
     tab1, tab2 = st.tabs(["🤖 AI 분석", "🔍 크롤링 테스트"])
@@ -34,9 +34,29 @@ def build_app():
     with tab1:
         if st.session_state.get('analyze', False):
             # 데이터 분석 (only if not already cached)
-            if 'stock_data' not in st.session_state:
-                with st.spinner('📊 S&P500 종목 데이터 분석 중...'):
-                    stock_data = get_stock_data(start_date, end_date, target_return, top_n)
+            if 'stock_data' not in st.session_state and universe:
+                # 사용자 정의 유니버스는 프로세스 풀로 샤딩해서 스크리닝
+                with st.spinner(f'📊 사용자 정의 유니버스 {len(universe)}개 종목 분석 중...'):
+                    stock_data, shard_stats = screen_universe(universe, start_date, end_date, target_return, top_n, risk_filters)
+                failed_shards = [stats for stats in shard_stats if stats['error']]
+                failed_tickers = [t for stats in shard_stats for t in stats['failed_tickers']]
+                for stats in failed_shards:
+                    st.warning(f"⚠️ 샤드 {stats['shard']} 처리 실패 ({stats['tickers']}개 종목 제외): {stats['error']}")
+                if failed_tickers:
+                    st.caption(f"데이터 없음 {len(failed_tickers)}개 종목: {', '.join(failed_tickers[:20])}")
+                with st.expander("⏱️ 샤드별 처리 시간", expanded=False):
+                    st.dataframe(pd.DataFrame(shard_stats), use_container_width=True)
+                st.session_state.stock_data = stock_data
+            elif 'stock_data' not in st.session_state:
+                # 청크 단위로 도착하는 중간 순위를 바로 표시
+                progress = st.progress(0, text='📊 S&P500 종목 데이터 분석 중...')
+                partial_table = st.empty()
+                stock_data = []
+                for stock_data, done, total in stream_stock_data(start_date, end_date, target_return, top_n, sectors, risk_filters):
+                    progress.progress(done / total if total else 1.0, text=f'📊 S&P500 종목 데이터 분석 중... ({done}/{total})')
+                    if stock_data:
+                        partial_table.dataframe(pd.DataFrame(stock_data), use_container_width=True)
+                progress.empty(); partial_table.empty()
                 st.session_state.stock_data = stock_data
             else:
                 stock_data = st.session_state.stock_data
@@ -1,4 +1,5 @@
 # Configuration for stock research app
+import os
 
 # vLLM model and API
 MODEL_NAME = "google/gemma-2b-it"
@@ -33,3 +34,112 @@ DL_MODEL_RECOMMENDATIONS = {
         "reason": "중간 수준 수익률의 다중 시간대 패턴 분석에 적합"
     }
 }
+
+# Batched price download (yfinance multi-symbol requests)
+PRICE_FETCH_CHUNK_SIZE = 100  # Tickers per request
+PRICE_FETCH_MAX_WORKERS = 4   # Concurrent batch requests
+
+# Local OHLCV store (Parquet, one file per ticker)
+PRICE_STORE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "prices")
+
+# Prefix-sum return index reuse across screens
+RETURN_INDEX_MAX_GAP_DAYS = 365  # Rebuild for the new window instead of widening when it is farther than this
+
+# S&P 500 constituent snapshots
+SP500_WIKI_URL = "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies"
+CONSTITUENTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "constituents")
+CONSTITUENT_REFRESH_DAYS = 7   # Refresh in the background when the snapshot is older than this
+CONSTITUENT_SNAPSHOT_KEEP = 5  # Number of snapshot versions kept on disk
+
+# Sharded screening for large custom universes (process pool)
+SCREEN_MAX_WORKERS = os.cpu_count() or 4
+SCREEN_SHARD_SIZE = 250  # Tickers per shard
+
+# Market data provider ("yfinance" or "fixture" for offline replay of recorded bars)
+MARKET_DATA_PROVIDER = os.environ.get("MARKET_DATA_PROVIDER", "yfinance")
+MARKET_DATA_FIXTURE_DIR = os.environ.get(
+    "MARKET_DATA_FIXTURE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "fixtures")
+)
+
+# Chart bar cache (daily/weekly/monthly per ticker and date range)
+CHART_CACHE_SIZE = 64  # Entries kept before least recently used ones are evicted
+
+# Moving-average overlays on the portfolio chart
+MA_WINDOWS = [5, 20, 60, 120]
+
+# Chart downsampling (points sent to the browser per trace)
+CHART_LINE_POINT_BUDGET = 800    # LTTB target for MA lines
+CHART_CANDLE_BUDGET = 300        # Max candles per ticker before bars are merged
+
+# Risk analytics (drawdown, Sharpe, Sortino, beta)
+BENCHMARK_TICKER = "SPY"
+RISK_FREE_RATE = 0.0          # Annual risk-free rate used for Sharpe/Sortino
+TRADING_DAYS_PER_YEAR = 252
+
+# Top-N trailing-return backtest
+BACKTEST_COST_BPS = 10           # Transaction cost per unit of turnover (basis points)
+BACKTEST_MIN_COVERAGE = 0.9      # Min share of the lookback with data for a ticker to be picked
+
+# Portfolio covariance / mean-variance analysis
+FRONTIER_POINTS = 50  # Points on the efficient frontier
+
+# Monte Carlo risk simulation
+MC_PATHS = 20000       # Simulated paths
+MC_CHUNK_SIZE = 5000   # Paths per chunk (bounds memory)
+MC_SEED = 42           # Seed for reproducible runs
+MC_MAX_WORKERS = 1     # >1 fans chunks out across a process pool
+
+# Shared HTTP session for crawling / content extraction
+HTTP_POOL_CONNECTIONS = 20  # Per-host pools kept alive
+HTTP_POOL_MAXSIZE = 10      # Keep-alive connections per host
+
+# Async crawl engine
+CRAWL_MAX_CONCURRENCY = 16  # Concurrent fetch/parse jobs across all tickers
+CRAWL_PER_HOST_LIMIT = 4    # Concurrent jobs against a single host
+
+# Per-host rate limiting / circuit breaker for crawling
+RATE_LIMIT_DEFAULT_RPS = 2.0   # Requests per second per host
+RATE_LIMIT_BURST = 4           # Token bucket capacity
+RATE_LIMIT_HOST_RPS = {        # Stricter hosts
+    "www.google.com": 1.0,
+    "duckduckgo.com": 1.0,
+}
+RATE_LIMIT_MIN_RPS = 0.1       # Floor when backing off on 429/503
+BACKOFF_BASE_SECONDS = 1.0     # First backoff without Retry-After (doubles per failure)
+BACKOFF_MAX_SECONDS = 60.0
+CIRCUIT_FAILURE_THRESHOLD = 3  # Consecutive failures before the host is skipped
+CIRCUIT_COOLDOWN_SECONDS = 300
+CIRCUIT_PROBE_TIMEOUT_SECONDS = 30  # After the cooldown one probe request is let through; another after this long
+
+# Persistent HTTP response cache (crawler / content extraction)
+HTTP_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "http_cache.sqlite")
+HTTP_CACHE_MAX_BYTES = 256 * 1024 * 1024  # LRU eviction above this total body size
+HTTP_CACHE_TTL_DEFAULT = 24 * 3600        # Article pages rarely change
+HTTP_CACHE_TTL_BY_HOST = {                # Search / quote pages and feeds refresh faster
+    "www.google.com": 1800,
+    "finance.yahoo.com": 1800,
+    "www.marketwatch.com": 1800,
+    "duckduckgo.com": 1800,
+    "feeds.finance.yahoo.com": 600,
+    "feeds.reuters.com": 600,
+    "www.nasdaq.com": 600,
+    "www.cnbc.com": 600,
+}
+
+# Bounded page download for link content extraction
+CONTENT_MAX_BYTES = 1024 * 1024        # Never read more than this per page
+CONTENT_CHUNK_BYTES = 16 * 1024        # Streaming read size
+CONTENT_FIRST_CHECK_BYTES = 64 * 1024  # First "enough text?" check, then at doubling offsets
+TEXT_CONTENT_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
+
+# Near-duplicate article removal before prompting
+DEDUP_NUM_PERM = 64     # MinHash permutations
+DEDUP_THRESHOLD = 0.5   # Estimated Jaccard (word uni+bigrams) at which articles count as the same story
+DEDUP_SOURCE_PRIORITY = ["NEWS", "RSS", "MARKETWATCH", "YAHOO", "SEARCH"]  # Copy kept from a duplicate group
+
+# Fetch-once document store for link content
+DOCUMENT_STORE_SIZE = 512   # Documents kept in memory (LRU)
+DOCUMENT_TTL_SECONDS = 1800  # Refetch a stored document after this long
+DOCUMENT_MAX_CHARS = 2000   # Main text kept per page (longest excerpt any caller uses)
+DOCUMENT_TRACKING_PARAMS = {"gclid", "fbclid", "mc_cid", "mc_eid", "ref", "cmpid", "guccounter", "ncid", "yptr"}
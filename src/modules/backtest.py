@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+from collections import namedtuple
+from config import TRADING_DAYS_PER_YEAR, BACKTEST_COST_BPS, BACKTEST_MIN_COVERAGE
+
+BacktestResult = namedtuple('BacktestResult', [
+    'equity', 'rebalance_dates', 'holdings', 'weights', 'turnover', 'stats'
+])
+
+
+def rebalance_rows(dates, freq='M'):
+    """Rows of the last trading day in each period ('W', 'M', 'Q', ...), excluding the final row."""
+    periods = dates.to_period(freq)
+    is_last = np.append(periods[1:] != periods[:-1], False)
+    return np.flatnonzero(is_last)
+
+
+def trailing_scores(index, rows, lookback):
+    """Trailing log return and daily-return std % over the ``lookback`` rows ending at each row.
+
+    Returns (log_return, risk_pct, coverage) as (rows x tickers) arrays, where
+    coverage is the share of the lookback that had a daily return.
+    """
+    cols = np.arange(len(index.matrix.tickers))[None, :]
+    b = (rows + 1)[:, None]
+    a = (rows + 1 - lookback)[:, None]
+    log_return = index.cum_log[b, cols] - index.cum_log[a, cols]
+    count = index.cum_count[b, cols] - index.cum_count[a, cols]
+    total = index.cum_ret[b, cols] - index.cum_ret[a, cols]
+    total_sq = index.cum_sq[b, cols] - index.cum_sq[a, cols]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        var = np.maximum(total_sq - total ** 2 / count, 0) / (count - 1)
+        risk_pct = np.where(count > 1, np.sqrt(var) * 100, np.nan)
+    return log_return, risk_pct, count / lookback
+
+
+def select_top_n(scores, eligible, top_n):
+    """Equal weights on the top-N eligible scores of every row."""
+    ranked = np.where(eligible, scores, -np.inf)
+    k = min(top_n, ranked.shape[1])
+    top = np.argpartition(-ranked, k - 1, axis=1)[:, :k]
+    picked = np.take_along_axis(eligible, top, axis=1)
+    weights = np.zeros(ranked.shape)
+    rows = np.repeat(np.arange(ranked.shape[0]), k).reshape(-1, k)
+    weights[rows[picked], top[picked]] = 1.0
+    n_picked = weights.sum(axis=1, keepdims=True)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(n_picked > 0, weights / n_picked, 0.0)
+
+
+def performance_stats(equity, periods_per_year=TRADING_DAYS_PER_YEAR):
+    """Total return, CAGR, annualized volatility, Sharpe and max drawdown of an equity curve."""
+    values = equity.to_numpy()
+    rets = values[1:] / values[:-1] - 1
+    years = len(rets) / periods_per_year
+    vol = rets.std(ddof=1) * np.sqrt(periods_per_year) if len(rets) > 1 else np.nan
+    drawdown = values / np.maximum.accumulate(values) - 1
+    return {
+        'Total Return (%)': (values[-1] / values[0] - 1) * 100,
+        'CAGR (%)': ((values[-1] / values[0]) ** (1 / years) - 1) * 100 if years > 0 else np.nan,
+        'Volatility (%)': vol * 100,
+        'Sharpe': rets.mean() * periods_per_year / vol if vol and vol > 0 else np.nan,
+        'Max Drawdown (%)': -drawdown.min() * 100,
+    }
+
+
+def run_backtest(index, top_n=5, lookback=126, freq='M', max_risk=None,
+                 cost_bps=BACKTEST_COST_BPS, start_date=None, end_date=None):
+    """Backtest buying the top-N tickers by trailing return, rebalanced on a schedule.
+
+    At the close of each rebalance day the portfolio is reset to equal
+    weights in the N best trailing ``lookback``-day returns (optionally only
+    among tickers whose trailing daily std % is at most ``max_risk``), then
+    held with drifting weights until the next rebalance; a rebalance with
+    no eligible ticker holds cash for that period. Turnover is
+    charged ``cost_bps`` per unit traded. Everything is computed with array
+    operations over the (dates x tickers) matrix, without a per-date loop.
+    """
+    dates = index.matrix.dates
+    lo = dates.searchsorted(pd.Timestamp(start_date)) if start_date is not None else 0
+    hi = dates.searchsorted(pd.Timestamp(end_date)) if end_date is not None else len(dates)
+    rows = rebalance_rows(dates[:hi], freq)
+    # 룩백 구간이 확보되고 시작일 이후인 리밸런싱 시점만 사용
+    rows = rows[(rows >= max(lo, lookback))]
+    if len(rows) == 0:
+        return None
+
+    log_return, risk_pct, coverage = trailing_scores(index, rows, lookback)
+    tradable = index.prev_valid[rows] == rows[:, None]
+    eligible = tradable & (coverage >= BACKTEST_MIN_COVERAGE) & ~np.isnan(log_return)
+    if max_risk is not None:
+        with np.errstate(invalid='ignore'):
+            eligible &= risk_pct <= max_risk
+    weights = select_top_n(log_return, eligible, top_n)
+
+    # 종목별 누적 성장률 (결측 이후에는 마지막 가격에서 고정)
+    growth = np.exp(index.cum_log[1:hi + 1])
+    day_rows = np.arange(rows[0], hi)
+    period = np.searchsorted(rows, day_rows, 'left') - 1
+    first_day = period < 0
+    period = np.maximum(period, 0)
+    rel = growth[day_rows] / growth[rows[period]]
+    # 편입 종목이 없거나 일부만 편입된 기간의 나머지 비중은 현금으로 보유
+    cash = 1 - weights[period].sum(axis=1)
+    period_growth = np.where(first_day, 1.0, (weights[period] * rel).sum(axis=1) + cash)
+
+    # 리밸런싱 직전의 흘러간 비중과 새 비중의 차이로 회전율 계산
+    at_rebalance = np.searchsorted(day_rows, rows)
+    drifted = np.zeros_like(weights)
+    end_growth = np.ones(len(rows))
+    if len(rows) > 1:
+        prev_rel = rel[at_rebalance[1:]]
+        end_growth[:-1] = period_growth[at_rebalance[1:]]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            drifted[1:] = weights[:-1] * prev_rel / end_growth[:-1, None]
+    turnover = np.abs(weights - drifted).sum(axis=1)
+    cost = 1 - turnover * cost_bps / 1e4
+
+    # 기간 i의 기준 자산 = 이전 기간 성장률과 비용의 누적곱
+    base = np.cumprod(cost * np.append(1.0, end_growth[:-1]))
+    equity = np.where(first_day, 1.0, base[period] * period_growth)
+    equity = pd.Series(equity, index=dates[day_rows], name='Equity')
+
+    tickers = np.array(index.matrix.tickers)
+    holdings = [tickers[w > 0].tolist() for w in weights]
+    rebalance_dates = dates[rows]
+    return BacktestResult(
+        equity=equity,
+        rebalance_dates=rebalance_dates,
+        holdings=holdings,
+        weights=weights,
+        turnover=pd.Series(turnover, index=rebalance_dates, name='Turnover'),
+        stats=performance_stats(equity),
+    )
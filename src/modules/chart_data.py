@@ -0,0 +1,67 @@
+import pandas as pd
+from functools import lru_cache
+from config import CHART_CACHE_SIZE, MA_WINDOWS
+from modules.price_store import load_history
+from modules.indicators import rolling_means
+
+OHLCV_AGG = {
+    'Open': 'first',
+    'High': 'max',
+    'Low': 'min',
+    'Close': 'last',
+    'Volume': 'sum'
+}
+
+# 차트 주기 -> 리샘플 규칙 (일봉은 원본 그대로)
+PERIOD_RULES = {
+    "일봉": None,
+    "주봉": ['W-FRI'],       # 금요일 기준 주봉
+    "월봉": ['ME', 'M'],     # 월말 기준 월봉 (pandas 2.2 미만은 'M')
+}
+
+
+def resample_ohlcv(data, rules):
+    """Aggregate daily bars into coarser OHLCV bars using the first supported rule."""
+    for rule in rules:
+        try:
+            return data.resample(rule).agg(OHLCV_AGG).dropna()
+        except ValueError:
+            continue
+    raise ValueError(f"Unsupported resample rules: {rules}")
+
+
+@lru_cache(maxsize=CHART_CACHE_SIZE)
+def get_price_pyramid(ticker, start_date, end_date):
+    """Return daily, weekly and monthly bars for a ticker, derived once per date range.
+
+    Results are kept in a bounded LRU cache, so switching the chart period or
+    toggling tickers reuses them. Callers must not modify the returned frames.
+    """
+    daily = load_history(ticker, start_date, end_date)
+    pyramid = {}
+    for period, rules in PERIOD_RULES.items():
+        if daily.empty or rules is None:
+            pyramid[period] = daily
+        else:
+            pyramid[period] = resample_ohlcv(daily, rules)
+    return pyramid
+
+
+
+@lru_cache(maxsize=CHART_CACHE_SIZE)
+def get_moving_averages(tickers, start_date, end_date, period, windows=tuple(MA_WINDOWS)):
+    """Return {window: dates x tickers DataFrame} of moving averages for a chart period.
+
+    Closes for every ticker are aligned into one matrix and all windows are
+    computed in a single cumulative-sum pass, so toggling MA or ticker
+    checkboxes only reads from the cache. ``tickers`` must be a tuple.
+    """
+    closes = pd.concat(
+        {ticker: get_price_pyramid(ticker, start_date, end_date)[period]['Close'] for ticker in tickers},
+        axis=1
+    ).sort_index()
+    means = rolling_means(closes.to_numpy(dtype=float), windows)
+    return {
+        window: pd.DataFrame(values, index=closes.index, columns=closes.columns)
+        for window, values in means.items()
+    }
@@ -0,0 +1,185 @@
+import os
+import glob
+import threading
+from io import StringIO
+from datetime import datetime, timedelta
+import pandas as pd
+import requests
+from config import SP500_WIKI_URL, CONSTITUENTS_DIR, CONSTITUENT_REFRESH_DAYS, CONSTITUENT_SNAPSHOT_KEEP
+
+SNAPSHOT_COLUMNS = ['Ticker', 'Security', 'Sector', 'SubIndustry', 'DateAdded', 'DateRemoved']
+
+_lock = threading.Lock()
+_snapshot = None        # (DataFrame, fetched_at)
+_refreshing = False
+
+
+def normalize_symbol(symbol):
+    """Convert an index symbol to the yfinance form (e.g. BRK.B -> BRK-B)."""
+    if not isinstance(symbol, str):
+        return ""
+    return symbol.strip().upper().replace('.', '-')
+
+
+def _flatten_columns(df):
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = [
+            ' '.join(dict.fromkeys(str(level) for level in col if not str(level).startswith('Unnamed')))
+            for col in df.columns
+        ]
+    return df
+
+
+def _parse_dates(values):
+    return pd.to_datetime(values, errors='coerce', format='mixed')
+
+
+def build_constituent_table(current, changes):
+    """Combine the current member table and the change log into one snapshot.
+
+    Current members have no removal date. Tickers that were removed from the
+    index keep their removal date (and add date when the log has one) so the
+    member list can be rebuilt for past dates.
+    """
+    current = _flatten_columns(current.copy())
+    table = pd.DataFrame({
+        'Ticker': current['Symbol'].map(normalize_symbol),
+        'Security': current['Security'],
+        'Sector': current['GICS Sector'],
+        'SubIndustry': current['GICS Sub-Industry'],
+        'DateAdded': _parse_dates(current['Date added']) if 'Date added' in current else pd.NaT,
+        'DateRemoved': pd.NaT,
+    })
+
+    if changes is not None and not changes.empty:
+        changes = _flatten_columns(changes.copy())
+        log = pd.DataFrame({
+            'Date': _parse_dates(changes['Date']),
+            'Added': changes['Added Ticker'].map(normalize_symbol),
+            'Removed': changes['Removed Ticker'].map(normalize_symbol),
+            'RemovedSecurity': changes['Removed Security'],
+        }).dropna(subset=['Date']).sort_values('Date')
+        members = set(table['Ticker'])
+        removed_rows = {}
+        for row in log.itertuples(index=False):
+            # 현재 편입 종목이 아닌 티커만 편입/편출 이력을 재구성
+            if row.Added and row.Added not in members:
+                record = removed_rows.setdefault(row.Added, {'Ticker': row.Added})
+                record['DateAdded'] = row.Date
+                record['DateRemoved'] = pd.NaT
+            if row.Removed and row.Removed not in members:
+                record = removed_rows.setdefault(row.Removed, {'Ticker': row.Removed, 'DateAdded': pd.NaT})
+                record['Security'] = row.RemovedSecurity
+                record['DateRemoved'] = row.Date
+        removed = pd.DataFrame([r for r in removed_rows.values() if pd.notna(r.get('DateRemoved'))])
+        if not removed.empty:
+            table = pd.concat([table, removed], ignore_index=True)
+
+    table = table[table['Ticker'] != ""].drop_duplicates(subset=['Ticker'], keep='first')
+    return table.reindex(columns=SNAPSHOT_COLUMNS).reset_index(drop=True)
+
+
+def fetch_constituents():
+    """Scrape the S&P 500 member table and change log from Wikipedia."""
+    headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+    response = requests.get(SP500_WIKI_URL, headers=headers, timeout=15)
+    response.raise_for_status()
+    tables = pd.read_html(StringIO(response.text))
+    changes = tables[1] if len(tables) > 1 else None
+    return build_constituent_table(tables[0], changes)
+
+
+def save_snapshot(table, fetched_at=None):
+    """Write a versioned snapshot and prune old versions."""
+    fetched_at = fetched_at or datetime.now()
+    os.makedirs(CONSTITUENTS_DIR, exist_ok=True)
+    path = os.path.join(CONSTITUENTS_DIR, f"sp500_{fetched_at:%Y%m%d%H%M%S}.parquet")
+    table.to_parquet(path, index=False)
+    for old_path in sorted(glob.glob(os.path.join(CONSTITUENTS_DIR, "sp500_*.parquet")))[:-CONSTITUENT_SNAPSHOT_KEEP]:
+        os.remove(old_path)
+    return path
+
+
+def load_latest_snapshot():
+    """Return (table, fetched_at) for the newest snapshot on disk, or (None, None)."""
+    paths = sorted(glob.glob(os.path.join(CONSTITUENTS_DIR, "sp500_*.parquet")))
+    if not paths:
+        return None, None
+    stamp = os.path.basename(paths[-1])[len("sp500_"):-len(".parquet")]
+    return pd.read_parquet(paths[-1]), datetime.strptime(stamp, "%Y%m%d%H%M%S")
+
+
+def refresh_constituents():
+    """Fetch a fresh member table, persist it and swap it in."""
+    global _snapshot
+    table = fetch_constituents()
+    fetched_at = datetime.now()
+    save_snapshot(table, fetched_at)
+    with _lock:
+        _snapshot = (table, fetched_at)
+    return table
+
+
+def _refresh_in_background():
+    global _refreshing
+    try:
+        refresh_constituents()
+    except Exception as e:
+        print(f"Error refreshing S&P 500 constituents: {e}")
+    finally:
+        _refreshing = False
+
+
+def get_constituents():
+    """Return the member table, loading the persisted snapshot before touching the network.
+
+    A stale snapshot is returned immediately while a background thread
+    refreshes it. Only the very first run (no snapshot on disk) blocks on
+    the scrape.
+    """
+    global _snapshot, _refreshing
+    with _lock:
+        if _snapshot is None:
+            table, fetched_at = load_latest_snapshot()
+            if table is not None:
+                _snapshot = (table, fetched_at)
+        snapshot = _snapshot
+        stale = snapshot is not None and datetime.now() - snapshot[1] > timedelta(days=CONSTITUENT_REFRESH_DAYS)
+        if stale and not _refreshing:
+            _refreshing = True
+            threading.Thread(target=_refresh_in_background, daemon=True).start()
+    if snapshot is None:
+        return refresh_constituents()
+    return snapshot[0]
+
+
+def get_members(as_of=None, sectors=None):
+    """Return member rows, optionally as of a past date and limited to GICS sectors."""
+    table = get_constituents()
+    if as_of is None:
+        members = table[table['DateRemoved'].isna()]
+    else:
+        as_of = pd.Timestamp(as_of)
+        added = table['DateAdded'].isna() | (table['DateAdded'] <= as_of)
+        not_removed = table['DateRemoved'].isna() | (table['DateRemoved'] > as_of)
+        members = table[added & not_removed]
+    if sectors:
+        members = members[members['Sector'].isin(sectors)]
+    return members
+
+
+def get_sectors():
+    """Return the sorted list of GICS sectors among current members."""
+    return sorted(get_members()['Sector'].dropna().unique().tolist())
+
+
+def get_sector_map():
+    """Return a ticker -> GICS sector mapping for every known ticker."""
+    table = get_constituents()
+    return dict(zip(table['Ticker'], table['Sector']))
+
+
+def get_name_map():
+    """Return a ticker -> company name mapping for every known ticker."""
+    table = get_constituents()
+    return dict(zip(table['Ticker'], table['Security']))
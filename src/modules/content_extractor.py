@@ -1,47 +1,22 @@
-import requests
-from bs4 import BeautifulSoup
-import time
-import random
 from config import NUM_REFERENCES
+from modules.document_store import get_document, canonical_url, document_stats
 
 def extract_content_from_url(url, max_chars=2000):
-    """Extract meaningful content from a given URL"""
-    try:
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-        response = requests.get(url, headers=headers, timeout=10)
-        
-        if response and response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Remove script and style elements
-            for script in soup(["script", "style", "nav", "header", "footer"]):
-                script.decompose()
-            
-            # Try to find main content areas
-            content_selectors = [
-                'article', 'main', '.content', '.article-body', 
-                '.post-content', '.entry-content', 'p'
-            ]
-            
-            content_text = ""
-            for selector in content_selectors:
-                elements = soup.select(selector)
-                if elements:
-                    content_text = ' '.join([elem.get_text().strip() for elem in elements[:3]])
-                    break
-            
-            if not content_text:
-                content_text = soup.get_text()
-            
-            # Clean and limit content
-            content_text = ' '.join(content_text.split())  # Remove extra whitespace
-            result_text = content_text[:max_chars] + "..." if len(content_text) > max_chars else content_text
-            return result_text, None
-            
-    except Exception as e:
-        return f"Error extracting content: {str(e)}", None
+    """Extract meaningful content from a given URL
+
+    Returns (text, document) where document carries the fetched url and
+    extraction metadata. Each URL is fetched and parsed at most once through
+    the document store, whichever module asks for it. A failed fetch returns
+    empty text with the reason in document['error'].
+    """
+    document = get_document(url)
+    if document.get('error'):
+        return "", document
     
-    return "", None
+    # Clean and limit content
+    content_text = document['text']
+    result_text = content_text[:max_chars] + "..." if len(content_text) > max_chars else content_text
+    return result_text, document
 
 def analyze_link_relevance(url, ticker):
     """Analyze how relevant a link is to the given ticker"""
@@ -75,6 +50,23 @@ def analyze_link_relevance(url, ticker):
     except:
         return 0
 
+def rank_links(ticker, links):
+    """(score, link) pairs for the http links, most relevant first"""
+    scored_links, seen = [], set()
+    for link in links:
+        if not link or link.startswith('#'):
+            continue
+        # 리다이렉트/추적 파라미터를 정리한 URL 기준으로 중복 제거
+        link = canonical_url(link)
+        if link.startswith('http') and link not in seen:
+            seen.add(link)
+            score = analyze_link_relevance(link, ticker)
+            scored_links.append((score, link))
+    
+    # Sort by relevance score (highest first)
+    scored_links.sort(key=lambda x: x[0], reverse=True)
+    return scored_links
+
 def get_enhanced_content_for_ticker(ticker, links, max_links=5):
     """Get enhanced content from the most relevant links for a ticker"""
     enhanced_content = []
@@ -84,15 +76,7 @@ def get_enhanced_content_for_ticker(ticker, links, max_links=5):
         debug_info.append(f"❌ No links available for {ticker}")
         return enhanced_content, debug_info
     
-    # Score and sort links by relevance
-    scored_links = []
-    for link in links:
-        if link and link.startswith('http'):
-            score = analyze_link_relevance(link, ticker)
-            scored_links.append((score, link))
-    
-    # Sort by relevance score (highest first)
-    scored_links.sort(key=lambda x: x[0], reverse=True)
+    scored_links = rank_links(ticker, links)
     
     debug_info.append(f"📊 Analyzing {len(scored_links)} links for {ticker}")
     
@@ -111,12 +95,11 @@ def get_enhanced_content_for_ticker(ticker, links, max_links=5):
                 debug_info.append(f"✅ Successfully extracted {len(content)} characters")
             else:
                 debug_info.append(f"⚠️ Limited content from {link}")
-            
-            # Add delay to be respectful
-            time.sleep(random.uniform(1, 2))
         
         except Exception as e:
             debug_info.append(f"❌ Error extracting from {link}: {str(e)}")
     
     debug_info.append(f"✅ Enhanced content extraction complete: {len(enhanced_content)} sources")
+    stats = document_stats()
+    debug_info.append(f"📚 Documents: {stats.get('fetched', 0)} fetched, {stats.get('reused', 0)} reused")
     return enhanced_content, debug_info
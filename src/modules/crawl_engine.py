@@ -0,0 +1,158 @@
+import asyncio
+import queue
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+from config import CRAWL_MAX_CONCURRENCY, CRAWL_PER_HOST_LIMIT
+from modules.crawler import CRAWL_SOURCES, finalize_crawl, get_user_agents
+from modules.rss_batch import GLOBAL_FEEDS, route_feed_entries
+from modules.content_extractor import extract_content_from_url, rank_links
+from modules.document_store import document_stats
+
+# 소스별 대상 호스트 (호스트별 동시 요청 제한 키). RSS는 여러 피드를 한 작업에서 읽으므로 묶어서 제한
+SOURCE_HOSTS = {
+    "google": "www.google.com",
+    "yahoo": "finance.yahoo.com",
+    "marketwatch": "www.marketwatch.com",
+    "rss": "rss-feeds",
+    "alternative": "duckduckgo.com",
+}
+
+_DONE = object()
+
+
+def _host_of(url):
+    return urlsplit(url).hostname or url
+
+
+def _route_rss(tickers):
+    """One batch pass over the global RSS feeds for all tickers, matched by symbol and company name."""
+    try:
+        from modules.constituents import get_name_map
+        names = get_name_map()
+    except Exception as e:
+        print(f"Company names unavailable for RSS matching: {e}")
+        names = {}
+    return route_feed_entries(tickers, names, GLOBAL_FEEDS, get_user_agents())
+
+
+async def _crawl_ticker(ticker, date, sources, run, max_links, rss_batch):
+    """All sources for one ticker, then the follow-up link extraction, as concurrent jobs."""
+    debug_info = [f"🚀 Starting async crawl for {ticker}", f"📅 Target date: {date}",
+                  f"🔌 Enabled sources: {[key for key, _, _ in sources]}"]
+    all_articles, reference_links = [], []
+
+    async def crawl_source(key, func):
+        if key == "rss":
+            # 공용 피드는 전체 종목이 한 번의 배치 결과를 공유
+            routed, route_debug = await rss_batch
+            articles, links, debug = await run(SOURCE_HOSTS[key], func, ticker, routed.get(ticker, []))
+            return articles, links, route_debug + debug
+        return await run(SOURCE_HOSTS.get(key, key), func, ticker)
+
+    results = await asyncio.gather(
+        *(crawl_source(key, func) for key, _, func in sources),
+        return_exceptions=True
+    )
+    for (_, source_name, _), result in zip(sources, results):
+        if isinstance(result, Exception):
+            debug_info.append(f"❌ {source_name} failed: {result}")
+            continue
+        articles, links, debug = result
+        debug_info.append(f"📊 {source_name} results: {len(articles)} articles, {len(links)} links")
+        all_articles.extend(articles)
+        reference_links.extend(links)
+        debug_info.extend(debug)
+    articles, links, debug = finalize_crawl(ticker, all_articles, reference_links, debug_info)
+
+    # 관련도 상위 링크 본문 추출도 다른 종목 작업과 동시에 진행
+    top_links = rank_links(ticker, links)[:max_links]
+    extraction_debug = [f"📊 Analyzing {len(top_links)} links for {ticker}"]
+    contents = await asyncio.gather(
+        *(run(_host_of(link), extract_content_from_url, link) for _, link in top_links),
+        return_exceptions=True
+    )
+    enhanced_content = []
+    for (score, link), result in zip(top_links, contents):
+        if isinstance(result, Exception):
+            extraction_debug.append(f"❌ Error extracting from {link}: {result}")
+            continue
+        content, _ = result
+        if content and len(content.strip()) > 50:
+            enhanced_content.append({'url': link, 'content': content, 'relevance_score': score})
+            extraction_debug.append(f"✅ Extracted {len(content)} characters (score: {score})")
+        else:
+            extraction_debug.append(f"⚠️ Limited content from {link}")
+    extraction_debug.append(f"✅ Enhanced content extraction complete: {len(enhanced_content)} sources")
+    stats = document_stats()
+    extraction_debug.append(f"📚 Documents: {stats.get('fetched', 0)} fetched, {stats.get('reused', 0)} reused")
+
+    return ticker, {
+        'articles': articles,
+        'links': links,
+        'debug': debug,
+        'enhanced': (enhanced_content, extraction_debug),
+    }
+
+
+async def _crawl_all(tickers, date, sources, max_links, emit, max_concurrency, per_host_limit):
+    loop = asyncio.get_running_loop()
+    global_limit = asyncio.Semaphore(max_concurrency)
+    host_limits = defaultdict(lambda: asyncio.Semaphore(per_host_limit))
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        async def run(host, func, *args):
+            # 호스트 슬롯을 먼저 잡아야 대기 중인 작업이 전역 슬롯을 점유하지 않음
+            async with host_limits[host], global_limit:
+                return await loop.run_in_executor(executor, func, *args)
+
+        rss_batch = None
+        if any(key == "rss" for key, _, _ in sources):
+            rss_batch = asyncio.create_task(run("rss-batch", _route_rss, tickers))
+        async def crawl_one(ticker):
+            # 한 종목의 예외가 전체 크롤링을 멈추지 않도록 오류 결과로 바꿔서 내보낸다
+            try:
+                return await _crawl_ticker(ticker, date, sources, run, max_links, rss_batch)
+            except Exception as e:
+                message = f"❌ Crawl failed for {ticker}: {e}"
+                return ticker, {'articles': [], 'links': [], 'debug': [message], 'enhanced': ([], [message])}
+
+        tasks = [asyncio.create_task(crawl_one(ticker)) for ticker in tickers]
+        for task in asyncio.as_completed(tasks):
+            emit(await task)
+
+
+def crawl_tickers(tickers, date, enabled_sources=None, max_links=3,
+                  max_concurrency=CRAWL_MAX_CONCURRENCY, per_host_limit=CRAWL_PER_HOST_LIMIT):
+    """Crawl every (ticker, source) job and its link extraction concurrently.
+
+    Yields (ticker, result) in completion order, where result holds
+    articles, links, debug and enhanced (the pair that
+    run_llm_with_enhanced_content accepts). The event loop runs on a
+    background thread so callers such as Streamlit stay synchronous.
+    """
+    if enabled_sources is None:
+        enabled_sources = ['google']  # crawl_info_parallel과 동일한 기본값
+    sources = [(key, name, func) for key, (name, func) in CRAWL_SOURCES.items() if key in enabled_sources]
+    if not sources:
+        sources = [("google", *CRAWL_SOURCES["google"])]
+
+    results = queue.Queue()
+
+    def worker():
+        try:
+            asyncio.run(_crawl_all(tickers, date, sources, max_links, results.put, max_concurrency, per_host_limit))
+        except Exception as e:
+            results.put(e)
+        finally:
+            results.put(_DONE)
+
+    threading.Thread(target=worker, daemon=True).start()
+    while True:
+        item = results.get()
+        if item is _DONE:
+            break
+        if isinstance(item, Exception):
+            raise item
+        yield item
@@ -1,12 +1,16 @@
-import requests
-from bs4 import BeautifulSoup
-import time
 import random
 import json
 from datetime import datetime, timedelta
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import streamlit as st
 from config import NUM_REFERENCES
+from modules.http_client import http_get, http_stats
+from modules.html_parse import make_soup
+from modules.rate_limiter import limiter_stats
+from modules.http_cache import cache_stats
+from modules.dedup import dedup_articles
+from modules.content_extractor import analyze_link_relevance, extract_content_from_url as _extract_content
+from modules.rss_batch import GLOBAL_FEEDS, build_matcher, match_text, fetch_feed, route_feed_entries
 
 # Try to import feedparser, fallback if not available
 try:
@@ -26,12 +30,10 @@ def get_user_agents():
     ]
 
 def safe_request(url, headers, timeout=5, retries=1):
-    """Make a safe HTTP request with retries and minimal delays"""
+    """Make a safe HTTP request with retries (pacing is done per host by the rate limiter)"""
     for attempt in range(retries):
         try:
-            # Reduced delay for faster processing
-            time.sleep(random.uniform(0.1, 0.5))
-            response = requests.get(url, headers=headers, timeout=timeout)
+            response = http_get(url, headers=headers, timeout=timeout)
             if response.status_code == 200:
                 return response
         except Exception as e:
@@ -49,7 +51,7 @@ def crawl_google_finance(ticker):
         response = safe_request(url, headers)
         
         if response:
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = make_soup(response.text, 'google')
             # Look for news results
             news_results = soup.find_all('div', class_='SoaBEf')
             if not news_results:
@@ -91,7 +93,7 @@ def crawl_yahoo_finance(ticker):
         response = safe_request(url, headers)
         
         if response:
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = make_soup(response.text)
             # Look for news articles
             news_items = soup.find_all('h3', class_='Mb(5px)')
             if not news_items:
@@ -125,7 +127,7 @@ def crawl_marketwatch(ticker):
         response = safe_request(url, headers)
         
         if response:
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = make_soup(response.text, 'marketwatch')
             # Look for news headlines
             headlines = soup.find_all('a', class_='link')
             if not headlines:
@@ -152,8 +154,13 @@ def crawl_marketwatch(ticker):
     
     return articles, links, debug
 
-def crawl_rss_feeds(ticker):
-    """Crawl RSS feeds for financial news"""
+def crawl_rss_feeds(ticker, routed_entries=None):
+    """Crawl RSS feeds for financial news
+
+    ``routed_entries`` are this ticker's (feed_url, entry) pairs from a batch
+    route_feed_entries run; without them the global feeds are fetched and
+    matched for this ticker alone.
+    """
     articles, links, debug = [], [], []
     
     if not HAS_FEEDPARSER:
@@ -161,43 +168,43 @@ def crawl_rss_feeds(ticker):
         debug.append("💡 Install with: pip install feedparser")
         return articles, links, debug
     
-    # List of financial RSS feeds
-    rss_feeds = [
-        f"https://feeds.finance.yahoo.com/rss/2.0/headline?s={ticker}&region=US&lang=en-US",
-        "https://feeds.reuters.com/reuters/businessNews",
-        "https://www.nasdaq.com/feed/rssoutbound?category=Stocks",
-        "https://www.cnbc.com/id/100003114/device/rss/rss.html"
-    ]
+    # Ticker 전용 피드는 종목별로, 공용 피드는 배치에서 한 번만 받아서 배분
+    feed_url = f"https://feeds.finance.yahoo.com/rss/2.0/headline?s={ticker}&region=US&lang=en-US"
+    by_feed = {feed_url: []}
+    try:
+        debug.append(f"🔍 Checking RSS: {feed_url}")
+        matcher = build_matcher([ticker])
+        by_feed[feed_url] = [
+            entry for entry in fetch_feed(feed_url, random.choice(get_user_agents()))[:10]
+            if match_text(matcher, f"{entry.get('title', '')}\n{entry.get('summary', '')}")
+        ]
+    except Exception as e:
+        debug.append(f"❌ RSS {feed_url} error: {e}")
     
-    for feed_url in rss_feeds:
-        try:
-            debug.append(f"🔍 Checking RSS: {feed_url}")
-            feed = feedparser.parse(feed_url)
-            
-            relevant_entries = []
-            for entry in feed.entries[:10]:
+    if routed_entries is None:
+        routed, route_debug = route_feed_entries([ticker], user_agents=get_user_agents())
+        routed_entries = routed.get(ticker, [])
+        debug.extend(route_debug)
+    for url in GLOBAL_FEEDS:
+        by_feed[url] = []
+    for url, entry in routed_entries:
+        by_feed.setdefault(url, []).append(entry)
+    
+    for url, relevant_entries in by_feed.items():
+        debug.append(f"✅ RSS {url}: {len(relevant_entries)} relevant entries")
+        
+        for entry in relevant_entries[:3]:
+            try:
                 title = entry.get('title', '')
                 summary = entry.get('summary', '')
-                if ticker.upper() in title.upper() or ticker.upper() in summary.upper():
-                    relevant_entries.append(entry)
-            
-            debug.append(f"✅ RSS {feed_url}: {len(relevant_entries)} relevant entries")
-            
-            for entry in relevant_entries[:3]:
-                try:
-                    title = entry.get('title', '')
-                    summary = entry.get('summary', '')
-                    link = entry.get('link', '')
-                    
-                    content = f"{title}: {summary[:200]}..." if summary else title
-                    articles.append(f"[RSS] {content}")
-                    links.append(link)
-                    debug.append(f"✅ Added RSS: {title[:50]}...")
-                except Exception as e:
-                    debug.append(f"❌ Error parsing RSS entry: {e}")
-                    
-        except Exception as e:
-            debug.append(f"❌ RSS {feed_url} error: {e}")
+                link = entry.get('link', '')
+                
+                content = f"{title}: {summary[:200]}..." if summary else title
+                articles.append(f"[RSS] {content}")
+                links.append(link)
+                debug.append(f"✅ Added RSS: {title[:50]}...")
+            except Exception as e:
+                debug.append(f"❌ Error parsing RSS entry: {e}")
     
     return articles, links, debug
 
@@ -211,7 +218,7 @@ def crawl_alternative_search(ticker):
         response = safe_request(url, headers)
         
         if response:
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = make_soup(response.text, 'alternative')
             results = soup.find_all('a', class_='result__a')
             
             debug.append(f"✅ DuckDuckGo: {len(results)} results found")
@@ -249,75 +256,18 @@ def generate_fallback_content(ticker):
     return articles, links, debug
 
 def extract_content_from_url(url, max_chars=1000):
-    """Extract meaningful content from a given URL"""
-    try:
-        headers = {'User-Agent': random.choice(get_user_agents())}
-        response = safe_request(url, headers, timeout=10)
-        
-        if response and response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Remove script and style elements
-            for script in soup(["script", "style", "nav", "header", "footer"]):
-                script.decompose()
-            
-            # Try to find main content areas
-            content_selectors = [
-                'article', 'main', '.content', '.article-body', 
-                '.post-content', '.entry-content', 'p'
-            ]
-            
-            content_text = ""
-            for selector in content_selectors:
-                elements = soup.select(selector)
-                if elements:
-                    content_text = ' '.join([elem.get_text().strip() for elem in elements[:3]])
-                    break
-            
-            if not content_text:
-                content_text = soup.get_text()
-            
-            # Clean and limit content
-            content_text = ' '.join(content_text.split())  # Remove extra whitespace
-            return content_text[:max_chars] + "..." if len(content_text) > max_chars else content_text
-            
-    except Exception as e:
-        return f"Error extracting content: {str(e)}"
-    
-    return ""
+    """Extract meaningful content from a given URL (text only; shares content_extractor's document store)"""
+    content, _ = _extract_content(url, max_chars)
+    return content
 
-def analyze_link_relevance(url, ticker):
-    """Analyze how relevant a link is to the given ticker"""
-    try:
-        # Simple relevance scoring based on URL and domain
-        relevance_score = 0
-        url_lower = url.lower()
-        ticker_lower = ticker.lower()
-        
-        # High relevance domains
-        high_relevance_domains = [
-            'finance.yahoo.com', 'marketwatch.com', 'bloomberg.com',
-            'reuters.com', 'cnbc.com', 'fool.com', 'seekingalpha.com'
-        ]
-        
-        for domain in high_relevance_domains:
-            if domain in url_lower:
-                relevance_score += 10
-                break
-        
-        # Ticker mention in URL
-        if ticker_lower in url_lower:
-            relevance_score += 15
-        
-        # Financial keywords in URL
-        financial_keywords = ['stock', 'earnings', 'revenue', 'analysis', 'news', 'investment']
-        for keyword in financial_keywords:
-            if keyword in url_lower:
-                relevance_score += 2
-        
-        return relevance_score
-    except:
-        return 0
+# key -> (display name, crawl function)
+CRAWL_SOURCES = {
+    "google": ("Google Finance", crawl_google_finance),
+    "yahoo": ("Yahoo Finance", crawl_yahoo_finance),
+    "marketwatch": ("MarketWatch", crawl_marketwatch),
+    "rss": ("RSS Feeds", crawl_rss_feeds),
+    "alternative": ("Alternative Search", crawl_alternative_search)
+}
 
 def crawl_info_parallel(ticker, date, enabled_sources=None):
     """Enhanced parallel crawl function for faster processing"""
@@ -330,18 +280,9 @@ def crawl_info_parallel(ticker, date, enabled_sources=None):
     debug_info.append(f"📅 Target date: {date}")
     debug_info.append(f"� Enabled sources: {enabled_sources}")
     
-    # Define all available sources
-    available_sources = {
-        "google": ("Google Finance", crawl_google_finance),
-        "yahoo": ("Yahoo Finance", crawl_yahoo_finance),
-        "marketwatch": ("MarketWatch", crawl_marketwatch),
-        "rss": ("RSS Feeds", crawl_rss_feeds),
-        "alternative": ("Alternative Search", crawl_alternative_search)
-    }
-    
     # Filter sources based on enabled list
     sources_to_run = [
-        (name, func) for key, (name, func) in available_sources.items() 
+        (name, func) for key, (name, func) in CRAWL_SOURCES.items() 
         if key in enabled_sources
     ]
     
@@ -372,6 +313,14 @@ def crawl_info_parallel(ticker, date, enabled_sources=None):
                 error_msg = f"❌ {source_name} failed: {e}"
                 debug_info.append(error_msg)
     
+    return finalize_crawl(ticker, all_articles, reference_links, debug_info)
+
+def finalize_crawl(ticker, all_articles, reference_links, debug_info):
+    """Add fallback content when too little was found and cap to NUM_REFERENCES"""
+    # 여러 소스에서 같은 기사가 중복 수집되면 출처가 가장 좋은 한 건만 남김
+    all_articles, reference_links, dedup = dedup_articles(all_articles, reference_links)
+    if dedup['removed']:
+        debug_info.append(f"🧹 Removed {dedup['removed']} near-duplicate articles ({dedup['before']} → {dedup['after']})")
     debug_info.append(f"📈 Total articles before fallback: {len(all_articles)}")
     
     # If we don't have enough content, add fallback
@@ -394,5 +343,12 @@ def crawl_info_parallel(ticker, date, enabled_sources=None):
     
     final_msg = f"✅ Final results: {len(all_articles)} articles, {len(reference_links)} links"
     debug_info.append(final_msg)
+    stats = http_stats()
+    debug_info.append(f"🔌 HTTP: {stats['requests']} requests, {stats['connections']} connections opened, {stats['reused']} reused ({stats['reuse_rate']:.0%})")
+    cache = cache_stats()
+    debug_info.append(f"💾 HTTP cache: {cache.get('hit', 0)} hits, {cache.get('revalidated', 0)} revalidated, {cache.get('miss', 0)} misses ({cache['hit_rate']:.0%}), {cache['entries']} entries")
+    open_hosts = [host for host, state in limiter_stats().items() if state['circuit_open']]
+    if open_hosts:
+        debug_info.append(f"⛔ Skipping hosts after repeated 429/503/errors: {', '.join(open_hosts)}")
     
     return all_articles, reference_links, debug_info
@@ -1,39 +1,367 @@
+import time
+import multiprocessing
+import numpy as np
 import pandas as pd
-import yfinance as yf
-from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from config import (
+    PRICE_FETCH_CHUNK_SIZE, PRICE_FETCH_MAX_WORKERS, SCREEN_MAX_WORKERS, SCREEN_SHARD_SIZE, BENCHMARK_TICKER,
+    RETURN_INDEX_MAX_GAP_DAYS
+)
+from modules.price_store import load_prices, reset_cache
+from modules.market_data import get_provider, set_provider
+from modules.constituents import get_members, get_sector_map, normalize_symbol
+from modules.screener import (
+    build_price_matrix, build_return_index, query_window, window_rows, rank_results,
+    screen_prices, push_top_n, heap_ranking, select_columns
+)
+from modules.sweep import run_sweep
+from modules.backtest import run_backtest
+from modules.risk_analytics import METRIC_COLUMNS, compute_risk_metrics, risk_filter_mask, slice_matrix
 
-@lru_cache()
-def get_sp500_tickers():
-    """Fetch S&P 500 tickers from Wikipedia."""
-    tables = pd.read_html('https://en.wikipedia.org/wiki/List_of_S%26P_500_companies')
-    df = tables[0]
-    return df['Symbol'].tolist()
+# 마지막으로 만든 누적합 인덱스 (기간만 바꿔 재실행할 때 재사용)
+_return_index_cache = {}
 
+def get_sp500_tickers(as_of=None, sectors=None):
+    """Return S&P 500 tickers (yfinance symbols) from the persisted constituent snapshot."""
+    return get_members(as_of=as_of, sectors=sectors)['Ticker'].tolist()
 
-def get_stock_data(start_date, end_date, target_return, top_n=5):
+
+def fetch_price_data(tickers, start_date, end_date, chunk_size=PRICE_FETCH_CHUNK_SIZE, max_workers=PRICE_FETCH_MAX_WORKERS,
+                     errors=None):
+    """Fetch OHLCV for many tickers in chunked batch requests.
+
+    Chunks are downloaded through the active market-data provider. Returns a
+    wide DataFrame with (field, ticker) columns and the list of tickers for
+    which no data could be retrieved. If ``errors`` is a list, tickers whose
+    batch request raised (rather than returning no bars) are appended to it.
+    """
+    tickers = list(dict.fromkeys(tickers))
+    chunks = [tickers[i:i + chunk_size] for i in range(0, len(tickers), chunk_size)]
+    frames, failed = [], []
+    provider = get_provider()
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks)))) as executor:
+        future_to_chunk = {
+            executor.submit(provider.download, chunk, start_date, end_date): chunk
+            for chunk in chunks
+        }
+        for future in as_completed(future_to_chunk):
+            chunk = future_to_chunk[future]
+            try:
+                data = future.result()
+            except Exception as e:
+                print(f"Error fetching batch ({chunk[0]}..{chunk[-1]}): {e}")
+                failed.extend(chunk)
+                if errors is not None:
+                    errors.extend(chunk)
+                continue
+            if data.empty:
+                failed.extend(chunk)
+                continue
+            returned = set(data.columns.get_level_values(1))
+            failed.extend(t for t in chunk if t not in returned)
+            frames.append(data)
+
+    if not frames:
+        return pd.DataFrame(), failed
+
+    prices = pd.concat(frames, axis=1).sort_index()
+    # 모든 값이 NaN인 티커는 실패로 처리 (상장폐지, 잘못된 심볼 등)
+    closes = prices['Close']
+    empty = [t for t in closes.columns if closes[t].isna().all()]
+    if empty:
+        failed.extend(empty)
+        prices = prices.drop(columns=empty, level=1)
+    return prices, sorted(set(failed))
+
+
+def get_return_index(tickers, start_date, end_date):
+    """Return a prefix-sum index covering [start_date, end_date), rebuilding only when needed.
+
+    A window next to the cached one widens it; a window more than
+    RETURN_INDEX_MAX_GAP_DAYS away replaces it instead of indexing the whole
+    span in between. Either way the price store downloads only dates it has
+    not stored yet. An index whose window ends today or later is never
+    reused, since today's bars are still arriving.
+    """
+    start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+    key = tuple(tickers)
+    cached = _cached_index(tickers, start, end)
+    if cached is not None:
+        return cached
+    entry = _return_index_cache.get(key)
+    # 기존 인덱스 범위와 합쳐서 다시 만들면 기간을 넓혀가며 조정해도 재사용된다
+    if entry and not entry['live']:
+        gap = max(start - entry['end'], entry['start'] - end, pd.Timedelta(0))
+        if gap <= pd.Timedelta(days=RETURN_INDEX_MAX_GAP_DAYS):
+            start, end = min(start, entry['start']), max(end, entry['end'])
+    prices, failed = load_prices(tickers, start, end)
+    if failed:
+        print(f"No price data for {len(failed)} tickers: {', '.join(failed[:20])}")
+    if prices.empty:
+        return None
+    index = build_return_index(build_price_matrix(prices))
+    _return_index_cache.clear()
+    _return_index_cache[key] = {
+        'start': start, 'end': end, 'index': index,
+        'live': end >= pd.Timestamp.today().normalize(),
+    }
+    return index
+
+
+def _cached_index(tickers, start_date, end_date):
+    """The cached prefix-sum index if it already covers [start_date, end_date), else None."""
+    cached = _return_index_cache.get(tuple(tickers))
+    if cached and not cached['live'] and cached['start'] <= pd.Timestamp(start_date) \
+            and pd.Timestamp(end_date) <= cached['end']:
+        return cached['index']
+    return None
+
+
+def load_benchmark_close(start_date, end_date):
+    """Return benchmark (SPY) closes for [start_date, end_date), or None if unavailable."""
+    try:
+        prices, failed = load_prices([BENCHMARK_TICKER], start_date, end_date)
+    except Exception as e:
+        print(f"Error loading benchmark {BENCHMARK_TICKER}: {e}")
+        return None
+    if BENCHMARK_TICKER in failed:
+        return None
+    return prices['Close'][BENCHMARK_TICKER]
+
+
+def _rank_window(index, start, end, target_return, top_n, risk_filters, benchmark_close, mask=None):
+    """Top-N rows of every ticker in the index over [start, end), with risk metrics and filters."""
+    return_pct, risk_pct = query_window(index, start, end)
+    # 낙폭/샤프/소르티노/베타는 조회 구간 행만 잘라 한 번에 계산
+    lo, hi = window_rows(index, start, end)
+    metrics = compute_risk_metrics(slice_matrix(index.matrix, lo, hi), benchmark_close)
+    keep = risk_filter_mask(metrics, risk_filters)
+    if mask is not None:
+        keep &= mask
+    columns = {METRIC_COLUMNS[key]: values for key, values in metrics.items()}
+    return rank_results(index.matrix.tickers, return_pct, risk_pct, target_return, top_n,
+                        mask=keep, columns=columns)
+
+
+def get_stock_data(start_date, end_date, target_return, top_n=5, sectors=None, risk_filters=None):
     """Retrieve and filter stock data based on target return and risk."""
     sp500_tickers = get_sp500_tickers()
-    stock_data = []
-    for ticker in sp500_tickers:
-        try:
-            data = yf.Ticker(ticker).history(start=str(start_date), end=str(end_date))
-            if data.empty:
+    index = get_return_index(sp500_tickers, start_date, end_date)
+    if index is None:
+        return []
+    # 수익률/리스크 계산 및 필터링, 수익률 기준 상위 종목 선택
+    start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+    sector_map = get_sector_map()
+    mask = None
+    if sectors:
+        # 인덱스는 전체 유니버스로 유지하고 섹터 밖 종목만 제외
+        mask = np.array([sector_map.get(t) in sectors for t in index.matrix.tickers], dtype=bool)
+    stock_data = _rank_window(index, start, end, target_return, top_n, risk_filters,
+                              load_benchmark_close(start, end), mask=mask)
+    for row in stock_data:
+        row['Sector'] = sector_map.get(row['Ticker'])
+    return stock_data
+
+
+def sweep_stock_data(windows, thresholds, sectors=None):
+    """Run the screen over a grid of (start, end) windows and target_return thresholds.
+
+    The price matrix and prefix-sum index are loaded once for the span of
+    all windows, so a 100-window sweep costs about as much as one screen.
+    Returns a SweepCube (see modules.sweep).
+    """
+    sp500_tickers = get_sp500_tickers()
+    start = min(pd.Timestamp(w[0]) for w in windows)
+    end = max(pd.Timestamp(w[1]) for w in windows)
+    index = get_return_index(sp500_tickers, start, end)
+    if index is None:
+        return None
+    mask = None
+    if sectors:
+        sector_map = get_sector_map()
+        mask = np.array([sector_map.get(t) in sectors for t in index.matrix.tickers], dtype=bool)
+    return run_sweep(index, windows, thresholds, mask)
+
+
+def backtest_top_n(start_date, end_date, top_n=5, lookback=126, freq='M', max_risk=None, sectors=None):
+    """Backtest picking the S&P 500 top-N by trailing return over [start_date, end_date).
+
+    Prices are loaded from far enough before start_date to cover the first
+    lookback window. Returns a BacktestResult (see modules.backtest) or None.
+    """
+    sp500_tickers = get_sp500_tickers()
+    # 거래일 기준 룩백을 달력일로 넉넉히 환산
+    history_start = pd.Timestamp(start_date) - pd.Timedelta(days=int(lookback * 7 / 5) + 10)
+    index = get_return_index(sp500_tickers, history_start, end_date)
+    if index is None:
+        return None
+    if sectors:
+        # 캐시는 전체 유니버스 인덱스로 공유하고 섹터 종목 열만 잘라서 사용
+        sector_map = get_sector_map()
+        cols = [i for i, t in enumerate(index.matrix.tickers) if sector_map.get(t) in sectors]
+        if not cols:
+            return None
+        index = select_columns(index, cols)
+    return run_backtest(index, top_n=top_n, lookback=lookback, freq=freq, max_risk=max_risk,
+                        start_date=start_date, end_date=end_date)
+
+
+def stream_stock_data(start_date, end_date, target_return, top_n=5, sectors=None, risk_filters=None,
+                      chunk_size=PRICE_FETCH_CHUNK_SIZE, max_workers=PRICE_FETCH_MAX_WORKERS):
+    """Screen the universe chunk by chunk, yielding partial rankings as they arrive.
+
+    Each chunk of the (sector-filtered) universe is ranked from its own
+    prefix-sum index as soon as its prices load and merged into a top-N
+    heap. When the cached universe index already covers the window, chunks
+    are read from it instead without loading anything. Yields (top-N rows
+    so far, tickers screened, total tickers); the last value yielded is the
+    final ranking.
+    """
+    universe = get_sp500_tickers()
+    sector_map = get_sector_map()
+    start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+    tickers = [t for t in universe if not sectors or sector_map.get(t) in sectors]
+    total = len(tickers)
+    if not tickers:
+        yield [], 0, 0
+        return
+    benchmark_close = load_benchmark_close(start, end)
+    heap, done = [], 0
+
+    def push(chunk_index):
+        rows = _rank_window(chunk_index, start, end, target_return, top_n, risk_filters, benchmark_close)
+        for row in rows:
+            row['Sector'] = sector_map.get(row['Ticker'])
+        push_top_n(heap, rows, top_n)
+
+    # 전체 유니버스 인덱스가 이미 캐시에 있으면 (get_stock_data/sweep/backtest와 공유) 열 청크만 조회
+    index = _cached_index(universe, start, end)
+    if index is not None:
+        position = {t: i for i, t in enumerate(index.matrix.tickers)}
+        cols = [position[t] for t in tickers if t in position]
+        for i in range(0, len(cols), chunk_size):
+            push(select_columns(index, cols[i:i + chunk_size]))
+            done = min(done + chunk_size, total)
+            yield heap_ranking(heap), done, total
+        if done < total:
+            yield heap_ranking(heap), total, total
+        return
+
+    # 선택된 종목만 청크로 나눠 받으면서 도착한 청크부터 바로 순위에 반영
+    chunks = [tickers[i:i + chunk_size] for i in range(0, len(tickers), chunk_size)]
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks)))) as executor:
+        future_to_chunk = {
+            executor.submit(load_prices, chunk, start, end): chunk
+            for chunk in chunks
+        }
+        for future in as_completed(future_to_chunk):
+            chunk = future_to_chunk[future]
+            done += len(chunk)
+            try:
+                prices, failed = future.result()
+            except Exception as e:
+                print(f"Error screening batch ({chunk[0]}..{chunk[-1]}): {e}")
+                yield heap_ranking(heap), done, total
                 continue
-            # 시작가와 종가
-            start_price = data['Open'].iloc[0]
-            end_price = data['Close'].iloc[-1]
-            return_pct = (end_price - start_price) / start_price * 100
-            # 리스크(변동성)
-            daily_rets = data['Close'].pct_change().dropna()
-            risk = daily_rets.std() * 100
-            if return_pct >= target_return:
-                stock_data.append({
-                    'Ticker': ticker,
-                    'Return (%)': return_pct,
-                    'Risk (%)': risk
-                })
+            if failed:
+                print(f"No price data for {len(failed)} tickers: {', '.join(failed[:20])}")
+            if not prices.empty:
+                push(build_return_index(build_price_matrix(prices)))
+            yield heap_ranking(heap), done, total
+
+
+def load_ticker_list(source):
+    """Read a custom universe (one symbol per line or a CSV whose first column is the symbol)."""
+    if hasattr(source, 'read'):
+        text = source.read()
+        text = text.decode('utf-8') if isinstance(text, bytes) else text
+    else:
+        with open(source, encoding='utf-8') as f:
+            text = f.read()
+    tickers = []
+    for line in text.splitlines():
+        symbol = normalize_symbol(line.split(',')[0].strip('"\' '))
+        if symbol and symbol not in ('SYMBOL', 'TICKER'):
+            tickers.append(symbol)
+    return list(dict.fromkeys(tickers))
+
+
+def _screen_shard(shard_id, tickers, start_date, end_date, target_return, top_n,
+                  risk_filters=None, benchmark_close=None, provider=None):
+    """Load and screen one shard; runs inside a worker process.
+
+    ``provider`` is the parent's market-data provider, since a worker
+    process starts from the configured default rather than set_provider.
+    """
+    if provider is not None and provider is not get_provider():
+        set_provider(provider)
+    started = time.perf_counter()
+    prices, failed = load_prices(tickers, start_date, end_date)
+    loaded = time.perf_counter()
+    rows = screen_prices(prices, target_return, top_n, risk_filters, benchmark_close)
+    finished = time.perf_counter()
+    stats = {
+        'shard': shard_id,
+        'tickers': len(tickers),
+        'failed': len(failed),
+        'failed_tickers': list(failed),
+        'error': None,
+        'load_sec': loaded - started,
+        'screen_sec': finished - loaded,
+        'total_sec': finished - started,
+    }
+    return rows, stats
+
+
+def screen_universe(tickers, start_date, end_date, target_return, top_n=5, risk_filters=None,
+                    max_workers=SCREEN_MAX_WORKERS, shard_size=SCREEN_SHARD_SIZE):
+    """Screen an arbitrary ticker list split into shards across a process pool.
+
+    Each shard returns its local top-N; the shards are merged into the
+    global top-N. Returns (rows, per-shard stats); a shard's stats list
+    the tickers that had no data in ``failed_tickers``, and a shard that
+    raised is reported with its ``error`` and all of its tickers failed.
+    """
+    tickers = list(dict.fromkeys(tickers))
+    shards = [tickers[i:i + shard_size] for i in range(0, len(tickers), shard_size)]
+    heap, shard_stats = [], []
+    benchmark_close = load_benchmark_close(start_date, end_date)
+    jobs = [
+        (i, shard, start_date, end_date, target_return, top_n, risk_filters, benchmark_close, get_provider())
+        for i, shard in enumerate(shards)
+    ]
+
+    def collect(job, result):
+        try:
+            rows, stats = result()
         except Exception as e:
-            print(f"Error fetching data for {ticker}: {e}")
-    # 수익률 기준 내림차순, 상위 종목 선택
-    stock_data = sorted(stock_data, key=lambda x: x['Return (%)'], reverse=True)[:top_n]
-    return stock_data
+            shard_id, shard = job[0], job[1]
+            stats = {'shard': shard_id, 'tickers': len(shard), 'failed': len(shard),
+                     'failed_tickers': list(shard), 'error': str(e)}
+            rows = []
+        push_top_n(heap, rows, top_n)
+        shard_stats.append(stats)
+
+    if max_workers <= 1 or len(shards) <= 1:
+        for job in jobs:
+            collect(job, lambda: _screen_shard(*job))
+    else:
+        # fork는 스레드(가격 로딩 풀 등)가 있는 부모에서 잠금 상태까지 복제하므로 spawn 사용
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(shards)),
+                                 mp_context=multiprocessing.get_context('spawn')) as executor:
+            future_to_job = {executor.submit(_screen_shard, *job): job for job in jobs}
+            for future in as_completed(future_to_job):
+                collect(future_to_job[future], future.result)
+        # 작업자 프로세스가 저장소에 쓴 가격/커버리지를 다음 조회에서 다시 읽도록
+        reset_cache()
+
+    try:
+        sector_map = get_sector_map()
+    except Exception as e:
+        print(f"Sector metadata unavailable: {e}")
+        sector_map = {}
+    stock_data = heap_ranking(heap)
+    for row in stock_data:
+        row['Sector'] = sector_map.get(row['Ticker'])
+    return stock_data, sorted(shard_stats, key=lambda x: x['shard'])
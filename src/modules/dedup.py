@@ -0,0 +1,83 @@
+import re
+import zlib
+import numpy as np
+from config import DEDUP_NUM_PERM, DEDUP_THRESHOLD, DEDUP_SOURCE_PRIORITY
+
+_TAG = re.compile(r"^\s*\[([A-Z]+)\]\s*")
+_WORD = re.compile(r"[a-z0-9]+")
+_STOPWORDS = {'a', 'an', 'the', 'and', 'or', 'of', 'to', 'in', 'on', 'for', 'at', 'by', 'with', 'as', 'is', 'are', 's'}
+# (a*h + b) mod p 해시 순열 - 32비트 소수라 uint64 연산이 넘치지 않음
+_PRIME = 4294967291
+_rng = np.random.default_rng(0)
+_A = _rng.integers(1, _PRIME, DEDUP_NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, _PRIME, DEDUP_NUM_PERM, dtype=np.uint64)
+
+
+def source_tag(article):
+    """The [TAG] prefix the crawlers put on an article ('' if none)."""
+    match = _TAG.match(article)
+    return match.group(1) if match else ''
+
+
+def features(text):
+    """Word unigrams and bigrams of the text without its source tag, case and punctuation."""
+    words = [w for w in _WORD.findall(_TAG.sub('', text).lower()) if w not in _STOPWORDS]
+    return set(words) | {f"{a} {b}" for a, b in zip(words, words[1:])}
+
+
+def minhash(text):
+    """MinHash signature (DEDUP_NUM_PERM uint64 values) of the text's features."""
+    hashes = np.array([zlib.crc32(f.encode()) % _PRIME for f in features(text)], dtype=np.uint64)
+    if hashes.size == 0:
+        return np.full(DEDUP_NUM_PERM, _PRIME, dtype=np.uint64)
+    return ((np.outer(_A, hashes) + _B[:, None]) % _PRIME).min(axis=1)
+
+
+def near_duplicate_groups(texts, threshold=DEDUP_THRESHOLD):
+    """Group indices whose estimated Jaccard similarity is >= threshold (transitively)."""
+    if not texts:
+        return []
+    signatures = np.stack([minhash(text) for text in texts])
+    similarity = (signatures[:, None, :] == signatures[None, :, :]).mean(axis=2)
+    parent = list(range(len(texts)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in zip(*np.nonzero(np.triu(similarity >= threshold, k=1))):
+        parent[find(j)] = find(i)
+    groups = {}
+    for i in range(len(texts)):
+        groups.setdefault(find(i), []).append(i)
+    return list(groups.values())
+
+
+def _source_rank(article):
+    tag = source_tag(article)
+    return DEDUP_SOURCE_PRIORITY.index(tag) if tag in DEDUP_SOURCE_PRIORITY else len(DEDUP_SOURCE_PRIORITY)
+
+
+def dedup_articles(articles, links, threshold=DEDUP_THRESHOLD):
+    """Collapse near-duplicate articles, keeping the best-sourced (then longest) copy of each story.
+
+    Returns (articles, links, stats) with the survivors in their original order.
+    """
+    groups = near_duplicate_groups(articles, threshold)
+    keep = sorted(min(group, key=lambda i: (_source_rank(articles[i]), -len(articles[i]))) for group in groups)
+    links = list(links) + [""] * (len(articles) - len(links))
+    stats = {'before': len(articles), 'after': len(keep), 'removed': len(articles) - len(keep)}
+    return [articles[i] for i in keep], [links[i] for i in keep], stats
+
+
+def dedup_contents(items, threshold=DEDUP_THRESHOLD):
+    """Collapse near-duplicate extracted link contents, keeping the most relevant (then longest) one."""
+    groups = near_duplicate_groups([item['content'] for item in items], threshold)
+    keep = sorted(
+        min(group, key=lambda i: (-items[i].get('relevance_score', 0), -len(items[i]['content'])))
+        for group in groups
+    )
+    stats = {'before': len(items), 'after': len(keep), 'removed': len(items) - len(keep)}
+    return [items[i] for i in keep], stats
@@ -0,0 +1,130 @@
+import threading
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import Future
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from config import DOCUMENT_STORE_SIZE, DOCUMENT_TTL_SECONDS, DOCUMENT_MAX_CHARS, DOCUMENT_TRACKING_PARAMS
+from modules.http_client import fetch_html
+from modules.html_parse import CONTENT_SELECTORS, extract_main_text, main_content
+
+DEFAULT_HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+
+_documents = OrderedDict()  # canonical url -> document (LRU 순서)
+_inflight = {}              # canonical url -> Future (같은 URL 동시 요청은 한 번만 가져옴)
+_lock = threading.Lock()
+_stats = Counter()
+
+
+def unwrap_redirect(url):
+    """Target URL of a Google (/url?q=) or DuckDuckGo (/l/?uddg=) redirect link, else url unchanged."""
+    parts = urlsplit(url.strip())
+    params = dict(parse_qsl(parts.query, keep_blank_values=True))
+    host = (parts.hostname or '').lower()
+    if parts.path == '/url' and ('google' in host or not host) and (params.get('q') or params.get('url', '')).startswith('http'):
+        return unwrap_redirect(params.get('q') or params['url'])
+    if parts.path.startswith('/l/') and 'duckduckgo' in host and params.get('uddg'):
+        return unwrap_redirect(params['uddg'])
+    return url.strip()
+
+
+def canonical_url(url):
+    """Normalize a URL so the same page always maps to one key.
+
+    Unwraps Google (/url?q=) and DuckDuckGo (/l/?uddg=) redirect links,
+    lower-cases scheme and host, drops default ports, fragments, trailing
+    slashes and tracking parameters, and sorts the query.
+    """
+    # 검색 결과의 리다이렉트 링크는 실제 대상 URL로
+    url = unwrap_redirect(url)
+    parts = urlsplit(url)
+    host = (parts.hostname or '').lower()
+    if not host:
+        return url  # 상대 경로는 그대로 (호출 측에서 http 링크만 사용)
+
+    scheme = (parts.scheme or 'https').lower()
+    netloc = host
+    if parts.port and (scheme, parts.port) not in (('http', 80), ('https', 443)):
+        netloc = f"{host}:{parts.port}"
+    path = parts.path.rstrip('/') or '/'
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith('utm_') and key.lower() not in DOCUMENT_TRACKING_PARAMS
+    )
+    return urlunsplit((scheme, netloc, path, urlencode(query), ''))
+
+
+def _enough_text(partial):
+    """Whether a partial page already holds the text the full page would yield.
+
+    Only text found by the top-priority selector counts: a lower-priority
+    match (e.g. bare <p> tags) could be replaced by an <article> further down.
+    """
+    text, selector = main_content(partial)
+    return selector == CONTENT_SELECTORS[0] and len(text) > DOCUMENT_MAX_CHARS
+
+
+def _load(url, headers):
+    html, info = fetch_html(url, headers=headers or DEFAULT_HEADERS, timeout=10, enough=_enough_text)
+    text = extract_main_text(html) if html else ''
+    return {'url': url, 'text': text, 'chars': len(text), 'fetched_at': time.time(), **info}
+
+
+def get_document(url, headers=None):
+    """Fetched and cleaned page for url, downloading and parsing it at most once.
+
+    Documents are keyed by canonical_url, but the page is fetched from the
+    url as given (only search redirect links are unwrapped). The document
+    dict holds the fetched url, main text (at least DOCUMENT_MAX_CHARS when
+    the page has that much), and extraction metadata from fetch_html (bytes
+    read, why the download stopped or was skipped, cache use).
+
+    Documents expire after DOCUMENT_TTL_SECONDS. A failed fetch returns a
+    document with empty text and an 'error' message; callers already waiting
+    on it share it, but it is not stored, so the next request retries.
+    """
+    key = canonical_url(url)
+    with _lock:
+        _stats['requests'] += 1
+        document = _documents.get(key)
+        if document is not None and time.time() - document['fetched_at'] < DOCUMENT_TTL_SECONDS:
+            _documents.move_to_end(key)
+            _stats['reused'] += 1
+            return document
+        _documents.pop(key, None)
+        future = _inflight.get(key)
+        owner = future is None
+        if owner:
+            future = _inflight[key] = Future()
+        else:
+            _stats['reused'] += 1
+    if not owner:
+        return future.result()
+
+    # 캐시 키만 정규화 URL이고, 요청은 원래 URL로 보낸다 (정규화가 페이지를 바꿀 수 있음)
+    target = unwrap_redirect(url)
+    try:
+        document = _load(target, headers)
+    except Exception as e:
+        document = {'url': target, 'text': '', 'chars': 0, 'fetched_at': time.time(), 'error': str(e)}
+    with _lock:
+        _stats['fetched'] += 1
+        # 실패한 문서는 대기 중인 호출에만 전달하고 저장하지 않는다
+        if 'error' not in document:
+            _documents[key] = document
+            while len(_documents) > DOCUMENT_STORE_SIZE:
+                _documents.popitem(last=False)
+        del _inflight[key]
+    future.set_result(document)
+    return document
+
+
+def document_stats():
+    """How many document requests were served and how many needed a fetch."""
+    with _lock:
+        return {**_stats, 'documents': len(_documents)}
+
+
+def clear_documents():
+    with _lock:
+        _documents.clear()
+        _stats.clear()
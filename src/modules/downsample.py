@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+
+
+def lttb_indices(y, threshold):
+    """Row indices chosen by Largest-Triangle-Three-Buckets for a line of len(y) points.
+
+    x is taken as the row position, which suits evenly spaced trading days.
+    Always keeps the first and last point; returns all rows when the series
+    already fits in ``threshold`` points.
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # 첫/마지막 점을 제외한 구간을 threshold-2개 버킷으로 나눈다
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    # 각 버킷의 다음 버킷 평균점 (마지막 버킷은 마지막 점)
+    sums = np.add.reduceat(y, edges[:-1])
+    counts = np.diff(edges)
+    bucket_y = sums / counts
+    bucket_x = (edges[:-1] + edges[1:] - 1) / 2.0
+    avg_x = np.append(bucket_x[1:], n - 1).tolist()
+    avg_y = np.append(bucket_y[1:], y[-1]).tolist()
+
+    # 버킷이 작아 numpy 호출보다 파이썬 루프가 빠르다
+    values = y.tolist()
+    starts, ends = edges[:-1].tolist(), edges[1:].tolist()
+    selected = [0]
+    prev_x, prev_y = 0.0, values[0]
+    for i in range(threshold - 2):
+        ax, ay = avg_x[i], avg_y[i]
+        best, best_area = starts[i], -1.0
+        # 이전 선택점, 후보점, 다음 버킷 평균점이 만드는 삼각형 넓이가 최대인 점 선택
+        for j in range(starts[i], ends[i]):
+            area = abs((prev_x - ax) * (values[j] - prev_y) - (prev_x - j) * (ay - prev_y))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        prev_x, prev_y = float(best), values[best]
+    selected.append(n - 1)
+    return np.array(selected)
+
+
+def downsample_line(series, threshold):
+    """Downsample a Series (NaNs dropped) to at most ``threshold`` points with LTTB."""
+    series = series.dropna()
+    if len(series) <= threshold:
+        return series
+    return series.iloc[lttb_indices(series.to_numpy(), threshold)]
+
+
+def aggregate_ohlc(data, max_bars):
+    """Merge consecutive OHLCV bars so at most ``max_bars`` candles remain.
+
+    Each merged candle keeps the first Open, max High, min Low, last Close and
+    summed Volume of its bucket and is stamped with the bucket's first date.
+    """
+    n = len(data)
+    if n <= max_bars or max_bars < 1:
+        return data
+    size = int(np.ceil(n / max_bars))
+    starts = np.arange(0, n, size)
+    ends = np.append(starts[1:], n) - 1
+    merged = {
+        'Open': data['Open'].to_numpy()[starts],
+        'High': np.maximum.reduceat(data['High'].to_numpy(), starts),
+        'Low': np.minimum.reduceat(data['Low'].to_numpy(), starts),
+        'Close': data['Close'].to_numpy()[ends],
+    }
+    if 'Volume' in data:
+        merged['Volume'] = np.add.reduceat(data['Volume'].to_numpy(), starts)
+    return pd.DataFrame(merged, index=data.index[starts])
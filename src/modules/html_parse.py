@@ -0,0 +1,81 @@
+from bs4 import BeautifulSoup, SoupStrainer
+
+# lxml은 requirements에 포함되어 있지만, 없으면 내장 파서로 동작
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# selectolax가 설치되어 있으면 본문 추출에 사용 (선택 사항)
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+    HAS_SELECTOLAX = True
+except ImportError:
+    HAS_SELECTOLAX = False
+
+# 크롤러별로 실제 읽는 노드만 트리로 만든다 (나머지 마크업은 파싱 중 버림)
+STRAINERS = {
+    'google': SoupStrainer('div', class_=['SoaBEf', 'xrnccd']),
+    'marketwatch': SoupStrainer(['a', 'h3'], class_=['link', 'article__headline']),
+    'alternative': SoupStrainer('a', class_='result__a'),
+}
+
+# 본문 추출 시 제거할 태그와 본문 후보 선택자 (앞에서부터 처음 매칭되는 것 사용)
+NOISE_TAGS = ["script", "style", "nav", "header", "footer"]
+CONTENT_SELECTORS = [
+    'article', 'main', '.content', '.article-body',
+    '.post-content', '.entry-content', 'p'
+]
+
+
+def make_soup(markup, source=None, parser=None):
+    """BeautifulSoup tree with the fastest available parser, restricted to the source's strainer."""
+    return BeautifulSoup(markup, parser or HTML_PARSER, parse_only=STRAINERS.get(source))
+
+
+def _main_text_soup(markup, max_items, parser):
+    soup = BeautifulSoup(markup, parser)
+    for tag in soup(NOISE_TAGS):
+        tag.decompose()
+    for selector in CONTENT_SELECTORS:
+        elements = soup.select(selector)
+        if elements:
+            text = ' '.join(elem.get_text().strip() for elem in elements[:max_items])
+            if text:
+                return text, selector
+            break
+    return soup.get_text(), None
+
+
+def _main_text_selectolax(markup, max_items):
+    tree = HTMLParser(markup)
+    tree.strip_tags(NOISE_TAGS)
+    for selector in CONTENT_SELECTORS:
+        nodes = tree.css(selector)
+        if nodes:
+            text = ' '.join(node.text().strip() for node in nodes[:max_items])
+            if text:
+                return text, selector
+            break
+    return tree.text(), None
+
+
+def main_content(markup, max_items=3, backend=None):
+    """(text, selector) of the first matching main-content selector.
+
+    ``selector`` is None when the text fell back to the whole page.
+    ``backend`` is 'selectolax', 'lxml' or 'html.parser'; by default
+    selectolax when installed, otherwise BeautifulSoup with HTML_PARSER.
+    """
+    backend = backend or ('selectolax' if HAS_SELECTOLAX else HTML_PARSER)
+    if backend == 'selectolax':
+        text, selector = _main_text_selectolax(markup, max_items)
+    else:
+        text, selector = _main_text_soup(markup, max_items, backend)
+    return ' '.join(text.split()), selector
+
+
+def extract_main_text(markup, max_items=3, backend=None):
+    """Whitespace-normalized text of the first matching main-content selector."""
+    return main_content(markup, max_items, backend)[0]
@@ -0,0 +1,164 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+import requests
+from requests.structures import CaseInsensitiveDict
+from config import HTTP_CACHE_PATH, HTTP_CACHE_MAX_BYTES, HTTP_CACHE_TTL_DEFAULT, HTTP_CACHE_TTL_BY_HOST
+
+# 본문과 함께 보관할 응답 헤더 (재검증/인코딩 판별용)
+_KEPT_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Content-Language')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url TEXT PRIMARY KEY,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    encoding TEXT,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at);
+"""
+
+_local = threading.local()
+_write_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_stats = Counter()
+
+
+def _count(key, n=1):
+    with _stats_lock:
+        _stats[key] += n
+
+
+def _connect():
+    """Per-thread connection to the cache database (created on first use)."""
+    conn = getattr(_local, 'conn', None)
+    if conn is None:
+        os.makedirs(os.path.dirname(HTTP_CACHE_PATH), exist_ok=True)
+        conn = sqlite3.connect(HTTP_CACHE_PATH, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        _local.conn = conn
+    return conn
+
+
+def ttl_for(url):
+    """Freshness lifetime in seconds for a URL, by host."""
+    return HTTP_CACHE_TTL_BY_HOST.get(urlsplit(url).hostname, HTTP_CACHE_TTL_DEFAULT)
+
+
+def lookup(url):
+    """Cached entry for url as a dict (with a 'fresh' flag), or None."""
+    row = _connect().execute(
+        "SELECT status, headers, encoding, body, fetched_at FROM responses WHERE url = ?", (url,)
+    ).fetchone()
+    if row is None:
+        return None
+    status, headers, encoding, body, fetched_at = row
+    return {
+        'status': status, 'headers': json.loads(headers), 'encoding': encoding, 'body': body,
+        'fresh': time.time() - fetched_at < ttl_for(url),
+    }
+
+
+def conditional_headers(entry):
+    """If-None-Match / If-Modified-Since for revalidating a stale entry."""
+    headers = {}
+    if entry['headers'].get('ETag'):
+        headers['If-None-Match'] = entry['headers']['ETag']
+    if entry['headers'].get('Last-Modified'):
+        headers['If-Modified-Since'] = entry['headers']['Last-Modified']
+    return headers
+
+
+def to_response(url, entry):
+    """Rebuild a requests.Response from a cached entry."""
+    response = requests.Response()
+    response.status_code = entry['status']
+    response._content = entry['body']
+    response.headers = CaseInsensitiveDict(entry['headers'])
+    response.encoding = entry['encoding']
+    response.url = url
+    return response
+
+
+def store(url, response, body=None, encoding=None):
+    """Save a 200 response body and evict least recently used entries over HTTP_CACHE_MAX_BYTES.
+
+    ``body``/``encoding`` override the response's own, for streamed
+    downloads that were read only partially.
+    """
+    headers = {name: response.headers[name] for name in _KEPT_HEADERS if name in response.headers}
+    body = response.content if body is None else body
+    encoding = encoding or response.encoding
+    now = time.time()
+    with _write_lock:
+        conn = _connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (url, response.status_code, json.dumps(headers), encoding, body, len(body), now, now)
+        )
+        _evict(conn)
+        conn.commit()
+    _count('stores')
+
+
+def touch(url, revalidated=False):
+    """Mark an entry as used; a 304 revalidation also restarts its TTL."""
+    now = time.time()
+    with _write_lock:
+        conn = _connect()
+        if revalidated:
+            conn.execute("UPDATE responses SET fetched_at = ?, accessed_at = ? WHERE url = ?", (now, now, url))
+        else:
+            conn.execute("UPDATE responses SET accessed_at = ? WHERE url = ?", (now, url))
+        conn.commit()
+
+
+def _evict(conn):
+    total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+    if total <= HTTP_CACHE_MAX_BYTES:
+        return
+    evicted = 0
+    for url, size in conn.execute("SELECT url, size FROM responses ORDER BY accessed_at").fetchall():
+        if total <= HTTP_CACHE_MAX_BYTES:
+            break
+        conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+        total -= size
+        evicted += 1
+    _count('evictions', evicted)
+
+
+def record(event):
+    """Count a cache event: hit, miss, revalidated."""
+    _count(event)
+
+
+def cache_stats():
+    """Hit/miss counters for this process plus on-disk entry count and size."""
+    entries, size = _connect().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+    with _stats_lock:
+        stats = dict(_stats)
+    lookups = stats.get('hit', 0) + stats.get('revalidated', 0) + stats.get('miss', 0)
+    return {
+        **stats,
+        'hit_rate': (stats.get('hit', 0) + stats.get('revalidated', 0)) / lookups if lookups else 0.0,
+        'entries': entries,
+        'bytes': size,
+    }
+
+
+def clear_cache():
+    with _write_lock:
+        conn = _connect()
+        conn.execute("DELETE FROM responses")
+        conn.commit()
+    with _stats_lock:
+        _stats.clear()
@@ -0,0 +1,210 @@
+import threading
+from collections import Counter
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from config import (
+    HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE, CONTENT_MAX_BYTES, CONTENT_CHUNK_BYTES,
+    CONTENT_FIRST_CHECK_BYTES, TEXT_CONTENT_TYPES
+)
+from modules.rate_limiter import (
+    get_limiter, parse_retry_after, is_failure_status, THROTTLE_STATUSES, CircuitOpenError
+)
+from modules import http_cache
+
+# 요청 수 / 새로 연 연결 수 (호스트별) - 차이가 keep-alive로 재사용된 연결
+_stats_lock = threading.Lock()
+_requests = Counter()
+_connections = Counter()
+
+
+def _count(counter, host):
+    with _stats_lock:
+        counter[host] += 1
+
+
+class _CountingHTTPPool(HTTPConnectionPool):
+    def _new_conn(self):
+        _count(_connections, self.host)
+        return super()._new_conn()
+
+
+class _CountingHTTPSPool(HTTPSConnectionPool):
+    def _new_conn(self):
+        _count(_connections, self.host)
+        return super()._new_conn()
+
+
+class PooledAdapter(HTTPAdapter):
+    """HTTPAdapter whose per-host pools count every new TCP/TLS connection."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {'http': _CountingHTTPPool, 'https': _CountingHTTPSPool}
+
+    def send(self, request, *args, **kwargs):
+        _count(_requests, urlsplit(request.url).hostname)
+        return super().send(request, *args, **kwargs)
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Process-wide keep-alive session shared by all crawler and extractor threads."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = PooledAdapter(pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _session = session
+        return _session
+
+
+def http_get(url, headers=None, timeout=10, use_cache=True, **kwargs):
+    """GET through the shared session, paced by the host's rate limiter.
+
+    Fresh responses come from the on-disk cache without touching the network;
+    stale ones are revalidated with ETag/Last-Modified, and served as-is if the
+    host is failing. Raises CircuitOpenError while the host is cooling down
+    after repeated failures and nothing is cached.
+    """
+    cacheable = use_cache and not kwargs.get('stream')
+    entry = http_cache.lookup(url) if cacheable else None
+    if entry is not None and entry['fresh']:
+        http_cache.record('hit')
+        http_cache.touch(url)
+        return http_cache.to_response(url, entry)
+    if entry is not None:
+        headers = {**(headers or {}), **http_cache.conditional_headers(entry)}
+    
+    limiter = get_limiter(urlsplit(url).hostname)
+    try:
+        limiter.acquire()
+        try:
+            response = get_session().get(url, headers=headers, timeout=timeout, **kwargs)
+        except requests.RequestException:
+            limiter.record_failure()
+            raise
+    except (CircuitOpenError, requests.RequestException):
+        if entry is None:
+            raise
+        http_cache.record('stale')
+        return http_cache.to_response(url, entry)
+    
+    if response.status_code in THROTTLE_STATUSES:
+        limiter.record_failure(throttled=True, retry_after=parse_retry_after(response.headers.get('Retry-After')))
+    elif is_failure_status(response.status_code):
+        limiter.record_failure()
+    else:
+        limiter.record_success()
+    
+    if entry is not None and response.status_code == 304:
+        http_cache.record('revalidated')
+        http_cache.touch(url, revalidated=True)
+        return http_cache.to_response(url, entry)
+    if cacheable:
+        http_cache.record('miss')
+        if response.status_code == 200:
+            http_cache.store(url, response)
+    return response
+
+
+def _text_content_type(headers):
+    return headers.get('Content-Type', '').split(';')[0].strip().lower()
+
+
+def _cached_html(entry):
+    content_type = _text_content_type(entry['headers'])
+    if content_type and content_type not in TEXT_CONTENT_TYPES:
+        return None, {'reason': f"skipped {content_type}", 'cached': True}
+    return entry['body'].decode(entry['encoding'] or 'utf-8', errors='replace'), {'cached': True, 'bytes': len(entry['body'])}
+
+
+def fetch_html(url, headers=None, timeout=10, max_bytes=CONTENT_MAX_BYTES, enough=None):
+    """Stream an HTML page, reading at most ``max_bytes``.
+
+    Non-text bodies (PDFs, images, binaries) are rejected from the
+    Content-Type header before any body is read. ``enough(html)`` is checked
+    on the partial page at doubling byte offsets so the download stops once
+    the caller has the text it needs. Truncated bodies are not cached.
+    Returns (html or None, info dict).
+    """
+    entry = http_cache.lookup(url)
+    if entry is not None and entry['fresh']:
+        http_cache.record('hit')
+        http_cache.touch(url)
+        return _cached_html(entry)
+    if entry is not None:
+        headers = {**(headers or {}), **http_cache.conditional_headers(entry)}
+    
+    try:
+        response = http_get(url, headers=headers, timeout=timeout, stream=True)
+    except (CircuitOpenError, requests.RequestException):
+        if entry is None:
+            raise
+        http_cache.record('stale')
+        return _cached_html(entry)
+    with response:
+        if entry is not None and response.status_code == 304:
+            http_cache.record('revalidated')
+            http_cache.touch(url, revalidated=True)
+            return _cached_html(entry)
+        if response.status_code != 200:
+            return None, {'reason': f"HTTP {response.status_code}"}
+        content_type = _text_content_type(response.headers)
+        if content_type and content_type not in TEXT_CONTENT_TYPES:
+            return None, {'reason': f"skipped {content_type}"}
+        
+        # charset 헤더가 없으면 requests 기본값(ISO-8859-1) 대신 UTF-8로 디코딩
+        encoding = response.encoding if 'charset' in response.headers.get('Content-Type', '').lower() else 'utf-8'
+        chunks, size, next_check, stopped = [], 0, CONTENT_FIRST_CHECK_BYTES, None
+        for chunk in response.iter_content(CONTENT_CHUNK_BYTES):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= max_bytes:
+                stopped = 'max_bytes'
+                break
+            if enough is not None and size >= next_check:
+                next_check *= 2
+                if enough(b''.join(chunks).decode(encoding, errors='replace')):
+                    stopped = 'enough'
+                    break
+        body = b''.join(chunks)[:max_bytes]
+    
+    http_cache.record('miss')
+    # 중간에 끊은 본문은 완전한 응답이 아니므로 캐시하지 않는다 (다음에 다시 받음)
+    if stopped is None:
+        http_cache.store(url, response, body=body, encoding=encoding)
+    info = {'bytes': len(body), 'content_length': response.headers.get('Content-Length'), 'stopped': stopped}
+    return body.decode(encoding, errors='replace'), info
+
+
+def http_stats():
+    """Request/connection counters: totals plus a per-host breakdown."""
+    with _stats_lock:
+        hosts = {
+            host: {'requests': _requests[host], 'connections': _connections[host],
+                   'reused': max(_requests[host] - _connections[host], 0)}
+            for host in _requests
+        }
+    total_requests = sum(h['requests'] for h in hosts.values())
+    total_connections = sum(h['connections'] for h in hosts.values())
+    reused = sum(h['reused'] for h in hosts.values())
+    return {
+        'requests': total_requests,
+        'connections': total_connections,
+        'reused': reused,
+        'reuse_rate': reused / total_requests if total_requests else 0.0,
+        'hosts': hosts,
+    }
+
+
+def reset_http_stats():
+    with _stats_lock:
+        _requests.clear()
+        _connections.clear()
@@ -0,0 +1,35 @@
+import numpy as np
+
+
+def rolling_means(values, windows):
+    """Simple moving averages for every column and window from one cumulative-sum pass.
+
+    ``values`` is a dates x tickers array with NaN for missing bars. Each
+    column rolls over its own valid rows, matching
+    ``series.dropna().rolling(window).mean()`` reindexed to all rows: rows
+    where a ticker has no bar stay NaN without blanking the next ``window``
+    rows. Returns {window: array shaped like values}.
+    """
+    values = np.asarray(values, dtype=float)
+    shape = values.shape
+    values = values.reshape(shape[0], int(np.prod(shape[1:])))
+    valid = ~np.isnan(values)
+    n_rows = values.shape[0]
+    cols = np.arange(values.shape[1])[None, :]
+    # 열마다 유효한 값만 위로 모은 누적합 - 행별 유효 순번(rank)으로 창의 시작/끝을 찾는다
+    order = np.argsort(~valid, axis=0, kind='stable')
+    packed = np.take_along_axis(np.where(valid, values, 0.0), order, axis=0)
+    cum = np.zeros((n_rows + 1, values.shape[1]))
+    np.cumsum(packed, axis=0, out=cum[1:])
+    rank = np.cumsum(valid, axis=0)
+
+    means = {}
+    for window in windows:
+        out = np.full(values.shape, np.nan)
+        if window > 0:
+            defined = valid & (rank >= window)
+            sums = cum[rank, cols] - cum[np.maximum(rank - window, 0), cols]
+            out[defined] = sums[defined] / window
+        means[window] = out.reshape(shape)
+    return means
+
@@ -142,12 +142,24 @@ Please respond only in English.
     
     return run_llm_generic(prompt, language)
 
-def run_llm_with_enhanced_content(ticker, date, return_pct, articles, links, language="한국어"):
-    """Enhanced LLM analysis with content from relevant links"""
+def run_llm_with_enhanced_content(ticker, date, return_pct, articles, links, language="한국어", enhanced=None):
+    """Enhanced LLM analysis with content from relevant links
+
+    ``enhanced`` is an already extracted (enhanced_content, extraction_debug) pair,
+    e.g. from the crawl engine; links are only fetched here when it is None.
+    """
     from modules.content_extractor import get_enhanced_content_for_ticker
+    from modules.dedup import dedup_contents
     
     # Get enhanced content from links
-    enhanced_content, extraction_debug = get_enhanced_content_for_ticker(ticker, links, max_links=3)
+    if enhanced is None:
+        enhanced = get_enhanced_content_for_ticker(ticker, links, max_links=3)
+    enhanced_content, extraction_debug = enhanced
+    
+    # 같은 기사가 여러 링크로 배포된 경우 한 번만 프롬프트에 포함
+    enhanced_content, dedup = dedup_contents(enhanced_content)
+    if dedup['removed']:
+        extraction_debug = extraction_debug + [f"🧹 Removed {dedup['removed']} near-duplicate link contents ({dedup['before']} → {dedup['after']})"]
     
     # Check if we have real articles or fallback content
     has_fallback = any("[FALLBACK]" in article for article in articles)
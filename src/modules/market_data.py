@@ -0,0 +1,155 @@
+import os
+import threading
+import pandas as pd
+from config import MARKET_DATA_PROVIDER, MARKET_DATA_FIXTURE_DIR
+
+PRICE_FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+def _to_wide(frames):
+    """Combine per-ticker OHLCV frames into one (field, ticker) frame."""
+    if not frames:
+        return pd.DataFrame()
+    data = pd.concat(frames, axis=1).swaplevel(axis=1).sort_index(axis=1)
+    return data[[f for f in PRICE_FIELDS if f in data.columns.get_level_values(0)]]
+
+
+class YFinanceProvider:
+    """Daily bars from Yahoo Finance via yfinance multi-symbol downloads."""
+
+    name = 'yfinance'
+
+    def download(self, tickers, start_date, end_date):
+        """Download OHLCV for tickers in [start_date, end_date) as a (field, ticker) frame."""
+        import yfinance as yf
+
+        data = yf.download(
+            tickers,
+            start=str(start_date),
+            end=str(end_date),
+            group_by='column',
+            auto_adjust=True,  # Ticker.history()와 동일한 수정주가 사용
+            actions=False,
+            threads=False,
+            progress=False,
+        )
+        if data.empty:
+            return data
+        # 단일 티커 응답은 평탄한 컬럼으로 올 수 있으므로 (field, ticker) 형태로 맞춘다
+        if not isinstance(data.columns, pd.MultiIndex):
+            data.columns = pd.MultiIndex.from_product([data.columns, tickers])
+        return data[[f for f in PRICE_FIELDS if f in data.columns.get_level_values(0)]]
+
+
+class FixtureProvider:
+    """Replays recorded daily bars from local Parquet/CSV files (one file per ticker).
+
+    Files are read from ``<root>/<TICKER>.parquet`` or ``<root>/<TICKER>.csv``
+    with a date index or a ``Date`` column, so results are deterministic and
+    no network is used.
+    """
+
+    name = 'fixture'
+
+    def __init__(self, root=MARKET_DATA_FIXTURE_DIR):
+        self.root = root
+        self._frames = {}
+        self._lock = threading.Lock()
+
+    def __reduce__(self):
+        # 샤드 작업자 프로세스로 보낼 때는 경로만 넘기고 읽은 프레임/잠금은 새로 만든다
+        return (FixtureProvider, (self.root,))
+
+    def available_tickers(self):
+        """Return the tickers that have a recorded fixture file."""
+        if not os.path.isdir(self.root):
+            return []
+        names = [os.path.splitext(f) for f in os.listdir(self.root)]
+        return sorted({base for base, ext in names if ext in ('.parquet', '.csv')})
+
+    def _read(self, ticker):
+        with self._lock:
+            if ticker not in self._frames:
+                parquet_path = os.path.join(self.root, f"{ticker}.parquet")
+                csv_path = os.path.join(self.root, f"{ticker}.csv")
+                if os.path.exists(parquet_path):
+                    data = pd.read_parquet(parquet_path)
+                elif os.path.exists(csv_path):
+                    # 첫 컬럼(Date)을 날짜 인덱스로 읽는다
+                    data = pd.read_csv(csv_path, index_col=0, parse_dates=True)
+                else:
+                    data = None
+                if data is not None:
+                    if 'Date' in data.columns:
+                        data = data.set_index('Date')
+                    if not isinstance(data.index, pd.DatetimeIndex):
+                        # 숫자 인덱스를 날짜로 바꾸면 1970년 날짜가 되므로 날짜 문자열만 허용
+                        parsed = None
+                        if not pd.api.types.is_numeric_dtype(data.index):
+                            parsed = pd.to_datetime(data.index, errors='coerce', format='mixed')
+                        if parsed is None or parsed.isna().any():
+                            raise ValueError(f"Fixture for {ticker} has no usable date index "
+                                             f"(expected a Date column or dates in the first column)")
+                        data.index = pd.DatetimeIndex(parsed)
+                    data.index = data.index.tz_localize(None)
+                    data = data.reindex(columns=PRICE_FIELDS).sort_index()
+                self._frames[ticker] = data
+            return self._frames[ticker]
+
+    def download(self, tickers, start_date, end_date):
+        """Return recorded OHLCV for tickers in [start_date, end_date) as a (field, ticker) frame."""
+        start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+        frames = {}
+        for ticker in tickers:
+            data = self._read(ticker)
+            if data is None:
+                continue
+            data = data[(data.index >= start) & (data.index < end)]
+            if not data.empty:
+                frames[ticker] = data
+        return _to_wide(frames)
+
+
+PROVIDERS = {
+    YFinanceProvider.name: YFinanceProvider,
+    FixtureProvider.name: FixtureProvider,
+}
+
+_provider = None
+
+
+def get_provider():
+    """Return the active market-data provider (configured by MARKET_DATA_PROVIDER)."""
+    global _provider
+    if _provider is None:
+        _provider = PROVIDERS[MARKET_DATA_PROVIDER]()
+    return _provider
+
+
+def set_provider(provider):
+    """Switch the active provider by name or instance (e.g. for offline benchmarks)."""
+    global _provider
+    from modules.price_store import reset_cache
+
+    _provider = PROVIDERS[provider]() if isinstance(provider, str) else provider
+    # 가격 저장소는 공급자별로 분리되어 있으므로 메모리 캐시를 비운다
+    reset_cache()
+    return _provider
+
+
+def record_fixtures(tickers, start_date, end_date, root=MARKET_DATA_FIXTURE_DIR, provider=None):
+    """Record bars from a live provider into fixture files for offline replay."""
+    provider = provider or YFinanceProvider()
+    data = provider.download(list(tickers), start_date, end_date)
+    os.makedirs(root, exist_ok=True)
+    recorded = []
+    if data.empty:
+        return recorded
+    for ticker in data.columns.get_level_values(1).unique():
+        bars = data.xs(ticker, axis=1, level=1).dropna(how='all')
+        if bars.empty:
+            continue
+        bars.index.name = 'Date'
+        bars.to_parquet(os.path.join(root, f"{ticker}.parquet"))
+        recorded.append(ticker)
+    return recorded
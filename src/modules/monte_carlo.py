@@ -0,0 +1,96 @@
+import numpy as np
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from config import MC_PATHS, MC_CHUNK_SIZE, MC_SEED, MC_MAX_WORKERS, CHART_CACHE_SIZE
+from modules.price_store import load_prices
+
+
+def _simulate_chunk(method, log_returns, weights, horizon, n_paths, seed_seq):
+    """Terminal buy-and-hold portfolio returns for one chunk of simulated paths.
+
+    ``bootstrap`` resamples historical days with replacement; only how often
+    each day is drawn matters for the terminal value, so paths are drawn as
+    multinomial day counts (memory: paths x days). ``gbm`` draws the
+    horizon's summed log returns from the fitted multivariate normal
+    (memory: paths x assets).
+    """
+    rng = np.random.default_rng(seed_seq)
+    if method == 'bootstrap':
+        n_days = log_returns.shape[0]
+        counts = rng.multinomial(horizon, np.full(n_days, 1.0 / n_days), size=n_paths)
+        growth = counts @ log_returns
+    elif method == 'gbm':
+        mean = log_returns.mean(axis=0)
+        cov = np.atleast_2d(np.cov(log_returns, rowvar=False))
+        chol = np.linalg.cholesky(cov + 1e-12 * np.eye(cov.shape[0]))
+        z = rng.standard_normal((n_paths, len(mean)))
+        growth = horizon * mean + np.sqrt(horizon) * z @ chol.T
+    else:
+        raise ValueError(f"Unknown simulation method: {method}")
+    return np.exp(growth) @ weights - 1
+
+
+def simulate_returns(returns, weights, horizon=21, n_paths=MC_PATHS, method='bootstrap',
+                     seed=MC_SEED, chunk_size=MC_CHUNK_SIZE, max_workers=MC_MAX_WORKERS):
+    """Simulate terminal portfolio returns over ``horizon`` trading days.
+
+    Paths are generated in chunks of ``chunk_size`` to bound memory, and each
+    chunk gets its own child of one SeedSequence. Results are therefore the
+    same for a given seed whether chunks run inline or across a process pool
+    (``max_workers`` > 1).
+    """
+    log_returns = np.log1p(np.asarray(returns, dtype=float))
+    weights = np.asarray(weights, dtype=float)
+    sizes = [min(chunk_size, n_paths - start) for start in range(0, n_paths, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    jobs = [(method, log_returns, weights, horizon, size, seq) for size, seq in zip(sizes, seeds)]
+
+    if max_workers <= 1 or len(jobs) <= 1:
+        chunks = [_simulate_chunk(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(jobs))) as executor:
+            chunks = list(executor.map(_simulate_chunk, *zip(*jobs)))
+    return np.concatenate(chunks) if chunks else np.array([])
+
+
+def risk_summary(terminal_returns, levels=(0.95, 0.99)):
+    """VaR/CVaR (as positive loss %) and distribution statistics of simulated returns."""
+    returns = np.sort(terminal_returns) * 100
+    summary = {
+        '평균 수익률 (%)': returns.mean(),
+        '중앙값 (%)': np.median(returns),
+        '손실 확률 (%)': (returns < 0).mean() * 100,
+    }
+    for level in levels:
+        cutoff = max(int(np.floor((1 - level) * len(returns))), 1)
+        var = -np.percentile(returns, (1 - level) * 100)
+        cvar = -returns[:cutoff].mean()
+        summary[f'VaR {level:.0%} (%)'] = var
+        summary[f'CVaR {level:.0%} (%)'] = cvar
+    for q in (5, 25, 75, 95):
+        summary[f'{q} 백분위 (%)'] = np.percentile(returns, q)
+    return summary
+
+
+@lru_cache(maxsize=CHART_CACHE_SIZE)
+def simulate_portfolio(tickers, start_date, end_date, weights=None, horizon=21,
+                       method='bootstrap', n_paths=MC_PATHS, seed=MC_SEED):
+    """Monte Carlo risk for a ticker selection, fitted on daily returns in [start_date, end_date).
+
+    ``tickers`` and ``weights`` must be tuples (equal weights when None).
+    Tickers without returns are dropped and the remaining weights rescaled
+    to sum to 1. Returns (summary dict, terminal returns array) or None without data.
+    """
+    prices, failed = load_prices(list(tickers), start_date, end_date)
+    if prices.empty:
+        return None
+    weights = np.full(len(tickers), 1.0 / len(tickers)) if weights is None else np.asarray(weights, dtype=float)
+    returns = prices['Close'].reindex(columns=list(tickers)).pct_change(fill_method=None).iloc[1:]
+    # 데이터가 없는 종목은 빼고 남은 비중을 다시 합이 1이 되도록 맞춘다
+    keep = returns.notna().any().to_numpy() & ~np.isnan(weights)
+    returns = returns.loc[:, keep].dropna()
+    if returns.empty or weights[keep].sum() <= 0:
+        return None
+    weights = weights[keep] / weights[keep].sum()
+    terminal = simulate_returns(returns.to_numpy(), weights, horizon, n_paths, method, seed)
+    return risk_summary(terminal), terminal
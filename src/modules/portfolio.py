@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+from functools import lru_cache
+from config import RISK_FREE_RATE, TRADING_DAYS_PER_YEAR, FRONTIER_POINTS, CHART_CACHE_SIZE
+from modules.price_store import load_prices
+
+
+def ledoit_wolf_covariance(returns):
+    """Ledoit-Wolf shrinkage of the sample covariance towards a scaled identity.
+
+    ``returns`` is a (days x assets) array without NaNs. Returns the shrunk
+    covariance and the shrinkage intensity in [0, 1].
+    """
+    n_obs, n_assets = returns.shape
+    centered = returns - returns.mean(axis=0)
+    sample = centered.T @ centered / n_obs
+    mu = np.trace(sample) / n_assets
+    target = mu * np.eye(n_assets)
+    # 표본 공분산의 추정 오차(pi)와 목표와의 거리(delta)로 최적 수축 강도 계산
+    delta = ((sample - target) ** 2).sum() / n_assets
+    x2 = centered ** 2
+    pi = ((x2.T @ x2) / n_obs - sample ** 2).sum() / n_assets / n_obs
+    shrinkage = min(max(pi / delta, 0.0), 1.0) if delta > 0 else 1.0
+    return shrinkage * target + (1 - shrinkage) * sample, shrinkage
+
+
+def covariance_to_correlation(cov):
+    std = np.sqrt(np.diag(cov))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return cov / np.outer(std, std)
+
+
+def mean_variance_weights(mean, cov, risk_free_rate=RISK_FREE_RATE, n_points=FRONTIER_POINTS):
+    """Minimum-variance, max-Sharpe and efficient-frontier weights (fully invested, shorting allowed).
+
+    One batched solve of cov @ X = [1, mean] gives every portfolio in closed
+    form, so the whole frontier is a single matrix product.
+    """
+    n_assets = len(mean)
+    ones = np.ones(n_assets)
+    inv = np.linalg.solve(cov, np.column_stack([ones, mean]))
+    inv_ones, inv_mean = inv[:, 0], inv[:, 1]
+    a = ones @ inv_ones
+    b = ones @ inv_mean
+    c = mean @ inv_mean
+    d = a * c - b ** 2
+
+    min_var = inv_ones / a
+
+    # 최소분산 수익률부터 개별 종목 최고 기대수익률까지 목표 수익률 격자
+    min_return = b / a
+    targets = np.linspace(min_return, max(mean.max(), min_return), n_points)
+    if d > 1e-12:
+        lam = (c - b * targets) / d
+        gam = (a * targets - b) / d
+        frontier = np.outer(lam, inv_ones) + np.outer(gam, inv_mean)
+    else:
+        frontier = np.tile(min_var, (n_points, 1))
+    frontier_vol = np.sqrt(np.einsum('ki,ij,kj->k', frontier, cov, frontier))
+    frontier_ret = frontier @ mean
+
+    excess = inv_mean - risk_free_rate * inv_ones
+    if b / a > risk_free_rate and excess.sum() > 1e-12:
+        # 접점 포트폴리오
+        max_sharpe = excess / excess.sum()
+    else:
+        # 최소분산 수익률이 무위험 수익률 이하이면 접점이 비효율 구간에 있으므로 투자선 위 최대 샤프 점 사용
+        with np.errstate(invalid='ignore', divide='ignore'):
+            sharpe = (frontier_ret - risk_free_rate) / frontier_vol
+        max_sharpe = frontier[np.nanargmax(sharpe)] if np.isfinite(sharpe).any() else min_var
+    return min_var, max_sharpe, frontier, frontier_ret, frontier_vol
+
+
+def portfolio_stats(weights, mean, cov, risk_free_rate=RISK_FREE_RATE):
+    """Expected return, volatility (both annualized %) and Sharpe of a weight vector."""
+    ret = weights @ mean
+    vol = np.sqrt(weights @ cov @ weights)
+    return {
+        'Return (%)': ret * 100,
+        'Volatility (%)': vol * 100,
+        'Sharpe': (ret - risk_free_rate) / vol if vol > 0 else np.nan,
+    }
+
+
+@lru_cache(maxsize=CHART_CACHE_SIZE)
+def analyze_portfolio(tickers, start_date, end_date):
+    """Shrinkage covariance/correlation and mean-variance portfolios for a ticker selection.
+
+    ``tickers`` must be a sorted tuple so checkbox toggles hit the cache.
+    Returns None when fewer than two tickers have overlapping history.
+    """
+    prices, failed = load_prices(list(tickers), start_date, end_date)
+    if prices.empty:
+        return None
+    closes = prices['Close']
+    returns = closes.pct_change(fill_method=None).iloc[1:].dropna(axis=1, how='all').dropna()
+    if returns.shape[1] < 2 or len(returns) <= returns.shape[1]:
+        return None
+
+    cov_daily, shrinkage = ledoit_wolf_covariance(returns.to_numpy())
+    cov = cov_daily * TRADING_DAYS_PER_YEAR
+    mean = returns.to_numpy().mean(axis=0) * TRADING_DAYS_PER_YEAR
+    names = list(returns.columns)
+    min_var, max_sharpe, frontier, frontier_ret, frontier_vol = mean_variance_weights(mean, cov)
+
+    return {
+        'tickers': names,
+        'shrinkage': shrinkage,
+        'covariance': pd.DataFrame(cov, index=names, columns=names),
+        'correlation': pd.DataFrame(covariance_to_correlation(cov), index=names, columns=names),
+        'weights': pd.DataFrame({'최소 분산': min_var, '최대 샤프': max_sharpe}, index=names),
+        'portfolios': pd.DataFrame({
+            '최소 분산': portfolio_stats(min_var, mean, cov),
+            '최대 샤프': portfolio_stats(max_sharpe, mean, cov),
+        }).T,
+        'frontier': pd.DataFrame({
+            'Return (%)': frontier_ret * 100,
+            'Volatility (%)': frontier_vol * 100,
+        }),
+    }
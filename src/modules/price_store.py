@@ -0,0 +1,203 @@
+import os
+import json
+import threading
+from contextlib import contextmanager
+import pandas as pd
+from config import PRICE_STORE_DIR
+from modules.market_data import get_provider
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 잠금 없이 동작
+    fcntl = None
+
+PRICE_FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+_lock = threading.Lock()
+_frames = {}      # ticker -> in-memory copy of the Parquet file
+_coverage = None  # ticker -> sorted, disjoint [start, end) date ranges already fetched
+
+
+def _store_dir():
+    # 공급자별로 저장소를 분리해 오프라인 픽스처 데이터가 실데이터와 섞이지 않게 한다
+    return os.path.join(PRICE_STORE_DIR, get_provider().name)
+
+
+def _ticker_path(ticker):
+    return os.path.join(_store_dir(), f"{ticker}.parquet")
+
+
+def _coverage_path():
+    return os.path.join(_store_dir(), "coverage.json")
+
+
+def reset_cache():
+    """Drop in-memory copies so the next read comes from the current provider's store."""
+    global _coverage
+    with _lock:
+        _frames.clear()
+        _coverage = None
+
+
+def _merge_ranges(ranges):
+    """Sorted union of [start, end) 'YYYY-MM-DD' ranges, joining overlapping and touching ones."""
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def _load_coverage():
+    global _coverage
+    if _coverage is None:
+        try:
+            with open(_coverage_path(), encoding='utf-8') as f:
+                _coverage = json.load(f)
+        except (OSError, ValueError):
+            _coverage = {}
+        # 예전 형식 (티커당 연속 구간 하나)도 구간 목록으로 읽는다
+        for ticker, ranges in _coverage.items():
+            if ranges and isinstance(ranges[0], str):
+                _coverage[ticker] = [ranges]
+    return _coverage
+
+
+@contextmanager
+def _coverage_file_lock():
+    """Exclusive lock shared by every process writing this store's coverage.json."""
+    os.makedirs(_store_dir(), exist_ok=True)
+    with open(_coverage_path() + ".lock", 'a') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _save_coverage():
+    # 다른 프로세스(샤드 작업자)가 기록한 구간과 합친 뒤 저장 - 읽기/병합/쓰기 전체를 파일 잠금으로 보호
+    with _coverage_file_lock():
+        try:
+            with open(_coverage_path(), encoding='utf-8') as f:
+                on_disk = json.load(f)
+        except (OSError, ValueError):
+            on_disk = {}
+        for ticker, ranges in on_disk.items():
+            if ranges and isinstance(ranges[0], str):
+                ranges = [ranges]
+            _coverage[ticker] = _merge_ranges(_coverage.get(ticker, []) + ranges)
+        tmp_path = f"{_coverage_path()}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(_coverage, f)
+        os.replace(tmp_path, _coverage_path())
+
+
+def _read_ticker(ticker):
+    """Return stored daily bars for a ticker (empty frame if none)."""
+    if ticker not in _frames:
+        path = _ticker_path(ticker)
+        if os.path.exists(path):
+            _frames[ticker] = pd.read_parquet(path)
+        else:
+            _frames[ticker] = pd.DataFrame(columns=PRICE_FIELDS, index=pd.DatetimeIndex([]))
+    return _frames[ticker]
+
+
+def _write_ticker(ticker, new_data):
+    """Merge newly fetched bars into the stored series for a ticker."""
+    existing = _read_ticker(ticker)
+    data = pd.concat([existing, new_data]) if not existing.empty else new_data
+    data = data[~data.index.duplicated(keep='last')].sort_index()
+    os.makedirs(_store_dir(), exist_ok=True)
+    data.to_parquet(_ticker_path(ticker))
+    _frames[ticker] = data
+
+
+def _missing_ranges(ticker, start, end):
+    """Date ranges in [start, end) that are not yet stored for a ticker."""
+    missing, cursor = [], start
+    for covered_start, covered_end in _load_coverage().get(ticker, []):
+        covered_start, covered_end = pd.Timestamp(covered_start), pd.Timestamp(covered_end)
+        if covered_end <= cursor:
+            continue
+        if covered_start >= end:
+            break
+        if covered_start > cursor:
+            missing.append((cursor, covered_start))
+        cursor = max(cursor, covered_end)
+    if cursor < end:
+        missing.append((cursor, end))
+    return missing
+
+
+def _extend_coverage(ticker, start, end):
+    # 당일 봉은 장중에 바뀔 수 있으므로 오늘 이전까지만 확정 구간으로 기록
+    end = min(end, pd.Timestamp.today().normalize())
+    if end <= start:
+        return
+    coverage = _load_coverage()
+    coverage[ticker] = _merge_ranges(
+        coverage.get(ticker, []) + [[start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d')]]
+    )
+
+
+def load_prices(tickers, start_date, end_date):
+    """Load daily OHLCV for tickers in [start_date, end_date), fetching only missing ranges.
+
+    Returns a wide DataFrame with (field, ticker) columns and the list of
+    tickers that have no data in the requested window.
+    """
+    from modules.data_handler import fetch_price_data
+
+    start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+    tickers = list(dict.fromkeys(tickers))
+
+    with _lock:
+        # 같은 누락 구간을 가진 티커끼리 묶어서 배치 요청
+        to_fetch = {}
+        for ticker in tickers:
+            for missing in _missing_ranges(ticker, start, end):
+                to_fetch.setdefault(missing, []).append(ticker)
+
+    # 네트워크 요청 동안에는 잠금을 풀어 다른 청크가 동시에 읽고 받을 수 있게 한다
+    for (fetch_start, fetch_end), group in to_fetch.items():
+        errors = []
+        prices, failed = fetch_price_data(group, fetch_start.date(), fetch_end.date(), errors=errors)
+        failed, errors = set(failed), set(errors)
+        with _lock:
+            for ticker in group:
+                if ticker in errors:
+                    continue  # 요청 자체가 실패한 구간은 다음에 다시 받는다
+                if ticker not in failed:
+                    _write_ticker(ticker, prices.xs(ticker, axis=1, level=1).dropna(how='all'))
+                # 봉이 없던 구간도 받아본 구간으로 기록해 매번 다시 요청하지 않게 한다
+                _extend_coverage(ticker, fetch_start, fetch_end)
+            _save_coverage()
+
+    with _lock:
+        frames, failed = {}, []
+        for ticker in tickers:
+            data = _read_ticker(ticker)
+            data = data[(data.index >= start) & (data.index < end)]
+            if data.empty:
+                failed.append(ticker)
+            else:
+                frames[ticker] = data
+
+    if not frames:
+        return pd.DataFrame(), failed
+    prices = pd.concat(frames, axis=1).swaplevel(axis=1).sort_index(axis=1)
+    return prices[[f for f in PRICE_FIELDS if f in prices.columns.get_level_values(0)]], failed
+
+
+def load_history(ticker, start_date, end_date):
+    """Load daily OHLCV for a single ticker, shaped like Ticker.history()."""
+    prices, failed = load_prices([ticker], start_date, end_date)
+    if ticker in failed:
+        return pd.DataFrame(columns=PRICE_FIELDS)
+    return prices.xs(ticker, axis=1, level=1).dropna(subset=['Close'])
@@ -0,0 +1,130 @@
+import threading
+import time
+from config import (
+    RATE_LIMIT_DEFAULT_RPS, RATE_LIMIT_BURST, RATE_LIMIT_HOST_RPS, RATE_LIMIT_MIN_RPS,
+    BACKOFF_BASE_SECONDS, BACKOFF_MAX_SECONDS, CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_COOLDOWN_SECONDS,
+    CIRCUIT_PROBE_TIMEOUT_SECONDS
+)
+
+THROTTLE_STATUSES = (429, 503)
+
+
+def is_failure_status(status):
+    """Statuses other than throttling that count toward the circuit breaker (5xx and 403 blocks)."""
+    return status >= 500 or status == 403
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request to a host whose circuit is open."""
+
+
+class HostLimiter:
+    """Token bucket for one host with AIMD rate adaptation and a circuit breaker.
+
+    429/503 responses halve the refill rate, pause the host for Retry-After or
+    an exponential backoff, and after CIRCUIT_FAILURE_THRESHOLD consecutive
+    failures the host is skipped for CIRCUIT_COOLDOWN_SECONDS. After the
+    cooldown the circuit is half-open: a single probe request goes through,
+    and its success closes the circuit while a failure reopens it. Successes
+    restore the rate additively.
+    """
+
+    def __init__(self, rate, burst):
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.open_until = 0.0   # 0이면 닫힘, 지난 시각이면 half-open
+        self.probe_until = 0.0  # half-open 상태에서 시험 요청이 진행 중인 기한
+        self.failures = 0
+        self.stats = {'requests': 0, 'waited': 0.0, 'throttled': 0, 'errors': 0, 'rejected': 0}
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available; raise CircuitOpenError while the circuit is open."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now < self.open_until:
+                    self.stats['rejected'] += 1
+                    raise CircuitOpenError(f"circuit open for {self.open_until - now:.0f}s")
+                half_open = self.open_until > 0
+                if half_open and now < self.probe_until:
+                    self.stats['rejected'] += 1
+                    raise CircuitOpenError("circuit half-open, probe in flight")
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                wait = self.blocked_until - now
+                if wait <= 0:
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        self.stats['requests'] += 1
+                        if half_open:
+                            # 이 요청이 시험 요청 - 결과가 기록될 때까지 다른 요청은 거절
+                            self.probe_until = now + CIRCUIT_PROBE_TIMEOUT_SECONDS
+                        return
+                    wait = (1 - self.tokens) / self.rate
+                self.stats['waited'] += wait
+            time.sleep(wait)
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.open_until = self.probe_until = 0.0
+            self.rate = min(self.max_rate, self.rate + self.max_rate * 0.1)
+
+    def record_failure(self, throttled=False, retry_after=None):
+        with self.lock:
+            now = time.monotonic()
+            self.failures += 1
+            self.stats['throttled' if throttled else 'errors'] += 1
+            if throttled:
+                self.rate = max(RATE_LIMIT_MIN_RPS, self.rate / 2)
+                backoff = retry_after if retry_after is not None else BACKOFF_BASE_SECONDS * 2 ** (self.failures - 1)
+                self.blocked_until = max(self.blocked_until, now + min(backoff, BACKOFF_MAX_SECONDS))
+            # half-open 시험 요청이 실패하면 바로 다시 열림
+            if self.open_until > 0 or self.failures >= CIRCUIT_FAILURE_THRESHOLD:
+                self.open_until = now + CIRCUIT_COOLDOWN_SECONDS
+                self.probe_until = 0.0
+                self.failures = 0
+
+    def snapshot(self):
+        with self.lock:
+            now = time.monotonic()
+            return {**self.stats, 'rate': round(self.rate, 2),
+                    'circuit_open': now < self.open_until,
+                    'half_open': 0 < self.open_until <= now}
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(host):
+    with _limiters_lock:
+        if host not in _limiters:
+            rate = RATE_LIMIT_HOST_RPS.get(host, RATE_LIMIT_DEFAULT_RPS)
+            _limiters[host] = HostLimiter(rate, RATE_LIMIT_BURST)
+        return _limiters[host]
+
+
+def parse_retry_after(value):
+    """Retry-After in seconds (the HTTP-date form is ignored)."""
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def limiter_stats():
+    """Per-host limiter state and counters."""
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {host: limiter.snapshot() for host, limiter in limiters.items()}
+
+
+def reset_limiters():
+    with _limiters_lock:
+        _limiters.clear()
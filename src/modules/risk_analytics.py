@@ -0,0 +1,112 @@
+import numpy as np
+from config import RISK_FREE_RATE, TRADING_DAYS_PER_YEAR
+from modules.screener import PriceMatrix, daily_returns, forward_fill, nan_std
+
+# 스크리닝 결과 행에 붙는 지표 컬럼명
+METRIC_COLUMNS = {
+    'max_drawdown': 'Max Drawdown (%)',
+    'sharpe': 'Sharpe',
+    'sortino': 'Sortino',
+    'beta': 'Beta',
+    'correlation': 'Corr (SPY)',
+}
+
+
+def slice_matrix(matrix, lo, hi):
+    """Rows [lo, hi) of a PriceMatrix."""
+    return PriceMatrix(matrix.dates[lo:hi], matrix.tickers, matrix.open[lo:hi], matrix.close[lo:hi])
+
+
+def max_drawdown(matrix, valid=None):
+    """Largest peak-to-trough close decline in % (positive number) for every ticker."""
+    if valid is None:
+        valid = ~np.isnan(matrix.open) & ~np.isnan(matrix.close)
+    closes = forward_fill(np.where(valid, matrix.close, np.nan))
+    running_max = np.fmax.accumulate(closes, axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        drawdown = closes / running_max - 1
+    all_nan = np.isnan(drawdown).all(axis=0)
+    worst = np.nanmin(np.where(all_nan, 0.0, drawdown), axis=0)
+    return np.where(all_nan, np.nan, -worst * 100)
+
+
+def benchmark_returns(matrix, benchmark_close):
+    """Daily returns of a benchmark close Series aligned to the matrix dates."""
+    closes = benchmark_close.reindex(matrix.dates).to_numpy(dtype=float)[:, None]
+    bench = PriceMatrix(matrix.dates, ['benchmark'], closes, closes)
+    return daily_returns(bench)[:, 0]
+
+
+def compute_risk_metrics(matrix, benchmark_close=None, risk_free_rate=RISK_FREE_RATE,
+                         periods_per_year=TRADING_DAYS_PER_YEAR):
+    """Max drawdown, Sharpe, Sortino and beta/correlation vs a benchmark for every ticker.
+
+    Ratios are annualized from daily close-to-close returns. Beta and
+    correlation use only the days where both the ticker and the benchmark
+    have a return, and are NaN without a benchmark.
+    """
+    valid = ~np.isnan(matrix.open) & ~np.isnan(matrix.close)
+    rets = daily_returns(matrix, valid)
+    has_ret = ~np.isnan(rets)
+    count = has_ret.sum(axis=0)
+    rf_daily = risk_free_rate / periods_per_year
+    excess = rets - rf_daily
+    scale = np.sqrt(periods_per_year)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_excess = np.nansum(excess, axis=0) / count
+        sharpe = mean_excess / nan_std(rets) * scale
+        downside = np.sqrt(np.nansum(np.minimum(excess, 0) ** 2, axis=0) / count)
+        sortino = np.where(downside > 0, mean_excess / downside * scale, np.nan)
+
+    n_tickers = len(matrix.tickers)
+    beta = np.full(n_tickers, np.nan)
+    correlation = np.full(n_tickers, np.nan)
+    if benchmark_close is not None:
+        bench = benchmark_returns(matrix, benchmark_close)[:, None]
+        both = has_ret & ~np.isnan(bench)
+        n = both.sum(axis=0)
+        r = np.where(both, rets, 0.0)
+        b = np.where(both, bench, 0.0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean_r, mean_b = r.sum(axis=0) / n, b.sum(axis=0) / n
+            dev_r = np.where(both, r - mean_r, 0.0)
+            dev_b = np.where(both, b - mean_b, 0.0)
+            cov = (dev_r * dev_b).sum(axis=0) / (n - 1)
+            var_r = (dev_r ** 2).sum(axis=0) / (n - 1)
+            var_b = (dev_b ** 2).sum(axis=0) / (n - 1)
+            beta = np.where(n > 1, cov / var_b, np.nan)
+            correlation = np.where(n > 1, cov / np.sqrt(var_r * var_b), np.nan)
+
+    return {
+        'max_drawdown': max_drawdown(matrix, valid),
+        'sharpe': np.where(count > 1, sharpe, np.nan),
+        'sortino': np.where(count > 1, sortino, np.nan),
+        'beta': beta,
+        'correlation': correlation,
+    }
+
+
+def risk_filter_mask(metrics, risk_filters):
+    """Boolean mask of tickers that pass the sidebar risk filters.
+
+    ``risk_filters`` may hold max_drawdown (max %), min_sharpe, min_sortino
+    and max_beta; a missing or None value disables that filter. Tickers with
+    an undefined metric fail an active filter.
+    """
+    mask = np.ones(len(metrics['sharpe']), dtype=bool)
+    if not risk_filters:
+        return mask
+    checks = [
+        ('max_drawdown', 'max_drawdown', np.less_equal),
+        ('min_sharpe', 'sharpe', np.greater_equal),
+        ('min_sortino', 'sortino', np.greater_equal),
+        ('max_beta', 'beta', np.less_equal),
+    ]
+    for key, metric, compare in checks:
+        limit = risk_filters.get(key)
+        if limit is not None:
+            values = metrics[metric]
+            with np.errstate(invalid='ignore'):
+                mask &= ~np.isnan(values) & compare(values, limit)
+    return mask
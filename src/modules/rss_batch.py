@@ -0,0 +1,149 @@
+import random
+import re
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from modules.http_client import http_get
+
+# Ticker에 무관한 공용 피드 - 분석 1회당 한 번만 받아서 모든 종목에 배분
+GLOBAL_FEEDS = [
+    "https://feeds.reuters.com/reuters/businessNews",
+    "https://www.nasdaq.com/feed/rssoutbound?category=Stocks",
+    "https://www.cnbc.com/id/100003114/device/rss/rss.html"
+]
+
+_TOKEN = re.compile(r"[A-Za-z0-9][A-Za-z0-9.\-&']*")
+# 회사명 매칭 시 무시하는 법인 접미사
+_NAME_SUFFIXES = {'inc', 'inc.', 'corp', 'corp.', 'corporation', 'co', 'co.', 'company', 'ltd', 'ltd.',
+                  'plc', 'holdings', 'group', 'class', 'a', 'b', 'c', '&', 'the', 'n.v.', 's.a.'}
+# 일반 영어 단어이기도 한 티커/한 단어 회사명 - 문장 첫머리의 대문자만으로는 종목 언급으로 보지 않는다
+_COMMON_WORDS = {
+    'a', 'all', 'an', 'are', 'as', 'at', 'be', 'big', 'by', 'can', 'cat', 'do', 'for', 'go', 'has', 'he',
+    'hi', 'if', 'in', 'is', 'it', 'key', 'low', 'man', 'may', 'me', 'new', 'now', 'of', 'on', 'one', 'or',
+    'out', 'see', 'so', 'to', 'up', 'us', 'we', 'well', 'ball', 'target', 'visa', 'progressive',
+    'southern', 'public', 'general', 'first', 'best', 'match', 'global', 'united', 'waste', 'equity',
+}
+# 이 문자 뒤의 토큰은 문장 첫머리로 본다 (줄바꿈은 제목/요약 경계)
+_SENTENCE_BREAKS = '.!?:;"\'\u201c\u2018|-\u2014\n'
+
+
+def _token_spans(text):
+    """(token, start) pairs with trailing punctuation and possessive 's removed."""
+    spans = []
+    for match in _TOKEN.finditer(text):
+        token = match.group().rstrip(".'-")
+        spans.append((token[:-2] if token.endswith("'s") else token, match.start()))
+    return spans
+
+
+def _tokens(text):
+    return [token for token, _ in _token_spans(text)]
+
+
+def _sentence_start(text, start):
+    before = text[:start].rstrip(' \t')
+    return not before or before[-1] in _SENTENCE_BREAKS
+
+
+def _marked_symbol(text, start):
+    """Whether a token is written as a ticker: $A, (A) or (NYSE: A)."""
+    if text[start - 1:start] == '$':
+        return True
+    return text.rfind('(', 0, start) > text.rfind(')', 0, start) and ')' in text[start:start + 12]
+
+
+def _name_phrase(name):
+    """Lower-case token phrase used to match a company name, without corporate suffixes."""
+    tokens = [token.lower() for token in _tokens(name.replace(',', ' '))]
+    while tokens and tokens[-1] in _NAME_SUFFIXES:
+        tokens.pop()
+    return tuple(tokens)
+
+
+def build_matcher(tickers, names=None):
+    """Inverted index over tickers and company names.
+
+    Returns (symbols, phrases): symbols maps an upper-case ticker token to
+    its ticker; phrases maps the first lower-case word of a company name to
+    the (phrase, ticker) pairs starting with it. Tickers match only as
+    whole upper-case tokens, so short symbols like "A" or "ON" do not match
+    inside ordinary words.
+    """
+    names = names or {}
+    symbols, phrases = {}, defaultdict(list)
+    for ticker in tickers:
+        symbols[ticker.upper()] = ticker
+        symbols[ticker.upper().replace('-', '.')] = ticker  # BRK-B / BRK.B
+        phrase = _name_phrase(names.get(ticker, ''))
+        if phrase:
+            phrases[phrase[0]].append((phrase, ticker))
+    return symbols, dict(phrases)
+
+
+def match_text(matcher, text):
+    """Set of tickers mentioned in text, found in one pass over its tokens.
+
+    One-letter symbols and symbols that are common words ("A", "ON", "ALL")
+    count only when marked as tickers ($A, (A), (NYSE: A)) or upper-case in
+    the middle of a mixed-case sentence. One-word company names that are
+    common words ("Target", "Visa") are ignored at the start of a sentence,
+    where any word is capitalized.
+    """
+    symbols, phrases = matcher
+    spans = _token_spans(text)
+    lowered = [token.lower() for token, _ in spans]
+    mixed_case = any(c.islower() for c in text)
+    found = set()
+    for i, (token, start) in enumerate(spans):
+        initial = _sentence_start(text, start)
+        ticker = symbols.get(token)
+        if ticker is not None and token.isupper():
+            ambiguous = len(token) == 1 or lowered[i] in _COMMON_WORDS
+            if not ambiguous or _marked_symbol(text, start) or (mixed_case and not initial):
+                found.add(ticker)
+        if not token[0].isupper():
+            continue  # 회사명은 대문자로 시작할 때만 (Target, Visa 등 일반 단어 오탐 방지)
+        for phrase, ticker in phrases.get(lowered[i], ()):
+            if initial and len(phrase) == 1 and phrase[0] in _COMMON_WORDS:
+                continue
+            if tuple(lowered[i:i + len(phrase)]) == phrase:
+                found.add(ticker)
+    return found
+
+
+def fetch_feed(url, user_agent=None):
+    """Download and parse one feed through the shared session; returns its entries."""
+    import feedparser
+
+    headers = {'User-Agent': user_agent} if user_agent else None
+    response = http_get(url, headers=headers, timeout=5)
+    return feedparser.parse(response.content).entries
+
+
+def route_feed_entries(tickers, names=None, feeds=GLOBAL_FEEDS, user_agents=None):
+    """Fetch each global feed once and route its entries to the tickers they mention.
+
+    Returns (routed, debug) where routed maps ticker -> list of
+    (feed_url, entry) in feed order.
+    """
+    matcher = build_matcher(tickers, names)
+    routed, debug = defaultdict(list), []
+
+    def load(url):
+        return fetch_feed(url, random.choice(user_agents) if user_agents else None)
+
+    with ThreadPoolExecutor(max_workers=max(len(feeds), 1)) as executor:
+        futures = {url: executor.submit(load, url) for url in feeds}
+    for url, future in futures.items():
+        try:
+            entries = future.result()
+        except Exception as e:
+            debug.append(f"❌ RSS {url} error: {e}")
+            continue
+        matched = 0
+        for entry in entries:
+            hits = match_text(matcher, f"{entry.get('title', '')}\n{entry.get('summary', '')}")
+            for ticker in hits:
+                routed[ticker].append((url, entry))
+            matched += bool(hits)
+        debug.append(f"✅ RSS {url}: {len(entries)} entries, {matched} routed to {len(tickers)} tickers")
+    return dict(routed), debug
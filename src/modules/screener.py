@@ -0,0 +1,236 @@
+import heapq
+import numpy as np
+import pandas as pd
+from collections import namedtuple
+
+# 날짜 x 티커로 정렬된 가격 행렬 (결측치는 NaN)
+PriceMatrix = namedtuple('PriceMatrix', ['dates', 'tickers', 'open', 'close'])
+
+
+def build_price_matrix(prices):
+    """Build aligned dates x tickers Open/Close matrices from a wide (field, ticker) frame."""
+    closes = prices['Close']
+    opens = prices['Open'].reindex(columns=closes.columns)
+    return PriceMatrix(
+        dates=closes.index,
+        tickers=list(closes.columns),
+        open=opens.to_numpy(dtype=float),
+        close=closes.to_numpy(dtype=float),
+    )
+
+
+def forward_fill(values):
+    """Forward-fill NaNs down each column of a 2-D array."""
+    mask = np.isnan(values)
+    idx = np.where(~mask, np.arange(values.shape[0])[:, None], 0)
+    np.maximum.accumulate(idx, axis=0, out=idx)
+    return values[idx, np.arange(values.shape[1])]
+
+
+def valid_span(matrix):
+    """Return (valid mask, first valid row, last valid row, has data) per ticker."""
+    valid = ~np.isnan(matrix.open) & ~np.isnan(matrix.close)
+    has_data = valid.any(axis=0)
+    first = valid.argmax(axis=0)
+    last = valid.shape[0] - 1 - valid[::-1].argmax(axis=0)
+    return valid, first, last, has_data
+
+
+def daily_returns(matrix, valid=None):
+    """Close-to-close daily returns, skipping rows without a valid bar.
+
+    A return is only defined on rows with a valid bar and measures the move
+    from the previous valid close, matching ``Close.pct_change().dropna()``
+    on the per-ticker series.
+    """
+    if valid is None:
+        valid = ~np.isnan(matrix.open) & ~np.isnan(matrix.close)
+    closes = np.where(valid, matrix.close, np.nan)
+    prev = forward_fill(closes)[:-1]
+    rets = np.full(closes.shape, np.nan)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rets[1:] = closes[1:] / prev - 1
+    return rets
+
+
+def nan_std(values, axis=0):
+    """Sample standard deviation (ddof=1) ignoring NaNs; NaN when fewer than 2 values."""
+    count = (~np.isnan(values)).sum(axis=axis)
+    total = np.nansum(values, axis=axis)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = total / count
+        sq_dev = np.nansum((values - np.expand_dims(mean, axis)) ** 2, axis=axis)
+        return np.where(count > 1, np.sqrt(sq_dev / (count - 1)), np.nan)
+
+
+def compute_return_risk(matrix):
+    """Return % (first open to last close) and daily-return std % for every ticker."""
+    valid, first, last, has_data = valid_span(matrix)
+    cols = np.arange(len(matrix.tickers))
+    start_price = matrix.open[first, cols]
+    end_price = matrix.close[last, cols]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return_pct = np.where(has_data, (end_price - start_price) / start_price * 100, np.nan)
+    risk_pct = nan_std(daily_returns(matrix, valid)) * 100
+    return return_pct, risk_pct
+
+
+def rank_results(tickers, return_pct, risk_pct, target_return, top_n, mask=None, columns=None):
+    """Apply the target return filter and return the top-N rows sorted by return.
+
+    ``mask`` further restricts the candidates (e.g. sector or risk filters)
+    and ``columns`` maps extra column names to per-ticker arrays to include.
+    """
+    with np.errstate(invalid='ignore'):
+        keep = ~np.isnan(return_pct) & (return_pct >= target_return)
+    if mask is not None:
+        keep &= mask
+    passed = np.flatnonzero(keep)
+    order = passed[np.argsort(-return_pct[passed], kind='stable')][:top_n]
+    rows = []
+    for i in order:
+        row = {
+            'Ticker': tickers[i],
+            'Return (%)': float(return_pct[i]),
+            'Risk (%)': float(risk_pct[i])
+        }
+        for name, values in (columns or {}).items():
+            row[name] = float(values[i])
+        rows.append(row)
+    return rows
+
+
+def push_top_n(heap, rows, top_n):
+    """Push screen rows into a bounded min-heap that keeps the top-N by return."""
+    for row in rows:
+        entry = (row['Return (%)'], row['Ticker'], row)
+        if len(heap) < top_n:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+    return heap
+
+
+def heap_ranking(heap):
+    """Return the rows held in a top-N heap, sorted by return descending."""
+    return [entry[2] for entry in sorted(heap, reverse=True)]
+
+
+def screen_prices(prices, target_return, top_n=5, risk_filters=None, benchmark_close=None):
+    """Screen every ticker in a wide price frame in one vectorized pass.
+
+    Drawdown, Sharpe, Sortino and beta are computed alongside return/risk,
+    added to each row and used for ``risk_filters``.
+    """
+    from modules.risk_analytics import METRIC_COLUMNS, compute_risk_metrics, risk_filter_mask
+
+    if prices.empty:
+        return []
+    matrix = build_price_matrix(prices)
+    return_pct, risk_pct = compute_return_risk(matrix)
+    metrics = compute_risk_metrics(matrix, benchmark_close)
+    columns = {METRIC_COLUMNS[key]: values for key, values in metrics.items()}
+    return rank_results(matrix.tickers, return_pct, risk_pct, target_return, top_n,
+                        mask=risk_filter_mask(metrics, risk_filters), columns=columns)
+
+
+# 임의 구간 수익률/리스크 조회용 누적합 인덱스
+ReturnIndex = namedtuple('ReturnIndex', [
+    'matrix', 'next_valid', 'prev_valid', 'cum_log', 'cum_ret', 'cum_sq', 'cum_count'
+])
+
+
+def _prefix_sum(values):
+    """Prefix sums with a leading zero row, treating NaN as 0."""
+    out = np.zeros((values.shape[0] + 1,) + values.shape[1:])
+    np.cumsum(np.nan_to_num(values), axis=0, out=out[1:])
+    return out
+
+
+def build_return_index(matrix):
+    """Precompute per-ticker prefix sums so any [start, end) window is a constant-time lookup."""
+    valid = ~np.isnan(matrix.open) & ~np.isnan(matrix.close)
+    n_rows = valid.shape[0]
+    rows = np.arange(n_rows)[:, None]
+    # 각 행 기준 다음/이전 유효 행 (없으면 n_rows / -1)
+    next_valid = np.where(valid, rows, n_rows)
+    next_valid = np.minimum.accumulate(next_valid[::-1], axis=0)[::-1]
+    prev_valid = np.maximum.accumulate(np.where(valid, rows, -1), axis=0)
+
+    rets = daily_returns(matrix, valid)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        log_rets = np.log1p(rets)
+    return ReturnIndex(
+        matrix=matrix,
+        next_valid=next_valid,
+        prev_valid=prev_valid,
+        cum_log=_prefix_sum(log_rets),
+        cum_ret=_prefix_sum(rets),
+        cum_sq=_prefix_sum(rets ** 2),
+        cum_count=_prefix_sum(~np.isnan(rets)),
+    )
+
+
+def window_rows(index, start_date, end_date):
+    """Row bounds [lo, hi) of the index dates that fall in [start_date, end_date)."""
+    dates = index.matrix.dates
+    return dates.searchsorted(start_date, 'left'), dates.searchsorted(end_date, 'left')
+
+
+def query_windows(index, start_dates, end_dates):
+    """Return % and daily-return std % for many [start, end) windows at once.
+
+    Returns two (windows x tickers) arrays; every window is answered from the
+    prefix sums with a handful of gathers, so W windows cost O(W x N).
+    """
+    matrix = index.matrix
+    dates = matrix.dates
+    lo = dates.searchsorted(pd.DatetimeIndex(start_dates), 'left')[:, None]
+    hi = dates.searchsorted(pd.DatetimeIndex(end_dates), 'left')[:, None]
+    cols = np.arange(len(matrix.tickers))[None, :]
+
+    nonempty = hi > lo
+    first = index.next_valid[np.minimum(lo, len(dates) - 1), cols]
+    last = index.prev_valid[np.maximum(hi - 1, 0), cols]
+    has_data = nonempty & (first < hi) & (last >= lo)
+    first = np.where(has_data, first, 0)
+    last = np.where(has_data, last, 0)
+
+    start_price = matrix.open[first, cols]
+    end_price = matrix.close[last, cols]
+    # 구간 내 첫 유효 행의 수익률은 구간 밖 종가 기준이므로 제외
+    a, b = first + 1, last + 1
+    count = index.cum_count[b, cols] - index.cum_count[a, cols]
+    total = index.cum_ret[b, cols] - index.cum_ret[a, cols]
+    total_sq = index.cum_sq[b, cols] - index.cum_sq[a, cols]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return_pct = np.where(has_data, (end_price - start_price) / start_price * 100, np.nan)
+        var = np.maximum(total_sq - total ** 2 / count, 0) / (count - 1)
+        risk_pct = np.where(has_data & (count > 1), np.sqrt(var) * 100, np.nan)
+    return return_pct, risk_pct
+
+
+def query_window(index, start_date, end_date):
+    """Return % and daily-return std % for every ticker over [start_date, end_date)."""
+    return_pct, risk_pct = query_windows(index, [start_date], [end_date])
+    return return_pct[0], risk_pct[0]
+
+
+def window_log_return(index, start_row, end_row):
+    """Close-to-close log return per ticker between two index rows (end inclusive)."""
+    cols = np.arange(len(index.matrix.tickers))
+    return index.cum_log[end_row + 1, cols] - index.cum_log[start_row + 1, cols]
+
+
+def select_columns(index, cols):
+    """ReturnIndex restricted to the ticker columns ``cols`` (positions into index.matrix.tickers)."""
+    matrix = index.matrix
+    return ReturnIndex(
+        matrix=PriceMatrix(matrix.dates, [matrix.tickers[i] for i in cols], matrix.open[:, cols], matrix.close[:, cols]),
+        next_valid=index.next_valid[:, cols],
+        prev_valid=index.prev_valid[:, cols],
+        cum_log=index.cum_log[:, cols],
+        cum_ret=index.cum_ret[:, cols],
+        cum_sq=index.cum_sq[:, cols],
+        cum_count=index.cum_count[:, cols],
+    )
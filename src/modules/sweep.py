@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+from collections import namedtuple
+from modules.screener import query_windows, rank_results
+
+# 구간 x 목표수익률 x 티커 스윕 결과
+SweepCube = namedtuple('SweepCube', [
+    'windows', 'thresholds', 'tickers', 'return_pct', 'risk_pct', 'passes', 'pass_count'
+])
+
+
+def run_sweep(index, windows, thresholds, mask=None):
+    """Evaluate a grid of (start, end) windows and target_return thresholds in one pass.
+
+    ``windows`` is a list of (start_date, end_date) pairs. Return and risk
+    are (windows x tickers) float32 arrays, ``passes`` is a
+    (windows x thresholds x tickers) boolean array of the target_return
+    filter, and ``pass_count`` counts passing tickers per grid cell.
+    ``mask`` excludes tickers (e.g. outside the selected sectors).
+    """
+    starts = [pd.Timestamp(start) for start, _ in windows]
+    ends = [pd.Timestamp(end) for _, end in windows]
+    return_pct, risk_pct = query_windows(index, starts, ends)
+    thresholds = np.asarray(thresholds, dtype=float)
+    with np.errstate(invalid='ignore'):
+        passes = return_pct[:, None, :] >= thresholds[None, :, None]
+    if mask is not None:
+        passes &= mask[None, None, :]
+    return SweepCube(
+        windows=list(zip(starts, ends)),
+        thresholds=thresholds,
+        tickers=list(index.matrix.tickers),
+        return_pct=return_pct.astype(np.float32),
+        risk_pct=risk_pct.astype(np.float32),
+        passes=passes,
+        pass_count=passes.sum(axis=2),
+    )
+
+
+def cube_top_n(cube, window_idx, threshold_idx, top_n=5):
+    """Top-N rows for one grid cell, in the same shape as get_stock_data's output."""
+    return rank_results(
+        cube.tickers,
+        cube.return_pct[window_idx].astype(float),
+        cube.risk_pct[window_idx].astype(float),
+        cube.thresholds[threshold_idx],
+        top_n,
+        mask=cube.passes[window_idx, threshold_idx],
+    )
+
+
+def pick_frequency(cube, top_n=5):
+    """Share of grid cells in which each ticker makes the top-N, highest first.
+
+    Summarizes how stable the picks are across windows and thresholds.
+    """
+    ranked = np.where(cube.passes, cube.return_pct[:, None, :], -np.inf)
+    # 각 셀에서 수익률 상위 N개 (통과 종목이 N개 미만이면 통과 종목만)
+    k = min(top_n, ranked.shape[2])
+    top = np.argpartition(-ranked, k - 1, axis=2)[:, :, :k]
+    picked = np.take_along_axis(cube.passes, top, axis=2)
+    counts = np.zeros(len(cube.tickers))
+    np.add.at(counts, top[picked], 1)
+    cells = cube.passes.shape[0] * cube.passes.shape[1]
+    frequency = pd.Series(counts / cells, index=cube.tickers, name='Top-N Frequency')
+    return frequency[frequency > 0].sort_values(ascending=False)
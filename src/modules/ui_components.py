@@ -1,13 +1,19 @@
 import streamlit as st
 import pandas as pd
-import yfinance as yf
 import plotly.graph_objects as go
 
 from modules.crawler import crawl_info_parallel
+from modules.crawl_engine import crawl_tickers
 from modules.llm_handler import run_llm, run_llm_stock_analysis, run_llm_with_enhanced_content, check_vllm_server, test_vllm_simple
 from modules.stock_analyzer import analyze_stock_characteristics, summarize_crawling_process, explain_llm_processing_logic
 from modules.content_extractor import extract_content_from_url # 추가
-from config import NUM_REFERENCES, CONFIG_LANGUAGES
+from modules.chart_data import get_price_pyramid, get_moving_averages
+from modules.downsample import aggregate_ohlc, downsample_line
+from modules.portfolio import analyze_portfolio
+from modules.monte_carlo import simulate_portfolio
+from modules.constituents import get_sectors
+from modules.data_handler import load_ticker_list
+from config import NUM_REFERENCES, CONFIG_LANGUAGES, CHART_LINE_POINT_BUDGET, CHART_CANDLE_BUDGET, MA_WINDOWS
 
 # UI Components
 
@@ -28,6 +34,31 @@ def sidebar_ui(default_start, default_end):
     with st.sidebar.expander("🎯 분석 조건", expanded=True):
         target_return = st.slider("목표 수익률 (%)", 0.0, 100.0, 10.0, 0.5)
         top_n = st.select_slider("추천 종목 수", list(range(1,21)), 5)
+        try:
+            sector_options = get_sectors()
+        except Exception as e:
+            # 오프라인이고 구성종목 스냅샷도 없으면 섹터 필터 없이 진행
+            st.warning(f"섹터 목록을 불러오지 못했습니다: {e}")
+            sector_options = []
+        sectors = st.multiselect("섹터 필터 (GICS):", options=sector_options, default=[],
+                                 disabled=not sector_options)
+    with st.sidebar.expander("🛡️ 리스크 필터", expanded=False):
+        # 슬라이더 끝값은 '필터 없음'
+        max_drawdown = st.slider("최대 낙폭 한도 (%)", 0.0, 100.0, 100.0, 1.0)
+        min_sharpe = st.slider("최소 샤프 지수", -3.0, 5.0, -3.0, 0.1)
+        min_sortino = st.slider("최소 소르티노 지수", -3.0, 5.0, -3.0, 0.1)
+        max_beta = st.slider("최대 베타 (vs SPY)", 0.0, 3.0, 3.0, 0.1)
+        risk_filters = {
+            'max_drawdown': max_drawdown if max_drawdown < 100.0 else None,
+            'min_sharpe': min_sharpe if min_sharpe > -3.0 else None,
+            'min_sortino': min_sortino if min_sortino > -3.0 else None,
+            'max_beta': max_beta if max_beta < 3.0 else None,
+        }
+    with st.sidebar.expander("🌐 사용자 정의 유니버스", expanded=False):
+        universe_file = st.file_uploader("티커 목록 (txt/csv, 한 줄에 하나):", type=["txt", "csv"])
+        universe = load_ticker_list(universe_file) if universe_file else None
+        if universe:
+            st.caption(f"{len(universe)}개 종목 (S&P500 대신 사용)")
     # Language selection for LLM output
     language = st.sidebar.selectbox("언어 선택:", options=CONFIG_LANGUAGES, index=0)
     analyze = st.sidebar.button("🚀 분석 실행", type="primary")
@@ -41,7 +72,7 @@ def sidebar_ui(default_start, default_end):
             st.sidebar.success(f"✅ {message}")
         else:
             st.sidebar.error(f"❌ {message}")
-    return start_date, end_date, target_return, top_n, language
+    return start_date, end_date, target_return, top_n, language, sectors, universe, risk_filters
 
 
 def display_metrics(df):
@@ -61,6 +92,9 @@ def display_table_and_chart(stock_data, start_date, end_date):
     display_df = df.copy()
     display_df['Return (%)'] = display_df['Return (%)'].round(2)
     display_df['Risk (%)'] = display_df['Risk (%)'].round(2)
+    for col in ['Max Drawdown (%)', 'Sharpe', 'Sortino', 'Beta', 'Corr (SPY)']:
+        if col in display_df:
+            display_df[col] = display_df[col].round(2)
     col1, col2 = st.columns([1,2])
     with col1:
         st.subheader("📊 종목별 수익률 & 리스크")
@@ -73,16 +107,20 @@ def display_table_and_chart(stock_data, start_date, end_date):
         
         # Moving Average trend line options
         st.write("**이동평균선 설정:**")
-        ma_cols = st.columns(4)
+        ma_cols = st.columns(len(MA_WINDOWS))
         show_ma = {}
-        with ma_cols[0]:
-            show_ma[5] = st.checkbox("MA5", value=True, key="ma5")
-        with ma_cols[1]:
-            show_ma[20] = st.checkbox("MA20", value=True, key="ma20")
-        with ma_cols[2]:
-            show_ma[60] = st.checkbox("MA60", value=False, key="ma60")
-        with ma_cols[3]:
-            show_ma[120] = st.checkbox("MA120", value=False, key="ma120")
+        for i, window in enumerate(MA_WINDOWS):
+            with ma_cols[i]:
+                # 짧은 두 이동평균선만 기본 표시
+                show_ma[window] = st.checkbox(f"MA{window}", value=i < 2, key=f"ma{window}")
+        
+        # 표시 구간 (구간을 좁히면 다운샘플링이 줄어 원본 해상도로 돌아온다)
+        view_start, view_end = start_date, end_date
+        if start_date < end_date:
+            view_start, view_end = st.slider(
+                "차트 표시 구간", min_value=start_date, max_value=end_date,
+                value=(start_date, end_date), key="chart_view_range"
+            )
         
         # Stock selection checkboxes
         st.write("**표시할 종목 선택:**")
@@ -107,49 +145,44 @@ def display_table_and_chart(stock_data, start_date, end_date):
             
         with st.spinner('📈 포트폴리오 성과 계산 중...'):
             fig = go.Figure()
+            # 전체 종목의 모든 이동평균을 한 번에 계산해 캐시 (체크박스 토글 시 재계산 없음)
+            moving_averages = get_moving_averages(
+                tuple(item['Ticker'] for item in stock_data), start_date, end_date, chart_period
+            )
+            downsampled = []
             
             # Process each selected stock with unique colors
             for idx, item in enumerate(selected_stocks):
                 base_color = colors[idx % len(colors)]
-                data = yf.Ticker(item['Ticker']).history(start=str(start_date), end=str(end_date))
+                # 일/주/월봉은 티커·기간별로 한 번만 만들어 캐시에서 재사용
+                pyramid = get_price_pyramid(item['Ticker'], start_date, end_date)
                 
                 # Check if data is available
-                if data.empty:
+                if pyramid["일봉"].empty:
                     st.warning(f"⚠️ {item['Ticker']} 데이터를 가져올 수 없습니다.")
                     continue
                 
-                # Resample data based on selected period
-                if chart_period == "주봉":
-                    # Use 'W-FRI' for weekly data ending on Friday
-                    data = data.resample('W-FRI').agg({
-                        'Open':'first',
-                        'High':'max',
-                        'Low':'min',
-                        'Close':'last',
-                        'Volume':'sum'
-                    }).dropna()
-                elif chart_period == "월봉":
-                    # Use 'M' for monthly data ending on last day of month
-                    data = data.resample('M').agg({
-                        'Open':'first',
-                        'High':'max',
-                        'Low':'min',
-                        'Close':'last',
-                        'Volume':'sum'
-                    }).dropna()
-                
                 # Check if resampled data is available
+                data = pyramid[chart_period]
                 if data.empty:
                     st.warning(f"⚠️ {item['Ticker']} {chart_period} 데이터가 충분하지 않습니다.")
                     continue
                 
+                # 표시 구간만 잘라 화면 해상도에 맞게 캔들을 병합
+                visible = data.loc[pd.Timestamp(view_start):pd.Timestamp(view_end)]
+                if visible.empty:
+                    continue
+                candles = aggregate_ohlc(visible, CHART_CANDLE_BUDGET)
+                if len(candles) < len(visible):
+                    downsampled.append(item['Ticker'])
+                
                 # Use Candlestick chart with custom colors
                 fig.add_trace(go.Candlestick(
-                    x=data.index,
-                    open=data['Open'],
-                    high=data['High'],
-                    low=data['Low'],
-                    close=data['Close'],
+                    x=candles.index,
+                    open=candles['Open'],
+                    high=candles['High'],
+                    low=candles['Low'],
+                    close=candles['Close'],
                     name=f"{item['Ticker']} 캔들",
                     increasing_line_color=base_color,
                     decreasing_line_color=base_color,
@@ -159,22 +192,26 @@ def display_table_and_chart(stock_data, start_date, end_date):
                 ))
                 
                 # Add Moving Average trend lines with coordinated colors
+                rgb = f"{int(base_color[1:3], 16)}, {int(base_color[3:5], 16)}, {int(base_color[5:7], 16)}"
+                ma_styles = ['solid', 'dash', 'dot', 'dashdot']
+                # 긴 이동평균선일수록 흐리고 굵게
                 ma_config = {
-                    5: {'color': f"rgba({int(base_color[1:3], 16)}, {int(base_color[3:5], 16)}, {int(base_color[5:7], 16)}, 0.9)", 'style': 'solid', 'width': 1.5},
-                    20: {'color': f"rgba({int(base_color[1:3], 16)}, {int(base_color[3:5], 16)}, {int(base_color[5:7], 16)}, 0.7)", 'style': 'dash', 'width': 2},
-                    60: {'color': f"rgba({int(base_color[1:3], 16)}, {int(base_color[3:5], 16)}, {int(base_color[5:7], 16)}, 0.5)", 'style': 'dot', 'width': 2.5},
-                    120: {'color': f"rgba({int(base_color[1:3], 16)}, {int(base_color[3:5], 16)}, {int(base_color[5:7], 16)}, 0.3)", 'style': 'dashdot', 'width': 3}
+                    window: {'color': f"rgba({rgb}, {max(0.9 - 0.2 * i, 0.2):.1f})",
+                             'style': ma_styles[i % len(ma_styles)], 'width': 1.5 + 0.5 * i}
+                    for i, window in enumerate(MA_WINDOWS)
                 }
                 
-                ma_names = {5: 'MA5', 20: 'MA20', 60: 'MA60', 120: 'MA120'}
+                ma_names = {window: f'MA{window}' for window in MA_WINDOWS}
                 
-                for period in [5, 20, 60, 120]:
+                for period in MA_WINDOWS:
                     if show_ma.get(period, False) and len(data) >= period:
-                        ma_values = data['Close'].rolling(window=period).mean()
+                        ma_values = moving_averages[period][item['Ticker']].reindex(visible.index)
+                        # 이동평균선은 LTTB로 형태를 유지하며 점 수를 줄인다
+                        ma_values = downsample_line(ma_values, CHART_LINE_POINT_BUDGET)
                         config = ma_config[period]
                         
                         fig.add_trace(go.Scatter(
-                            x=data.index,
+                            x=ma_values.index,
                             y=ma_values,
                             mode='lines',
                             name=f'{item["Ticker"]} {ma_names[period]}',
@@ -226,7 +263,97 @@ def display_table_and_chart(stock_data, start_date, end_date):
             
             # Add custom controls description
             st.info("💡 **차트 조작법:** 드래그로 확대, 더블클릭으로 전체보기, 범위선택 버튼 활용")
+            if downsampled:
+                st.caption(f"📉 {', '.join(downsampled)}: 화면 해상도에 맞게 캔들을 병합했습니다. '차트 표시 구간'을 좁히면 원본 해상도로 표시됩니다.")
             st.plotly_chart(fig, use_container_width=True)
+        
+        display_portfolio_analysis(selected_stocks, start_date, end_date)
+        display_monte_carlo(selected_stocks, start_date, end_date)
+
+
+def display_portfolio_analysis(selected_stocks, start_date, end_date):
+    """Correlation matrix, mean-variance weights and efficient frontier for the selected stocks."""
+    with st.expander("🧮 포트폴리오 상관관계 & 최적 비중", expanded=False):
+        if len(selected_stocks) < 2:
+            st.info("💡 2개 이상의 종목을 선택하면 상관관계와 최적 비중을 계산합니다.")
+            return
+        # 선택 조합별로 캐시되므로 체크박스를 다시 켜고 끄면 즉시 표시
+        tickers = tuple(sorted(item['Ticker'] for item in selected_stocks))
+        analysis = analyze_portfolio(tickers, start_date, end_date)
+        if analysis is None:
+            st.warning("⚠️ 공통 거래일 데이터가 부족하여 포트폴리오 분석을 할 수 없습니다.")
+            return
+        
+        corr = analysis['correlation']
+        heatmap = go.Figure(go.Heatmap(
+            z=corr.values, x=corr.columns, y=corr.index,
+            zmin=-1, zmax=1, colorscale='RdBu_r',
+            text=corr.round(2).values, texttemplate='%{text}'
+        ))
+        heatmap.update_layout(title="일별 수익률 상관계수 (Ledoit-Wolf 수축)", height=400)
+        st.plotly_chart(heatmap, use_container_width=True)
+        st.caption(f"수축 강도: {analysis['shrinkage']:.2f} (0 = 표본 공분산, 1 = 대각 목표)")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.write("**최적 비중 (공매도 허용):**")
+            st.dataframe((analysis['weights'] * 100).round(1).astype(str) + '%', use_container_width=True)
+            st.dataframe(analysis['portfolios'].round(2), use_container_width=True)
+        with col2:
+            frontier = analysis['frontier']
+            portfolios = analysis['portfolios']
+            frontier_fig = go.Figure()
+            frontier_fig.add_trace(go.Scatter(
+                x=frontier['Volatility (%)'], y=frontier['Return (%)'],
+                mode='lines', name='효율적 투자선'
+            ))
+            frontier_fig.add_trace(go.Scatter(
+                x=portfolios['Volatility (%)'], y=portfolios['Return (%)'],
+                mode='markers+text', text=portfolios.index, textposition='top center',
+                marker=dict(size=10), name='최적 포트폴리오'
+            ))
+            frontier_fig.update_layout(
+                title="효율적 투자선 (연율화)", xaxis_title="변동성 (%)", yaxis_title="기대 수익률 (%)",
+                height=400, showlegend=False
+            )
+            st.plotly_chart(frontier_fig, use_container_width=True)
+
+
+def display_monte_carlo(selected_stocks, start_date, end_date):
+    """Forward-looking VaR/CVaR and return distribution of the selected stocks via Monte Carlo."""
+    with st.expander("🎲 몬테카를로 리스크 시뮬레이션 (VaR / CVaR)", expanded=False):
+        tickers = tuple(sorted(item['Ticker'] for item in selected_stocks))
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            method = st.radio("시뮬레이션 방식", ['bootstrap', 'gbm'],
+                              format_func=lambda m: "과거 수익률 재표본 (Bootstrap)" if m == 'bootstrap' else "기하 브라운 운동 (GBM)")
+        with col2:
+            horizon = st.slider("보유 기간 (거래일)", min_value=1, max_value=252, value=21)
+        with col3:
+            weighting = st.radio("비중", ["동일 비중", "최소 분산", "최대 샤프"] if len(tickers) > 1 else ["동일 비중"])
+        
+        weights = None
+        if weighting != "동일 비중":
+            analysis = analyze_portfolio(tickers, start_date, end_date)
+            if analysis is not None:
+                # 수익률이 없어 최적화에서 빠진 종목은 시뮬레이션에서도 제외 (NaN 비중 방지)
+                tickers = tuple(analysis['tickers'])
+                weights = tuple(float(w) for w in analysis['weights'][weighting].reindex(list(tickers)))
+        
+        result = simulate_portfolio(tickers, start_date, end_date, weights, horizon, method)
+        if result is None:
+            st.warning("⚠️ 수익률 데이터가 부족하여 시뮬레이션을 할 수 없습니다.")
+            return
+        summary, terminal = result
+        
+        hist = go.Figure(go.Histogram(x=terminal * 100, nbinsx=100, name='시뮬레이션 수익률'))
+        hist.add_vline(x=-summary['VaR 95% (%)'], line_dash='dash', line_color='orange', annotation_text='VaR 95%')
+        hist.add_vline(x=-summary['VaR 99% (%)'], line_dash='dash', line_color='red', annotation_text='VaR 99%')
+        hist.update_layout(title=f"{horizon}거래일 후 포트폴리오 수익률 분포 ({len(terminal):,}개 경로)",
+                           xaxis_title="수익률 (%)", yaxis_title="경로 수", height=400, showlegend=False)
+        st.plotly_chart(hist, use_container_width=True)
+        st.dataframe(pd.Series(summary, name='값').round(2).to_frame(), use_container_width=True)
+        st.caption("VaR/CVaR는 손실을 양수로 표시합니다. 같은 시드에서는 항상 같은 결과가 나옵니다.")
 
 
 def display_risk_info():
@@ -304,21 +431,20 @@ def display_ai_analysis(stock_data, start_date, language):
     
     progress = st.progress(0)
     status = st.empty()
-    reasons = []
+    reasons = {}
+    items = {item['Ticker']: item for item in stock_data}
     
-    for i, item in enumerate(stock_data):
-        ticker = item['Ticker']
-        status.text(f"🔍 {ticker} 분석 중 ({i+1}/{len(stock_data)})")
-        progress.progress((i+1)/len(stock_data))
-        
-        with debug_container:
-            st.info(f"🚀 {ticker} 크롤링 및 LLM 분석 시작...")
+    with debug_container:
+        st.info(f"🚀 {len(items)}개 종목 동시 크롤링 시작...")
+    
+    # 모든 종목/소스를 동시에 크롤링하고, 먼저 끝난 종목부터 LLM 분석
+    for i, (ticker, crawled) in enumerate(crawl_tickers(list(items), start_date)):
+        item = items[ticker]
+        status.text(f"🔍 {ticker} 분석 중 ({i+1}/{len(items)})")
+        progress.progress((i+1)/len(items))
         
         try:
-            # 크롤링 단계 디버깅
-            with debug_container:
-                st.write(f"📡 {ticker} 크롤링 중...")
-            articles, links, debug = crawl_info_parallel(ticker, start_date)
+            articles, links, debug = crawled['articles'], crawled['links'], crawled['debug']
             
             with debug_container:
                 st.success(f"✅ {ticker} 크롤링 완료: {len(articles)}개 기사 수집")
@@ -331,7 +457,7 @@ def display_ai_analysis(stock_data, start_date, language):
             
             # Use enhanced LLM analysis with link content extraction
             recommendation, review_content, extraction_debug = run_llm_with_enhanced_content(
-                ticker, start_date, item['Return (%)'], articles, links, language
+                ticker, start_date, item['Return (%)'], articles, links, language, enhanced=crawled['enhanced']
             )
             
             with debug_container:
@@ -368,7 +494,7 @@ def display_ai_analysis(stock_data, start_date, language):
         
         # 분석 결과 저장
         
-        reasons.append({
+        reasons[ticker] = {
             **item, 
             '추천 사유': recommendation, 
             '크롤링 디버그': debug, 
@@ -378,8 +504,10 @@ def display_ai_analysis(stock_data, start_date, language):
             '크롤링 요약': crawling_summary,
             '주식 분석': stock_analysis,
             '링크 추출 디버그': extraction_debug if 'extraction_debug' in locals() else []
-        })
+        }
     progress.empty(); status.empty()
+    # 완료 순서와 무관하게 원래 순위대로 표시
+    reasons = [reasons[ticker] for ticker in items if ticker in reasons]
     
     # 수집된 정보 요약 섹션 추가
     with st.expander("📋 수집된 정보 요약", expanded=True):
@@ -507,7 +635,7 @@ def display_crawling_test_ui(start_date, language):
         with st.spinner("URL 콘텐츠 추출 및 요약 중..."):
             try:
                 # 1. 콘텐츠 추출
-                content, _ = extract_content_from_url(test_url)
+                content, document = extract_content_from_url(test_url)
                 
                 # 2. LLM으로 요약
                 if content:
@@ -519,7 +647,7 @@ def display_crawling_test_ui(start_date, language):
                     summary, _ = run_llm(summary_prompt, "", "URL 요약", language)
                     st.session_state.url_summary_results = {"success": True, "content": content, "summary": summary}
                 else:
-                    st.session_state.url_summary_results = {"success": False, "error": "콘텐츠를 추출할 수 없습니다."}
+                    st.session_state.url_summary_results = {"success": False, "error": document.get('error') or "콘텐츠를 추출할 수 없습니다."}
 
             except Exception as e:
                 import traceback
@@ -0,0 +1,102 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+
+# 앱과 같은 방식으로 src를 import 경로에 추가 (from config import ..., from modules.x import ...)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+
+@pytest.fixture
+def price_frame():
+    """Wide (field, ticker) OHLC frame with a leading gap, a mid-series gap and a late listing."""
+    rng = np.random.default_rng(7)
+    dates = pd.bdate_range('2023-01-02', periods=120)
+    fields = {}
+    for i, ticker in enumerate(['AAA', 'BBB', 'CCC', 'DDD']):
+        close = 50 * (i + 1) * np.exp(np.cumsum(rng.normal(0.001, 0.02, len(dates))))
+        open_ = close * (1 + rng.normal(0, 0.005, len(dates)))
+        fields[('Open', ticker)] = open_
+        fields[('Close', ticker)] = close
+    prices = pd.DataFrame(fields, index=dates)
+    prices.loc[dates[:5], (slice(None), 'BBB')] = np.nan     # 늦게 시작
+    prices.loc[dates[40:43], (slice(None), 'CCC')] = np.nan  # 중간 결측
+    prices.loc[dates[:90], (slice(None), 'DDD')] = np.nan    # 신규 상장
+    return prices.sort_index(axis=1)
+
+
+@pytest.fixture
+def recording_provider(tmp_path, monkeypatch):
+    """Fixture provider over a temporary price store that records every download range."""
+    from modules import market_data, price_store
+
+    class RecordingProvider(market_data.FixtureProvider):
+        def __init__(self, root):
+            super().__init__(root)
+            self.calls = []
+
+        def download(self, tickers, start_date, end_date):
+            self.calls.append((sorted(tickers), str(start_date), str(end_date)))
+            return super().download(tickers, start_date, end_date)
+
+    root = tmp_path / "fixtures"
+    root.mkdir()
+    dates = pd.bdate_range('2015-01-01', '2022-12-31')
+    for i, ticker in enumerate(['AAA', 'BBB']):
+        close = np.linspace(10, 20, len(dates)) * (i + 1)
+        bars = pd.DataFrame({'Open': close, 'High': close, 'Low': close, 'Close': close, 'Volume': 1000.0},
+                            index=pd.Index(dates, name='Date'))
+        bars.to_parquet(root / f"{ticker}.parquet")
+
+    provider = RecordingProvider(str(root))
+    monkeypatch.setattr(price_store, 'PRICE_STORE_DIR', str(tmp_path / "store"))
+    monkeypatch.setattr(market_data, '_provider', provider)
+    price_store.reset_cache()
+    yield provider
+    price_store.reset_cache()
+
+
+@pytest.fixture
+def http_server(monkeypatch):
+    """Local HTTP server; yields (base_url, requests) where requests records (path, headers) per hit.
+
+    /etag serves a page with an ETag and answers 304 to a matching
+    If-None-Match; /throttle answers 429 with Retry-After: 1.
+    """
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            seen.append((self.path, dict(self.headers)))
+            if self.path == '/throttle':
+                self.send_response(429)
+                self.send_header('Retry-After', '1')
+                body = b''
+            elif self.headers.get('If-None-Match') == '"v1"':
+                self.send_response(304)
+                self.send_header('ETag', '"v1"')
+                body = b''
+            else:
+                self.send_response(200)
+                self.send_header('ETag', '"v1"')
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                body = b'<html><body>cached page</body></html>'
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    # 프록시 환경 변수가 있어도 로컬 서버로 직접 연결
+    monkeypatch.setenv('NO_PROXY', '127.0.0.1,localhost')
+    monkeypatch.setenv('no_proxy', '127.0.0.1,localhost')
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}", seen
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+from config import BACKTEST_COST_BPS
+from modules import data_handler
+from modules.backtest import run_backtest
+from modules.screener import build_price_matrix, build_return_index
+
+
+def _two_asset_prices():
+    """X rises 1%/day in January and falls 1%/day in February; Y is flat, then rises 2%/day in February."""
+    dates = pd.bdate_range('2023-01-02', '2023-03-31')
+    jan, feb = dates.month == 1, dates.month == 2
+    x = 100 * np.cumprod(np.where(jan, 1.01, np.where(feb, 0.99, 1.0)))
+    y = 100 * np.cumprod(np.where(feb, 1.02, 1.0))
+    closes = pd.DataFrame({'X': x, 'Y': y}, index=dates)
+    return pd.concat({'Open': closes, 'Close': closes}, axis=1)
+
+
+def test_backtest_top_n_two_assets(monkeypatch):
+    prices = _two_asset_prices()
+    monkeypatch.setattr(data_handler, 'get_sp500_tickers', lambda as_of=None, sectors=None: ['X', 'Y'])
+    monkeypatch.setattr(data_handler, 'load_prices', lambda tickers, start, end: (prices, []))
+    monkeypatch.setattr(data_handler, '_return_index_cache', {})
+
+    result = data_handler.backtest_top_n('2023-01-25', '2023-04-01', top_n=1, lookback=5, freq='M')
+
+    # 1월 말에 X, 2월 말에 Y로 교체 (회전율 1 → 2)
+    assert list(result.rebalance_dates) == [pd.Timestamp('2023-01-31'), pd.Timestamp('2023-02-28')]
+    assert result.holdings == [['X'], ['Y']]
+    np.testing.assert_allclose(result.turnover.to_numpy(), [1.0, 2.0])
+
+    cost = BACKTEST_COST_BPS / 1e4
+    feb_days = int((prices.index.month == 2).sum())
+    assert result.equity.iloc[0] == 1.0
+    assert np.isclose(result.equity.loc['2023-02-28'], (1 - cost) * 0.99 ** feb_days)
+    # 3월에는 Y가 보합이므로 2월 말 비용만 추가로 반영
+    assert np.isclose(result.equity.iloc[-1], (1 - cost) * (1 - 2 * cost) * 0.99 ** feb_days)
+
+
+def test_rebalance_without_eligible_tickers_holds_cash():
+    prices = _two_asset_prices()
+    # 2월 말 리밸런싱일에 두 종목 모두 거래 정지 → 편입 종목 없음
+    prices.loc['2023-02-28'] = np.nan
+    index = build_return_index(build_price_matrix(prices))
+
+    result = run_backtest(index, top_n=1, lookback=5, freq='M', start_date='2023-01-25')
+
+    assert result.holdings == [['X'], []]
+    assert np.isfinite(result.equity).all()
+    cost = BACKTEST_COST_BPS / 1e4
+    held_days = int(((prices.index.month == 2) & (prices.index.day < 28)).sum())
+    expected = (1 - cost) * 0.99 ** held_days * (1 - cost)
+    # 3월에는 현금으로 보유하므로 자산이 변하지 않는다
+    assert np.allclose(result.equity.loc['2023-03-01':], expected)
+
+
+def test_risk_filter_excluding_everything_stays_in_cash():
+    prices = _two_asset_prices()
+    prices *= 1 + np.random.default_rng(0).normal(0, 0.001, prices.shape)  # 변동성이 0이 아니도록
+    index = build_return_index(build_price_matrix(prices))
+    result = run_backtest(index, top_n=1, lookback=5, freq='M', max_risk=1e-4, start_date='2023-01-25')
+    assert result.holdings == [[], []]
+    assert np.allclose(result.equity, 1.0)
+    assert result.stats['Total Return (%)'] == 0.0
@@ -0,0 +1,17 @@
+from modules import crawl_engine
+
+
+def test_failing_ticker_does_not_abort_the_crawl(monkeypatch):
+    async def crawl_ticker(ticker, date, sources, run, max_links, rss_batch):
+        if ticker == 'BAD':
+            raise RuntimeError("parser blew up")
+        return ticker, {'articles': [f"{ticker} news"], 'links': [], 'debug': [], 'enhanced': ([], [])}
+
+    monkeypatch.setattr(crawl_engine, '_crawl_ticker', crawl_ticker)
+    results = dict(crawl_engine.crawl_tickers(['AAA', 'BAD', 'CCC'], '2024-01-02'))
+
+    assert set(results) == {'AAA', 'BAD', 'CCC'}
+    assert results['AAA']['articles'] == ["AAA news"]
+    assert results['BAD']['articles'] == []
+    assert "parser blew up" in results['BAD']['debug'][0]
+    assert results['BAD']['enhanced'][0] == []
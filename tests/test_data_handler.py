@@ -0,0 +1,112 @@
+import pandas as pd
+from modules import data_handler
+
+
+def _fake_loader(calls, prices):
+    def load_prices(tickers, start, end):
+        calls.append((pd.Timestamp(start), pd.Timestamp(end)))
+        return prices, []
+    return load_prices
+
+
+def test_get_return_index_downloads_only_new_dates(monkeypatch, recording_provider):
+    monkeypatch.setattr(data_handler, '_return_index_cache', {})
+    tickers = ['AAA', 'BBB']
+
+    data_handler.get_return_index(tickers, '2015-01-01', '2015-06-01')
+    data_handler.get_return_index(tickers, '2015-03-01', '2015-05-01')  # 캐시 범위 안
+    widened = data_handler.get_return_index(tickers, '2015-05-01', '2015-09-01')  # 인접 구간은 합쳐서 확장
+    distant = data_handler.get_return_index(tickers, '2022-01-01', '2022-03-01')  # 먼 구간은 새로 생성
+    assert recording_provider.calls == [
+        (tickers, '2015-01-01', '2015-06-01'),
+        (tickers, '2015-06-01', '2015-09-01'),
+        (tickers, '2022-01-01', '2022-03-01'),
+    ]
+    assert widened.matrix.dates[0] == pd.Timestamp('2015-01-01')
+    assert distant.matrix.dates[0] == pd.Timestamp('2022-01-03')
+
+
+def test_get_return_index_rebuilds_windows_ending_today(monkeypatch, price_frame):
+    calls = []
+    monkeypatch.setattr(data_handler, 'load_prices', _fake_loader(calls, price_frame))
+    monkeypatch.setattr(data_handler, '_return_index_cache', {})
+    today = pd.Timestamp.today().normalize()
+
+    data_handler.get_return_index(['AAA'], today - pd.Timedelta(days=30), today)
+    data_handler.get_return_index(['AAA'], today - pd.Timedelta(days=10), today)
+    assert len(calls) == 2
+
+
+def _patch_universe(monkeypatch, price_frame, requested):
+    tickers = list(price_frame['Close'].columns)
+    sectors = {t: ('Tech' if i % 2 == 0 else 'Energy') for i, t in enumerate(tickers)}
+
+    def load_prices(chunk, start, end):
+        requested.append(list(chunk))
+        return price_frame.loc[:, (slice(None), list(chunk))], []
+
+    monkeypatch.setattr(data_handler, 'get_sp500_tickers', lambda as_of=None, sectors=None: tickers)
+    monkeypatch.setattr(data_handler, 'get_sector_map', lambda: sectors)
+    monkeypatch.setattr(data_handler, 'load_prices', load_prices)
+    monkeypatch.setattr(data_handler, 'load_benchmark_close', lambda start, end: None)
+    monkeypatch.setattr(data_handler, '_return_index_cache', {})
+    return sectors
+
+
+def test_stream_stock_data_ranks_chunks_as_they_load(monkeypatch, price_frame):
+    requested = []
+    _patch_universe(monkeypatch, price_frame, requested)
+    start, end = price_frame.index[0], price_frame.index[-1] + pd.Timedelta(days=1)
+
+    results = list(data_handler.stream_stock_data(start, end, -100, top_n=3, chunk_size=1, max_workers=1))
+    assert results[0][0], "first chunk should already be ranked"
+    assert [done for _, done, _ in results] == [1, 2, 3, 4]
+    expected = data_handler.get_stock_data(start, end, -100, top_n=3)
+    pd.testing.assert_frame_equal(pd.DataFrame(results[-1][0]), pd.DataFrame(expected))
+
+
+def test_stream_stock_data_loads_only_selected_sectors(monkeypatch, price_frame):
+    requested = []
+    sectors = _patch_universe(monkeypatch, price_frame, requested)
+    start, end = price_frame.index[0], price_frame.index[-1]
+
+    rows = list(data_handler.stream_stock_data(start, end, -100, top_n=5, sectors=['Tech'], chunk_size=1))[-1][0]
+    loaded = {t for chunk in requested for t in chunk}
+    assert loaded == {t for t, sector in sectors.items() if sector == 'Tech'}
+    assert {row['Sector'] for row in rows} == {'Tech'}
+
+
+def test_screen_universe_reports_failed_shards_and_tickers(monkeypatch, price_frame):
+    requested = []
+    _patch_universe(monkeypatch, price_frame, requested)
+    frame_load = data_handler.load_prices
+
+    def load_prices(chunk, start, end):
+        if 'CCC' in chunk:
+            raise RuntimeError("provider down")
+        prices, _ = frame_load([t for t in chunk if t != 'ZZZ'], start, end)
+        return prices, [t for t in chunk if t == 'ZZZ']
+
+    monkeypatch.setattr(data_handler, 'load_prices', load_prices)
+    start, end = price_frame.index[0], price_frame.index[-1]
+    rows, stats = data_handler.screen_universe(['AAA', 'ZZZ', 'CCC', 'DDD'], start, end, -100,
+                                               top_n=5, max_workers=1, shard_size=2)
+
+    assert {row['Ticker'] for row in rows} == {'AAA'}
+    assert stats[0]['error'] is None and stats[0]['failed_tickers'] == ['ZZZ']
+    assert "provider down" in stats[1]['error']
+    assert stats[1]['failed_tickers'] == ['CCC', 'DDD']
+
+
+def test_backtest_top_n_caches_the_universe_index_for_sector_runs(monkeypatch, price_frame):
+    requested = []
+    sectors = _patch_universe(monkeypatch, price_frame, requested)
+    start, end = price_frame.index[30], price_frame.index[-1]
+
+    result = data_handler.backtest_top_n(start, end, top_n=1, lookback=10, sectors=['Energy'])
+    data_handler.get_stock_data(start, end, -100)
+
+    assert len(requested) == 1, "screening after a sector backtest should reuse its universe index"
+    assert list(data_handler._return_index_cache) == [tuple(price_frame['Close'].columns)]
+    held = {t for picks in result.holdings for t in picks}
+    assert held and all(sectors[t] == 'Energy' for t in held)
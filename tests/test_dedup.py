@@ -0,0 +1,53 @@
+import numpy as np
+from modules.dedup import minhash, features, near_duplicate_groups, dedup_articles, dedup_contents
+
+STORY = "Apple shares rose 3% on Tuesday after the company reported record iPhone revenue and raised its dividend"
+
+
+def _jaccard(a, b):
+    fa, fb = features(a), features(b)
+    return len(fa & fb) / len(fa | fb)
+
+
+def test_minhash_estimates_jaccard():
+    other = STORY.replace("Tuesday", "Wednesday").replace("record", "strong")
+    estimate = (minhash(STORY) == minhash(other)).mean()
+    assert abs(estimate - _jaccard(STORY, other)) < 0.15
+    assert (minhash(STORY) == minhash(STORY)).all()
+
+
+def test_near_duplicates_grouped_and_distinct_stories_kept():
+    texts = [
+        f"[GOOGLE] {STORY}",
+        f"[RSS] {STORY}.",
+        "[YAHOO] Federal Reserve holds rates steady and signals two cuts later this year",
+        f"[MARKETWATCH] {STORY.upper()}",
+    ]
+    groups = sorted(sorted(g) for g in near_duplicate_groups(texts))
+    assert groups == [[0, 1, 3], [2]]
+
+
+def test_dedup_articles_keeps_best_source_and_aligned_links():
+    articles = [f"[RSS] {STORY}", "[YAHOO] Fed holds rates steady", f"[GOOGLE] {STORY}"]
+    links = ["https://rss.example.com/1", "https://yahoo.example.com/2", "https://google.example.com/3"]
+    kept, kept_links, stats = dedup_articles(articles, links)
+    assert stats == {'before': 3, 'after': 2, 'removed': 1}
+    assert len(kept) == len(kept_links) == 2
+    survivor = [a for a in kept if STORY in a][0]
+    assert kept_links[kept.index(survivor)] == links[articles.index(survivor)]
+
+
+def test_dedup_contents_keeps_most_relevant():
+    items = [
+        {'url': 'a', 'content': STORY, 'relevance_score': 2},
+        {'url': 'b', 'content': STORY + " Analysts expect more.", 'relevance_score': 5},
+        {'url': 'c', 'content': "Oil prices fell as inventories rose for a third week", 'relevance_score': 1},
+    ]
+    kept, stats = dedup_contents(items)
+    assert [item['url'] for item in kept] == ['b', 'c']
+    assert stats['removed'] == 1
+
+
+def test_empty_input():
+    assert near_duplicate_groups([]) == []
+    assert np.all(minhash("") == minhash("the a of"))
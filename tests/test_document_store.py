@@ -0,0 +1,57 @@
+import time
+import pytest
+from modules import document_store
+from modules.document_store import canonical_url, get_document
+from modules.content_extractor import extract_content_from_url
+
+
+@pytest.mark.parametrize('url, expected', [
+    ("HTTPS://Example.COM:443/news/story/?utm_source=x&b=2&a=1#comments", "https://example.com/news/story?a=1&b=2"),
+    ("http://example.com:8080/a?gclid=abc", "http://example.com:8080/a"),
+    ("https://www.google.com/url?q=https://news.example.com/s%3Fid%3D7&sa=U", "https://news.example.com/s?id=7"),
+    ("/url?q=https://news.example.com/s&sa=U", "https://news.example.com/s"),
+    ("https://duckduckgo.com/l/?uddg=https%3A%2F%2Fnews.example.com%2Fs%2F", "https://news.example.com/s"),
+    ("https://example.com", "https://example.com/"),
+    ("/relative/path", "/relative/path"),
+])
+def test_canonical_url(url, expected):
+    assert canonical_url(url) == expected
+
+
+@pytest.fixture
+def fetched(monkeypatch):
+    """Replace the network load with a recorder; URLs containing 'bad' fail."""
+    calls = []
+
+    def load(url, headers):
+        calls.append(url)
+        if 'bad' in url:
+            raise RuntimeError("HTTP 500 from upstream while fetching the article page")
+        return {'url': url, 'text': 'x' * 300, 'chars': 300, 'fetched_at': time.time()}
+
+    monkeypatch.setattr(document_store, '_load', load)
+    document_store.clear_documents()
+    yield calls
+    document_store.clear_documents()
+
+
+def test_same_page_fetched_once_from_original_url(fetched):
+    get_document("https://Example.com/story/?utm_medium=rss&id=3")
+    get_document("https://example.com/story?id=3")
+    assert fetched == ["https://Example.com/story/?utm_medium=rss&id=3"]
+    assert document_store.document_stats()['reused'] == 1
+
+
+def test_failed_fetch_is_not_stored_and_returns_no_text(fetched):
+    text, document = extract_content_from_url("https://example.com/bad")
+    assert text == ""
+    assert "HTTP 500" in document['error']
+    extract_content_from_url("https://example.com/bad")
+    assert len(fetched) == 2
+
+
+def test_documents_expire(fetched, monkeypatch):
+    get_document("https://example.com/a")
+    monkeypatch.setattr(document_store, 'DOCUMENT_TTL_SECONDS', 0)
+    get_document("https://example.com/a")
+    assert len(fetched) == 2
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+from modules.downsample import aggregate_ohlc, downsample_line, lttb_indices
+
+
+def test_lttb_keeps_endpoints_and_spikes():
+    rng = np.random.default_rng(5)
+    y = np.cumsum(rng.normal(0, 1, 1000))
+    y[437] = 500  # 급등 한 점
+    idx = lttb_indices(y, 50)
+    assert len(idx) == 50
+    assert idx[0] == 0 and idx[-1] == 999
+    assert np.all(np.diff(idx) > 0)
+    assert 437 in idx
+
+
+def test_lttb_returns_every_row_when_series_fits():
+    assert lttb_indices(np.arange(10.0), 10).tolist() == list(range(10))
+    assert lttb_indices(np.arange(10.0), 2).tolist() == list(range(10))
+
+
+def test_downsample_line_drops_nans_and_keeps_dates():
+    dates = pd.bdate_range('2024-01-01', periods=300)
+    series = pd.Series(np.sin(np.arange(300) / 10), index=dates)
+    series.iloc[::7] = np.nan
+    out = downsample_line(series, 60)
+    assert len(out) == 60
+    assert not out.isna().any()
+    assert out.index.isin(series.dropna().index).all()
+    assert out.index[0] == series.dropna().index[0] and out.index[-1] == series.index[-1]
+
+
+def test_aggregate_ohlc_matches_pandas_groupby():
+    rng = np.random.default_rng(9)
+    dates = pd.bdate_range('2024-01-01', periods=103)
+    close = 100 + np.cumsum(rng.normal(0, 1, len(dates)))
+    data = pd.DataFrame({
+        'Open': close + rng.normal(0, 0.5, len(dates)),
+        'High': close + 2,
+        'Low': close - 2,
+        'Close': close,
+        'Volume': rng.integers(1000, 5000, len(dates)).astype(float),
+    }, index=dates)
+
+    out = aggregate_ohlc(data, 20)
+    size = int(np.ceil(len(data) / 20))
+    groups = data.groupby(np.arange(len(data)) // size)
+    expected = groups.agg({'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'})
+    expected.index = data.index[::size]
+    assert len(out) <= 20
+    pd.testing.assert_frame_equal(out, expected, check_freq=False)
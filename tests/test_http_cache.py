@@ -0,0 +1,53 @@
+import pytest
+from modules import http_cache, http_client, rate_limiter
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    """Empty on-disk HTTP cache in a temporary directory."""
+    monkeypatch.setattr(http_cache, 'HTTP_CACHE_PATH', str(tmp_path / "http_cache.sqlite"))
+    monkeypatch.setattr(http_cache._local, 'conn', None, raising=False)
+    http_cache.clear_cache()
+    rate_limiter.reset_limiters()
+    yield
+    http_cache._local.conn.close()
+    rate_limiter.reset_limiters()
+
+
+def test_fresh_entry_is_served_without_network(http_server, cache):
+    base_url, seen = http_server
+    first = http_client.http_get(f"{base_url}/page")
+    second = http_client.http_get(f"{base_url}/page")
+
+    assert len(seen) == 1
+    assert second.status_code == 200 and second.text == first.text
+    assert http_cache.cache_stats()['hit'] == 1
+
+
+def test_stale_entry_is_revalidated_with_etag(http_server, cache, monkeypatch):
+    base_url, seen = http_server
+    monkeypatch.setattr(http_cache, 'HTTP_CACHE_TTL_DEFAULT', 0)
+    http_client.http_get(f"{base_url}/page")
+    response = http_client.http_get(f"{base_url}/page")
+
+    # 두 번째 요청은 If-None-Match로 재검증하고 304를 받아 저장된 본문을 재사용
+    assert len(seen) == 2
+    assert seen[1][1].get('If-None-Match') == '"v1"'
+    assert response.status_code == 200
+    assert response.text == '<html><body>cached page</body></html>'
+    stats = http_cache.cache_stats()
+    assert stats['revalidated'] == 1 and stats['entries'] == 1
+
+
+def test_stale_entry_is_served_while_host_circuit_is_open(http_server, cache, monkeypatch):
+    base_url, seen = http_server
+    monkeypatch.setattr(http_cache, 'HTTP_CACHE_TTL_DEFAULT', 0)
+    http_client.http_get(f"{base_url}/page")
+    limiter = rate_limiter.get_limiter('127.0.0.1')
+    for _ in range(rate_limiter.CIRCUIT_FAILURE_THRESHOLD):
+        limiter.record_failure()
+
+    response = http_client.http_get(f"{base_url}/page")
+    assert len(seen) == 1
+    assert response.text == '<html><body>cached page</body></html>'
+    assert http_cache.cache_stats()['stale'] == 1
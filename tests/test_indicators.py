@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+from modules.indicators import rolling_means
+
+
+def test_rolling_means_match_pandas_per_ticker_with_gaps():
+    rng = np.random.default_rng(3)
+    closes = pd.DataFrame(rng.normal(100, 5, (200, 3)), columns=['AAA', 'BBB', 'CCC'])
+    closes.iloc[50, 0] = np.nan          # 하루 결측 (다른 종목만 거래한 날)
+    closes.iloc[:30, 1] = np.nan         # 늦은 상장
+    closes.iloc[100:104, 2] = np.nan
+    means = rolling_means(closes.to_numpy(), [5, 20, 60])
+    for window, values in means.items():
+        expected = pd.concat(
+            {c: closes[c].dropna().rolling(window).mean().reindex(closes.index) for c in closes}, axis=1
+        )
+        np.testing.assert_allclose(values, expected.to_numpy(), equal_nan=True)
+
+
+def test_single_gap_does_not_blank_the_following_window():
+    closes = np.arange(1.0, 31.0)
+    closes[10] = np.nan
+    ma = rolling_means(closes, [5])[5]
+    assert np.isnan(ma[10])
+    # 결측일을 건너뛴 직전 5개 유효값의 평균
+    assert np.isclose(ma[11], np.mean([7, 8, 9, 10, 12]))
+    assert not np.isnan(ma[11:]).any()
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+from modules.monte_carlo import risk_summary, simulate_returns
+
+
+@pytest.fixture
+def returns():
+    rng = np.random.default_rng(3)
+    return rng.normal(0.0005, 0.015, (250, 3))
+
+
+@pytest.mark.parametrize('method', ['bootstrap', 'gbm'])
+def test_same_seed_gives_same_paths(returns, method):
+    weights = [0.5, 0.3, 0.2]
+    first = simulate_returns(returns, weights, n_paths=1000, method=method, seed=42, chunk_size=300)
+    second = simulate_returns(returns, weights, n_paths=1000, method=method, seed=42, chunk_size=300)
+    other = simulate_returns(returns, weights, n_paths=1000, method=method, seed=43, chunk_size=300)
+    assert first.shape == (1000,)
+    np.testing.assert_array_equal(first, second)
+    assert not np.array_equal(first, other)
+
+
+def test_bootstrap_of_constant_returns_is_exact():
+    returns = np.full((20, 2), 0.01)
+    terminal = simulate_returns(returns, [0.5, 0.5], horizon=5, n_paths=10, seed=1)
+    assert np.allclose(terminal, 1.01 ** 5 - 1)
+
+
+def test_risk_summary_var_and_cvar():
+    terminal = np.arange(-50, 50) / 100  # -50% .. 49% 균등
+    summary = risk_summary(terminal, levels=(0.95,))
+    assert np.isclose(summary['손실 확률 (%)'], 50.0)
+    assert summary['CVaR 95% (%)'] >= summary['VaR 95% (%)'] > 0
@@ -0,0 +1,49 @@
+import numpy as np
+from modules.portfolio import ledoit_wolf_covariance, mean_variance_weights
+
+
+def _hand_ledoit_wolf(returns):
+    # 관측치별 외적으로 직접 계산한 Ledoit-Wolf (2004) 수축
+    n, p = returns.shape
+    x = returns - returns.mean(axis=0)
+    sample = sum(np.outer(row, row) for row in x) / n
+    mu = np.trace(sample) / p
+    target = mu * np.eye(p)
+    d2 = np.sum((sample - target) ** 2) / p
+    b2 = sum(np.sum((np.outer(row, row) - sample) ** 2) for row in x) / p / n ** 2
+    shrinkage = min(b2, d2) / d2
+    return shrinkage * target + (1 - shrinkage) * sample, shrinkage
+
+
+def test_ledoit_wolf_matches_hand_computation():
+    returns = np.array([
+        [0.01, 0.02, -0.01],
+        [-0.02, 0.01, 0.00],
+        [0.03, -0.01, 0.02],
+        [0.00, 0.02, -0.02],
+        [0.01, 0.00, 0.01],
+    ])
+    cov, shrinkage = ledoit_wolf_covariance(returns)
+    expected_cov, expected_shrinkage = _hand_ledoit_wolf(returns)
+    assert 0 < shrinkage < 1
+    assert np.isclose(shrinkage, expected_shrinkage)
+    assert np.allclose(cov, expected_cov)
+
+
+def test_ledoit_wolf_keeps_identity_like_sample():
+    returns = np.array([[1.0, 0.0], [-1.0, 0.0], [0.0, 1.0], [0.0, -1.0]])
+    cov, shrinkage = ledoit_wolf_covariance(returns)
+    # 표본 공분산이 이미 목표(단위행렬 배수)와 같으면 완전히 수축
+    assert shrinkage == 1.0
+    assert np.allclose(cov, 0.5 * np.eye(2))
+
+
+def test_minimum_variance_weights_for_uncorrelated_assets():
+    mean = np.array([0.10, 0.05])
+    cov = np.diag([0.04, 0.01])
+    min_var, max_sharpe, frontier, frontier_ret, frontier_vol = mean_variance_weights(mean, cov, risk_free_rate=0.0)
+    # 역분산 비중 (1/0.04 : 1/0.01 = 1 : 4)
+    assert np.allclose(min_var, [0.2, 0.8])
+    assert np.isclose(max_sharpe.sum(), 1.0)
+    assert np.allclose(frontier.sum(axis=1), 1.0)
+    assert np.all(np.diff(frontier_ret) >= 0)
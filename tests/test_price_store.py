@@ -0,0 +1,44 @@
+import json
+import pandas as pd
+from modules import price_store
+
+
+def test_distant_query_fetches_only_the_uncovered_range(recording_provider):
+    price_store.load_prices(['AAA'], '2015-01-01', '2015-06-01')
+    price_store.load_prices(['AAA'], '2022-01-01', '2022-03-01')
+    price_store.load_prices(['AAA'], '2015-03-01', '2015-05-01')  # 이미 받은 구간
+    assert recording_provider.calls == [
+        (['AAA'], '2015-01-01', '2015-06-01'),
+        (['AAA'], '2022-01-01', '2022-03-01'),
+    ]
+
+
+def test_query_spanning_stored_ranges_fetches_only_the_gaps(recording_provider):
+    price_store.load_prices(['AAA', 'BBB'], '2016-01-01', '2016-02-01')
+    price_store.load_prices(['AAA'], '2016-03-01', '2016-04-01')
+    recording_provider.calls.clear()
+
+    prices, failed = price_store.load_prices(['AAA', 'BBB'], '2015-12-01', '2016-05-01')
+    assert sorted(recording_provider.calls) == [
+        (['AAA'], '2016-02-01', '2016-03-01'),
+        (['AAA'], '2016-04-01', '2016-05-01'),
+        (['AAA', 'BBB'], '2015-12-01', '2016-01-01'),
+        (['BBB'], '2016-02-01', '2016-05-01'),
+    ]
+    assert not failed
+    expected = pd.bdate_range('2015-12-01', '2016-04-29')
+    assert prices['Close'].index.equals(expected)
+    assert not prices['Close'].isna().any().any()
+
+
+def test_legacy_single_range_coverage_is_read_as_one_interval(recording_provider):
+    price_store.load_prices(['AAA'], '2015-01-01', '2015-06-01')
+    with open(price_store._coverage_path(), 'w', encoding='utf-8') as f:
+        json.dump({'AAA': ['2015-01-01', '2015-06-01']}, f)
+    price_store.reset_cache()
+    recording_provider.calls.clear()
+
+    price_store.load_prices(['AAA'], '2015-02-01', '2015-07-01')
+    assert recording_provider.calls == [(['AAA'], '2015-06-01', '2015-07-01')]
+    with open(price_store._coverage_path(), encoding='utf-8') as f:
+        assert json.load(f)['AAA'] == [['2015-01-01', '2015-07-01']]
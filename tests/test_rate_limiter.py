@@ -0,0 +1,70 @@
+import time
+import pytest
+from modules import http_client, rate_limiter
+from modules.rate_limiter import CircuitOpenError, HostLimiter
+
+
+def test_token_bucket_allows_burst_then_paces_to_rate():
+    limiter = HostLimiter(rate=20.0, burst=2)
+    started = time.monotonic()
+    limiter.acquire()
+    limiter.acquire()
+    burst_done = time.monotonic()
+    for _ in range(4):
+        limiter.acquire()
+    finished = time.monotonic()
+
+    assert burst_done - started < 0.05
+    # 버스트 이후 4개 토큰은 초당 20개 속도로 채워짐 (약 0.2초)
+    assert 0.18 <= finished - burst_done < 0.5
+    assert limiter.snapshot()['requests'] == 6
+
+
+def test_throttling_halves_rate_and_blocks_for_retry_after():
+    limiter = HostLimiter(rate=8.0, burst=1)
+    limiter.acquire()
+    limiter.record_failure(throttled=True, retry_after=0.2)
+    assert limiter.snapshot()['rate'] == 4.0
+
+    started = time.monotonic()
+    limiter.acquire()
+    assert time.monotonic() - started >= 0.19
+    limiter.record_success()
+    assert limiter.snapshot()['rate'] == 4.8  # 가법 증가 (최대 속도의 10%)
+
+
+def test_circuit_opens_after_consecutive_failures(monkeypatch):
+    monkeypatch.setattr(rate_limiter, 'CIRCUIT_COOLDOWN_SECONDS', 0.1)
+    limiter = HostLimiter(rate=100.0, burst=10)
+    for _ in range(rate_limiter.CIRCUIT_FAILURE_THRESHOLD):
+        limiter.acquire()
+        limiter.record_failure()
+    with pytest.raises(CircuitOpenError):
+        limiter.acquire()
+
+    time.sleep(0.15)
+    limiter.acquire()  # half-open 시험 요청
+    with pytest.raises(CircuitOpenError):
+        limiter.acquire()
+    limiter.record_success()
+    limiter.acquire()
+    assert not limiter.snapshot()['circuit_open']
+
+
+def test_http_get_backs_off_on_429(http_server, monkeypatch):
+    base_url, seen = http_server
+    rate_limiter.reset_limiters()
+    monkeypatch.setattr(rate_limiter, 'RATE_LIMIT_DEFAULT_RPS', 50.0)
+    try:
+        response = http_client.http_get(f"{base_url}/throttle", use_cache=False)
+        assert response.status_code == 429
+        stats = rate_limiter.limiter_stats()['127.0.0.1']
+        assert stats['throttled'] == 1 and stats['rate'] == 25.0
+
+        started = time.monotonic()
+        http_client.http_get(f"{base_url}/throttle", use_cache=False)
+        # Retry-After: 1 동안 같은 호스트 요청을 보내지 않음
+        assert time.monotonic() - started >= 0.95
+        assert len(seen) == 2
+    finally:
+        rate_limiter.reset_limiters()
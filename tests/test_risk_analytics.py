@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+from config import TRADING_DAYS_PER_YEAR
+from modules.risk_analytics import compute_risk_metrics, risk_filter_mask
+from modules.screener import build_price_matrix
+
+
+def _benchmark(price_frame):
+    rng = np.random.default_rng(11)
+    dates = price_frame.index
+    return pd.Series(400 * np.exp(np.cumsum(rng.normal(0.0005, 0.01, len(dates)))), index=dates)
+
+
+def test_risk_metrics_match_pandas(price_frame):
+    bench_close = _benchmark(price_frame)
+    metrics = compute_risk_metrics(build_price_matrix(price_frame), bench_close, risk_free_rate=0.0)
+
+    bench = bench_close.pct_change()
+    for i, ticker in enumerate(price_frame['Close'].columns):
+        close = price_frame['Close'][ticker].dropna()
+        rets = close.pct_change().dropna()
+        both = pd.DataFrame({'r': rets, 'b': bench.reindex(rets.index)}).dropna()
+        expected = {
+            'max_drawdown': -(close / close.cummax() - 1).min() * 100,
+            'sharpe': rets.mean() / rets.std() * np.sqrt(TRADING_DAYS_PER_YEAR),
+            'beta': both['r'].cov(both['b']) / both['b'].var(),
+            'correlation': both['r'].corr(both['b']),
+        }
+        for name, value in expected.items():
+            assert np.isclose(metrics[name][i], value), (ticker, name)
+
+
+def test_beta_is_nan_without_benchmark(price_frame):
+    metrics = compute_risk_metrics(build_price_matrix(price_frame))
+    assert np.isnan(metrics['beta']).all() and np.isnan(metrics['correlation']).all()
+
+
+def test_risk_filter_mask_fails_undefined_metrics():
+    metrics = {
+        'max_drawdown': np.array([10.0, 30.0, 5.0]),
+        'sharpe': np.array([1.0, 2.0, np.nan]),
+        'sortino': np.array([1.0, 2.0, 1.0]),
+        'beta': np.array([1.0, 1.0, 1.0]),
+    }
+    assert risk_filter_mask(metrics, {'max_drawdown': 20.0, 'min_sharpe': None}).tolist() == [True, False, True]
+    assert risk_filter_mask(metrics, {'min_sharpe': 0.5}).tolist() == [True, True, False]
@@ -0,0 +1,41 @@
+import pytest
+from modules.rss_batch import build_matcher, match_text
+
+NAMES = {
+    'A': 'Agilent Technologies, Inc.',
+    'TGT': 'Target Corporation',
+    'AAPL': 'Apple Inc.',
+    'V': 'Visa Inc. Class A',
+    'ON': 'ON Semiconductor Corporation',
+}
+
+
+@pytest.fixture
+def matcher():
+    return build_matcher(['A', 'TGT', 'AAPL', 'V', 'ON', 'BRK-B'], NAMES)
+
+
+@pytest.mark.parametrize('text', [
+    "A new iPhone launched today",
+    "Stocks slip. A rally fades by noon",
+    "Target price raised by analysts",
+    "Visa requirements tightened for students",
+    "Markets moved on the news",
+    "ANALYSTS SEE A REBOUND ON MONDAY",
+])
+def test_match_text_ignores_common_words(matcher, text):
+    assert match_text(matcher, text) == set()
+
+
+@pytest.mark.parametrize('text, expected', [
+    ("Agilent (A) beats estimates", {'A'}),
+    ("Traders bought $A and $V", {'A', 'V'}),
+    ("Shares of Target rose after earnings", {'TGT'}),
+    ("Payments giant Visa beats", {'V'}),
+    ("Target price raised on Apple", {'AAPL'}),
+    ("Apple unveils phones\nTarget cuts outlook", {'AAPL'}),
+    ("BRK.B hits a record", {'BRK-B'}),
+    ("ON Semiconductor jumps", {'ON'}),
+])
+def test_match_text_finds_tickers_and_names(matcher, text, expected):
+    assert match_text(matcher, text) == expected
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+from modules.screener import build_price_matrix, build_return_index, compute_return_risk, query_window, screen_prices
+
+
+def _reference(prices):
+    """Per-ticker return/risk the way the original loop computed them."""
+    rows = {}
+    for ticker in prices['Close'].columns:
+        bars = prices.xs(ticker, axis=1, level=1).dropna()
+        if bars.empty:
+            continue
+        return_pct = (bars['Close'].iloc[-1] - bars['Open'].iloc[0]) / bars['Open'].iloc[0] * 100
+        risk_pct = bars['Close'].pct_change().dropna().std() * 100
+        rows[ticker] = (return_pct, risk_pct)
+    return rows
+
+
+def test_compute_return_risk_matches_per_ticker_loop(price_frame):
+    matrix = build_price_matrix(price_frame)
+    return_pct, risk_pct = compute_return_risk(matrix)
+    expected = _reference(price_frame)
+    for i, ticker in enumerate(matrix.tickers):
+        assert np.isclose(return_pct[i], expected[ticker][0])
+        assert np.isclose(risk_pct[i], expected[ticker][1])
+
+
+def test_screen_prices_ranks_by_return_and_applies_target(price_frame):
+    expected = _reference(price_frame)
+    target = sorted(r for r, _ in expected.values())[1]
+    rows = screen_prices(price_frame, target, top_n=2)
+    passing = sorted((t for t, (r, _) in expected.items() if r >= target), key=lambda t: -expected[t][0])
+    assert [row['Ticker'] for row in rows] == passing[:2]
+    assert all(row['Return (%)'] >= target for row in rows)
+
+
+def test_screen_prices_empty_frame():
+    assert screen_prices(pd.DataFrame(), 0) == []
+
+
+def test_query_window_matches_screen_prices(price_frame):
+    index = build_return_index(build_price_matrix(price_frame))
+    dates = price_frame.index
+    for start, end in [(dates[0], dates[-1] + pd.Timedelta(days=1)), (dates[10], dates[60]),
+                       (dates[38], dates[45]), (dates[85], dates[100])]:
+        window = price_frame.loc[(dates >= start) & (dates < end)]
+        rows = {row['Ticker']: row for row in screen_prices(window, -np.inf, top_n=10)}
+        return_pct, risk_pct = query_window(index, start, end)
+        for i, ticker in enumerate(index.matrix.tickers):
+            if ticker not in rows:
+                assert np.isnan(return_pct[i])
+                continue
+            assert np.isclose(return_pct[i], rows[ticker]['Return (%)'])
+            assert np.isclose(risk_pct[i], rows[ticker]['Risk (%)'], equal_nan=True)
+
+
+def test_query_window_outside_data_is_nan(price_frame):
+    index = build_return_index(build_price_matrix(price_frame))
+    return_pct, risk_pct = query_window(index, pd.Timestamp('2030-01-01'), pd.Timestamp('2030-02-01'))
+    assert np.isnan(return_pct).all() and np.isnan(risk_pct).all()
@@ -0,0 +1,30 @@
+import numpy as np
+from modules.screener import build_price_matrix, build_return_index, query_window, rank_results
+from modules.sweep import run_sweep, cube_top_n, pick_frequency
+
+
+def test_sweep_cells_match_single_screens(price_frame):
+    index = build_return_index(build_price_matrix(price_frame))
+    dates = price_frame.index
+    windows = [(dates[0], dates[60]), (dates[20], dates[100]), (dates[80], dates[119])]
+    thresholds = [-10.0, 0.0, 10.0]
+    cube = run_sweep(index, windows, thresholds)
+
+    assert cube.passes.shape == (3, 3, len(index.matrix.tickers))
+    for w, (start, end) in enumerate(windows):
+        return_pct, risk_pct = query_window(index, start, end)
+        np.testing.assert_allclose(cube.return_pct[w], return_pct, rtol=1e-5, equal_nan=True)
+        for t, threshold in enumerate(thresholds):
+            expected = rank_results(index.matrix.tickers, return_pct, risk_pct, threshold, 2)
+            got = cube_top_n(cube, w, t, top_n=2)
+            assert [row['Ticker'] for row in got] == [row['Ticker'] for row in expected]
+            assert cube.pass_count[w, t] == np.sum(return_pct >= threshold)
+
+
+def test_sweep_mask_excludes_tickers(price_frame):
+    index = build_return_index(build_price_matrix(price_frame))
+    dates = price_frame.index
+    mask = np.array([ticker != 'AAA' for ticker in index.matrix.tickers])
+    cube = run_sweep(index, [(dates[0], dates[-1])], [-100.0], mask)
+    assert 'AAA' not in pick_frequency(cube, top_n=4).index
+    assert not cube.passes[..., index.matrix.tickers.index('AAA')].any()